@@ -0,0 +1,63 @@
+"""
+Benchmark: overhead per graph step of checkpointing investigations, no checkpointer vs
+the in-memory saver vs the SQLite file used for resumable investigations.
+Run from the code directory: python benchmarks/bench_checkpoint.py --runs 50 --loops 10
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from unittest.mock import patch
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+
+from langgraph.checkpoint.memory import MemorySaver
+from Platform.Flows.checkpointing import get_checkpointer, thread_config
+from Platform.Flows.core_graph import create_graph
+
+
+def scripted_decisions(loops):
+    # Each loop is execute_operation -> execute_agent (fast path) -> queue_load, then completion
+    def invoke_decision(node, template, inputs, key_inputs):
+        done = key_inputs["history"].count('"agent":"queue_load"')
+        return ("completed" if done >= loops else "check the queue load"), False
+    return invoke_decision
+
+
+def measure(label, graph, runs, loops):
+    # Untimed warm up run so first-call costs are not charged to one configuration
+    graph.invoke({"operation": "Check the queue", "history": []},
+                 dict(thread_config(f"bench-{label}-warmup"), recursion_limit=loops * 3 + 5))
+
+    steps = 0
+    start = time.perf_counter()
+    for run in range(runs):
+        config = dict(thread_config(f"bench-{label}-{run}"), recursion_limit=loops * 3 + 5)
+        result = graph.invoke({"operation": "Check the queue", "history": []}, config)
+        steps += len(result["history"])
+    elapsed = time.perf_counter() - start
+    per_step = elapsed / steps
+    print(f"{label:<12} runs={runs:<5} steps={steps:<7} per_step={per_step * 1000:8.3f}ms")
+    return per_step
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=50)
+    parser.add_argument("--loops", type=int, default=10)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir, \
+            patch("Platform.Agents.Decision.decisions.invoke_decision", scripted_decisions(args.loops)):
+        baseline = measure("none", create_graph(), args.runs, args.loops)
+        memory = measure("memory", create_graph(MemorySaver()), args.runs, args.loops)
+        sqlite = measure("sqlite", create_graph(get_checkpointer(os.path.join(tmp_dir, "bench.sqlite"))),
+                         args.runs, args.loops)
+
+    print(f"checkpoint overhead per step: memory={(memory - baseline) * 1000:.3f}ms "
+          f"sqlite={(sqlite - baseline) * 1000:.3f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Benchmark: cost per measurement of the pooled collectors vs opening a new database
+engine or HTTP connection on every graph step, against a local SQLite file and the
+fake queue management API.
+Run from the code directory: python benchmarks/bench_collectors.py --calls 500 --latency-ms 0
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+import requests
+from sqlalchemy import create_engine, text
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+# Local stand-ins for the LLM provider and the queue management API
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "test", "support")))
+
+from Platform.Agents.Measure.collectors import HttpQueueCollector, SqlAlchemyCollector
+from fake_queue_server import FakeQueueServer
+
+
+def ping_per_call(url):
+    engine = create_engine(url)
+    try:
+        with engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+    finally:
+        engine.dispose()
+
+
+def measure(label, func, calls):
+    func()
+    start = time.perf_counter()
+    for _ in range(calls):
+        func()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<16} calls={calls:<6} per_call={elapsed / calls * 1000:8.3f}ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--calls", type=int, default=500)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="simulated management API response time")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir, FakeQueueServer(latency=args.latency_ms / 1000) as server:
+        database_url = f"sqlite:///{os.path.join(tmp_dir, 'bench.sqlite')}"
+        queue_url = server.queue_url("orders")
+
+        database = SqlAlchemyCollector()
+        queue = HttpQueueCollector()
+        try:
+            measure("db per call", lambda: ping_per_call(database_url), args.calls)
+            measure("db pooled", lambda: database.collect("database_ping", database_url), args.calls)
+
+            connections = server.connections
+            measure("http per call", lambda: requests.get(queue_url, timeout=5).json(), args.calls)
+            per_call_connections = server.connections - connections
+            connections = server.connections
+            measure("http pooled", lambda: queue.collect("queue_load", queue_url), args.calls)
+            print(f"http connections opened: per call={per_call_connections} pooled={server.connections - connections}")
+        finally:
+            database.close()
+            queue.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""
+Benchmark: per-run setup cost of the core graph, "compile + invoke" vs "invoke only".
+Run from the code directory: python benchmarks/bench_graph_compile.py --runs 300 --threads 8
+"""
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+# Local stand-ins for the LLM provider and the queue management API
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "test", "support")))
+
+from Platform.Flows import graph_registry
+from Platform.Flows.core_graph import create_graph, get_graph
+from fake_llm_server import FakeLLMServer
+
+
+def run_compile_and_invoke(operation):
+    graph_registry.clear()
+    graph = create_graph()
+    return graph.invoke({"operation": operation, "history": []})
+
+
+def run_invoke_only(operation):
+    graph = get_graph()
+    return graph.invoke({"operation": operation, "history": []})
+
+
+def measure(label, func, runs, threads, operation):
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        list(pool.map(lambda _: func(operation), range(runs)))
+    elapsed = time.perf_counter() - start
+    print(f"{label:<22} runs={runs:<6} total={elapsed:8.3f}s  per_run={elapsed / runs * 1000:8.3f}ms  "
+          f"runs/min={runs / elapsed * 60:10.0f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=300)
+    parser.add_argument("--threads", type=int, default=8)
+    args = parser.parse_args()
+
+    operation = "Determine the reason for downtime of an application"
+
+    # The fake LLM completes every run on the first decision so only graph overhead is measured
+    with FakeLLMServer() as server:
+        os.environ["OPENAI_BASE_URL"] = server.base_url
+        os.environ.setdefault("OPENAI_API_KEY", "fake-key")
+        measure("compile + invoke", run_compile_and_invoke, args.runs, 1, operation)
+        graph_registry.clear()
+        measure("invoke only", run_invoke_only, args.runs, 1, operation)
+        measure(f"invoke only x{args.threads}", run_invoke_only, args.runs, args.threads, operation)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Benchmark: cost of growing an agent history while serializing it for the decision prompt
+on every step, as execute_operation does. Compares parsing and dumping the JSON document
+per step (the original history handling), the operator.add list reducer with the whole
+list encoded per step, and the reducer with serialize_history, which only encodes the
+entries added since the previous step. The reducer's list copy and the prompt text
+itself still grow with the history, so every mode stays linear per step; the incremental
+mode removes the per-entry JSON encoding from that linear part, leaving memory copies.
+Run from the code directory: python benchmarks/bench_history.py --steps 1000
+"""
+import argparse
+import json
+import operator
+import os
+import sys
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+
+from Platform.Utilities.agent_response_management import history_entry, serialize_history
+
+
+def legacy_get_history_object(state, new_history):
+    # Previous implementation: parse and dump the whole history on every step
+    history_so_far = state['history']
+    if history_so_far == '':
+        history_so_far = '{"history":[]}'
+    json_history = json.loads(history_so_far)
+    json_history['history'].append(new_history)
+    return json.dumps(json_history)
+
+
+def sample_output(step):
+    return {"health": "yellow", "score": step % 100, "details": "queue depth above threshold"}
+
+
+def run_legacy(steps):
+    history = '{"history":[]}'
+    for step in range(steps):
+        history = legacy_get_history_object({"history": history}, {"agent": "queue_load", "output": sample_output(step)})
+    return history
+
+
+def run_reducer_full(steps):
+    history = []
+    for step in range(steps):
+        history = operator.add(history, history_entry("queue_load", sample_output(step)))
+        prompt = json.dumps({"history": history})
+    return prompt
+
+
+def run_reducer_incremental(steps):
+    history = []
+    for step in range(steps):
+        history = operator.add(history, history_entry("queue_load", sample_output(step)))
+        prompt = serialize_history(history)
+    return prompt
+
+
+def timed(func, steps, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(steps)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--steps", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'steps':>7} {'json per step':>15} {'reducer, full':>15} {'incremental':>15} {'speedup':>9}")
+    for steps in (args.steps // 4, args.steps // 2, args.steps, args.steps * 2):
+        legacy = timed(run_legacy, steps, args.repeat)
+        full = timed(run_reducer_full, steps, args.repeat)
+        incremental = timed(run_reducer_incremental, steps, args.repeat)
+        print(f"{steps:>7} {legacy * 1000:>13.2f}ms {full * 1000:>13.2f}ms {incremental * 1000:>13.2f}ms "
+              f"{legacy / incremental:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
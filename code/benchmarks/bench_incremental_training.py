@@ -0,0 +1,67 @@
+"""
+Benchmark: cost of taking a batch of new resolved incidents into the classifier, as a
+full retrain (cleaning every row, refitting TfidfVectorizer and LogisticRegression) vs an
+incremental update (HashingVectorizer and SGDClassifier.partial_fit on the new rows only
+plus publishing a model registry version), for growing dataset sizes sampled from the incidents CSV.
+Run from the code directory: python benchmarks/bench_incremental_training.py --sizes 1000,10000,100000 --batch 1000
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+import pandas as pd
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.linear_model import LogisticRegression
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+
+from Platform.prediction_model.incremental import IncrementalTrainer
+from Platform.prediction_model.predictor import Predictor
+from Platform.prediction_model.preprocess import LABEL_COLUMN, prepare_incidents
+from Platform.prediction_model.registry import ModelRegistry
+
+DATA_FILE = os.path.join(os.path.dirname(__file__), "..", "data", "incidents-generated-data-v3.csv")
+
+
+def full_retrain(df):
+    df = prepare_incidents(df)
+    vectorizer = TfidfVectorizer()
+    LogisticRegression().fit(vectorizer.fit_transform(df['combined_text']), df[LABEL_COLUMN])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", default="1000,10000,100000", help="comma separated dataset sizes")
+    parser.add_argument("--batch", type=int, default=1000, help="new incidents per update")
+    args = parser.parse_args()
+
+    source = pd.read_csv(DATA_FILE)
+    batch = source.sample(args.batch, replace=True, random_state=1)
+
+    for size in (int(s) for s in args.sizes.split(",")):
+        dataset = source.sample(size, replace=True, random_state=0)
+
+        start = time.perf_counter()
+        full_retrain(pd.concat([dataset, batch]))
+        full_seconds = time.perf_counter() - start
+
+        with tempfile.TemporaryDirectory() as directory:
+            registry = ModelRegistry(os.path.join(directory, "registry"))
+            # The sampled dataset stands in for the training store, so no sources to learn first
+            trainer = IncrementalTrainer(registry, os.path.join(directory, "incoming"),
+                                         predictor=Predictor(registry=registry), sources=[])
+            trainer.add_frame(dataset)
+            trainer.publish()
+
+            start = time.perf_counter()
+            trainer.add_frame(batch)
+            trainer.publish()
+            incremental_seconds = time.perf_counter() - start
+
+        print(f"size={size:<8} batch={args.batch:<6} full_retrain={full_seconds:8.3f}s "
+              f"incremental={incremental_seconds:8.3f}s speedup={full_seconds / incremental_seconds:7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+Benchmark: loading several versions of a synthetic incidents history whole with
+pd.read_csv, concatenating and deduplicating them (what training needs without an
+ingestion stage) vs streaming them in chunks into the training store with ingest.
+Reports wall time and peak resident memory, each step running in a fresh process, the
+size of the store against the CSV files and the time to read the store back. Every
+version holds --rows incidents, a quarter of them revisions of incidents of the previous
+version, and the first version uses the old singular steps column.
+Run from the code directory: python benchmarks/bench_ingestion.py --rows 250000 --versions 4
+"""
+import argparse
+import multiprocessing
+import os
+import resource
+import sys
+import tempfile
+import time
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+
+from Platform.prediction_model.ingestion import (ID_COLUMN, INCIDENT_COLUMNS, ingest, normalize_columns,
+                                                  read_manifest, read_store)
+
+DATA_FILE = os.path.join(os.path.dirname(__file__), "..", "data", "incidents-generated-data-v3.csv")
+
+
+def write_versions(directory, rows, versions, seed):
+    rng = np.random.default_rng(seed)
+    source = pd.read_csv(DATA_FILE)
+    paths = []
+    first_id = 0
+    for version in range(versions):
+        df = source.iloc[rng.integers(0, len(source), rows)].reset_index(drop=True)
+        # A quarter of every version revises incidents of the previous one
+        revised = rows // 4 if version else 0
+        ids = np.arange(first_id - revised, first_id - revised + rows)
+        first_id = ids[-1] + 1
+        df[ID_COLUMN] = "INC" + pd.Series(ids).astype(str)
+        df['Incident Description'] = (df['Incident Description'] + " Seen on host-"
+                                      + pd.Series(rng.integers(0, 500, rows)).astype(str) + ".")
+        df['Communication Log'] = df['Communication Log'] + " Ticket " + df[ID_COLUMN] + "."
+        if version == 0:
+            df = df.drop(columns=['First Debugging Step']).rename(columns={'Debugging Steps': 'Debugging Step'})
+        path = os.path.join(directory, f"incidents-v{version + 1}.csv")
+        df.to_csv(path, index=False)
+        paths.append(path)
+    return paths
+
+
+def load_whole(paths):
+    df = pd.concat([normalize_columns(pd.read_csv(path, dtype=str)) for path in paths], ignore_index=True)
+    return df.drop_duplicates(ID_COLUMN, keep="last")[INCIDENT_COLUMNS]
+
+
+def _run(queue, func, args):
+    baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+    result = func(*args)
+    elapsed = time.perf_counter() - start
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - baseline
+    queue.put((len(result) if isinstance(result, pd.DataFrame) else None, elapsed, peak / 2 ** 10))
+
+
+def measured(func, *args):
+    """Runs func in a fresh process, returns the rows of a frame result, seconds and MiB of peak RSS growth"""
+    context = multiprocessing.get_context("spawn")
+    queue = context.Queue()
+    process = context.Process(target=_run, args=(queue, func, args))
+    process.start()
+    result = queue.get()
+    process.join()
+    return result
+
+
+def directory_size(path):
+    return sum(os.path.getsize(os.path.join(root, name)) for root, _, names in os.walk(path) for name in names)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=250000)
+    parser.add_argument("--versions", type=int, default=4)
+    parser.add_argument("--chunksize", type=int, default=50000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        paths = write_versions(directory, args.rows, args.versions, args.seed)
+        csv_size = sum(os.path.getsize(path) for path in paths) / 2 ** 20
+
+        whole, whole_time, whole_peak = measured(load_whole, paths)
+        store = os.path.join(directory, "store")
+        _, ingest_time, ingest_peak = measured(ingest, paths, store, args.chunksize)
+        _, reuse_time, _ = measured(ingest, paths, store, args.chunksize)
+        _, read_time, read_peak = measured(read_store, store)
+        incidents = read_manifest(store)["rows"]
+        assert incidents == whole
+
+        print(f"{args.versions} files, {args.versions * args.rows} rows, {incidents} incidents, {csv_size:.1f} MiB of CSV")
+        print(f"read whole + dedupe   {whole_time:7.2f} s   peak {whole_peak:8.1f} MiB")
+        print(f"ingest chunked        {ingest_time:7.2f} s   peak {ingest_peak:8.1f} MiB   "
+              f"store {directory_size(store) / 2 ** 20:.1f} MiB ({read_manifest(store)['format']})")
+        print(f"ingest unchanged      {reuse_time:7.2f} s")
+        print(f"read store            {read_time:7.2f} s   peak {read_peak:8.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
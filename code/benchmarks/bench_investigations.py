@@ -0,0 +1,143 @@
+"""
+Benchmark: end to end downtime investigations without OpenAI. The core graph runs
+against a local fake LLM that follows the downtime.txt runbook from the measurement
+history, with the measure agents reading from a seeded fleet simulator so every
+concurrency level sees the same investigations. Reports runs/sec, p50/p95 latency, LLM calls per run and history size.
+Run from the code directory: python benchmarks/bench_investigations.py --runs 64 --concurrency 1,4,16,64
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
+from unittest.mock import patch
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+# Local stand-ins for the LLM provider and the queue management API
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "test", "support")))
+
+from Platform.Agents.Measure.measurement_cache import get_measurement_cache
+from Platform.Agents.Measure.simulation import FleetSimulator, set_simulator
+from fake_llm_server import FakeLLMServer
+
+RUNBOOK = os.path.join(os.path.dirname(__file__), "..", "src", "Platform", "Operations", "docs", "downtime.txt")
+# Action sentence the scripted LLM gives for each check, and the agent names it routes them to
+ACTIONS = {
+    "error_count": "check the application log error count",
+    "frequent_error": "check the most frequent error in the logs",
+    "database_ping": "check the database ping",
+    "database_connections": "check the number of database connections",
+    "queue": "check the queue load and the queue response time",
+}
+AGENTS = {
+    "error count": "error_count",
+    "frequent error": "frequent_error",
+    "database ping": "database_ping",
+    "database connections": "database_connections",
+    "queue load": "queue_load",
+    "queue response time": "queue_response_time",
+}
+
+
+def _history(prompt):
+    # The execute_operation prompt carries the serialized history after "State :"
+    state = prompt.split("State :", 1)[1].split("Analyse the operation", 1)[0].strip()
+    entries = json.loads(state).get("history", [])
+    return {entry["agent"]: entry["output"] for entry in entries}
+
+
+def _health(output):
+    return output.get("health") if isinstance(output, dict) else None
+
+
+def downtime_script(messages):
+    """
+    Answers the decision prompts the way the downtime runbook describes.
+    """
+    prompt = messages[-1]["content"]
+    if "State :" not in prompt:
+        action = prompt.split("action:", 1)[1].split("agents :", 1)[0].lower()
+        return ", ".join(agent for phrase, agent in AGENTS.items() if phrase in action)
+
+    done = _history(prompt)
+    if "error_count" not in done:
+        return ACTIONS["error_count"]
+    if _health(done["error_count"]) != "green":
+        if "frequent_error" not in done:
+            return ACTIONS["frequent_error"]
+        if "database" in str(done["frequent_error"]).lower():
+            if "database_ping" not in done:
+                return ACTIONS["database_ping"]
+            if done["database_ping"].get("database ping") == "Failed":
+                return "completed"
+            if "database_connections" not in done:
+                return ACTIONS["database_connections"]
+            if _health(done["database_connections"]) == "red":
+                return "completed"
+    if "queue_load" not in done:
+        return ACTIONS["queue"]
+    return "completed"
+
+
+def run_level(run_operation, operation, runs, concurrency, seed, incident_rate):
+    # A fresh simulator per level, so every level replays the same readings for app-0..app-N
+    set_simulator(FleetSimulator(n_apps=runs, seed=seed, incident_rate=incident_rate))
+    get_measurement_cache().clear()
+
+    def one(index):
+        start = time.perf_counter()
+        result = run_operation(operation, app_name=f"app-{index}")
+        elapsed = time.perf_counter() - start
+        history = result["history"]
+        return elapsed, result["metrics"]["llm_calls"], len(history), len(json.dumps(history))
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        samples = list(pool.map(one, range(runs)))
+    wall = time.perf_counter() - start
+
+    latencies = sorted(sample[0] for sample in samples)
+    p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+    print(f"concurrency={concurrency:<3} runs={runs:<5} runs/s={runs / wall:8.1f} "
+          f"p50={statistics.median(latencies) * 1000:8.2f}ms p95={p95 * 1000:8.2f}ms "
+          f"llm_calls/run={statistics.mean(s[1] for s in samples):5.2f} "
+          f"history={statistics.mean(s[2] for s in samples):5.2f} entries "
+          f"{statistics.mean(s[3] for s in samples):7.1f} bytes")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=64, help="investigations per concurrency level")
+    parser.add_argument("--concurrency", default="1,2,4,8,16,32,64")
+    parser.add_argument("--llm-latency-ms", type=float, default=0.0, help="simulated LLM response time")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--incident-rate", type=float, default=0.0, help="share of simulated readings hit by an incident")
+    parser.add_argument("--cache", action="store_true", help="keep the decision response cache enabled")
+    args = parser.parse_args()
+
+    with open(RUNBOOK) as f:
+        operation = f.read()
+
+    os.environ.setdefault("OPENAI_API_KEY", "offline-benchmark")
+    with FakeLLMServer(downtime_script, latency=args.llm_latency_ms / 1000) as server, ExitStack() as stack:
+        os.environ["OPENAI_BASE_URL"] = server.base_url
+        from Platform.main import run_operation
+        from Platform.Agents.Decision import response_cache
+
+        if not args.cache:
+            stack.enter_context(patch.object(response_cache, "_decision_cache", None))
+
+        # Untimed warm up so client and graph construction are not charged to the first level
+        set_simulator(FleetSimulator(seed=args.seed))
+        run_operation(operation)
+
+        for concurrency in (int(level) for level in args.concurrency.split(",")):
+            run_level(run_operation, operation, args.runs, concurrency, args.seed, args.incident_rate)
+        print(f"fake LLM: {server.requests} requests over {server.connections} connections")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Benchmark: per-step latency of the decision LLM call with a new ChatOpenAI client per
+step vs the shared, pooled client from Utilities.llm_clients. Runs against the local
+fake LLM server, which adds a configurable per-connection handshake delay.
+Run from the code directory: python benchmarks/bench_llm_clients.py --steps 50 --handshake-ms 40
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+# Local stand-ins for the LLM provider and the queue management API
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "test", "support")))
+
+from langchain_openai import ChatOpenAI
+from langchain.prompts import PromptTemplate
+from Platform.Agents.Decision.decisions import EXECUTE_OPERATION_PROMPT
+from Platform.Utilities import llm_clients
+from fake_llm_server import FakeLLMServer
+
+INPUTS = {"operation": "Determine the reason for downtime of an application", "history": '{"history": []}'}
+
+
+def step_new_client(base_url):
+    # Previous behaviour: a new client and chain on every graph step
+    llm = ChatOpenAI(model="gpt-4o-mini", temperature=0, base_url=base_url)
+    chain = PromptTemplate.from_template(EXECUTE_OPERATION_PROMPT) | llm
+    return chain.invoke(INPUTS)
+
+
+def step_pooled_client(base_url):
+    chain = llm_clients.get_chain("execute_operation", EXECUTE_OPERATION_PROMPT)
+    return chain.invoke(INPUTS)
+
+
+def measure(label, step, steps, server):
+    connections_before = server.connections
+    latencies = []
+    for _ in range(steps):
+        start = time.perf_counter()
+        step(server.base_url)
+        latencies.append(time.perf_counter() - start)
+    latencies.sort()
+    mean = sum(latencies) / len(latencies)
+    p95 = latencies[int(len(latencies) * 0.95) - 1]
+    print(f"{label:<20} mean={mean * 1000:8.2f}ms  p95={p95 * 1000:8.2f}ms  "
+          f"connections={server.connections - connections_before}")
+    return mean
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--steps", type=int, default=50)
+    parser.add_argument("--handshake-ms", type=float, default=40.0)
+    parser.add_argument("--latency-ms", type=float, default=5.0)
+    args = parser.parse_args()
+
+    os.environ.setdefault("OPENAI_API_KEY", "fake-key")
+    with FakeLLMServer(latency=args.latency_ms / 1000, handshake_delay=args.handshake_ms / 1000) as server:
+        os.environ["OPENAI_BASE_URL"] = server.base_url
+        new_client = measure("new client per step", step_new_client, args.steps, server)
+        pooled = measure("pooled client", step_pooled_client, args.steps, server)
+        print(f"saving per step: {(new_client - pooled) * 1000:.2f}ms")
+    llm_clients.clear()
+
+
+if __name__ == "__main__":
+    main()
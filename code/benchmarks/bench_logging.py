@@ -0,0 +1,107 @@
+"""
+Benchmark: request latency of the orchestrator API under concurrent load with the
+previous synchronous file handlers vs the queue based logging pipeline, optionally with
+sampling of the routine request lines and a simulated slow disk.
+Run from the code directory: python benchmarks/bench_logging.py --threads 16 --requests 200 --disk-latency-ms 1
+"""
+import argparse
+import logging
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src", "Platform", "orchestrator")))
+
+from app import app
+from logging_config import LOG_FILES, LOG_FORMAT, configure_logging, stop_logging
+
+
+def slow_disk(handler, latency):
+    # Emulates storage where each write blocks for latency seconds
+    emit = handler.emit
+
+    def slow_emit(record):
+        time.sleep(latency)
+        emit(record)
+    handler.emit = slow_emit
+    return handler
+
+
+def use_sync_handlers(logs_dir, latency):
+    # The previous setup: every logger writes to its file on the request thread
+    stop_logging()
+    for logger_name, filename in LOG_FILES.items():
+        logger = logging.getLogger(logger_name)
+        logger.handlers.clear()
+        handler = logging.FileHandler(logs_dir / filename)
+        handler.setFormatter(logging.Formatter(LOG_FORMAT))
+        logger.addHandler(slow_disk(handler, latency))
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+
+
+def use_queue_handlers(base_dir, latency, sample_rate):
+    for logger_name in LOG_FILES:
+        logging.getLogger(logger_name).handlers.clear()
+    listener = configure_logging(base_dir, sample_rate)
+    for handler in listener.handlers:
+        if isinstance(handler, logging.FileHandler):
+            slow_disk(handler, latency)
+        else:
+            # Keep the console quiet so only file writes are measured
+            handler.setLevel(logging.CRITICAL + 1)
+
+
+def measure(label, threads, requests):
+    client = app.test_client()
+    client.get('/api/agents')
+
+    def call(_):
+        start = time.perf_counter()
+        response = client.get('/api/agents')
+        assert response.status_code < 300
+        return time.perf_counter() - start
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        latencies = sorted(pool.map(call, range(threads * requests)))
+    elapsed = time.perf_counter() - start
+
+    p50 = latencies[len(latencies) // 2]
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+    print(f"{label:<18} requests={len(latencies):<6} req/s={len(latencies) / elapsed:8.1f} "
+          f"p50={p50 * 1000:7.2f}ms p99={p99 * 1000:7.2f}ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=200, help="requests per thread")
+    parser.add_argument("--disk-latency-ms", type=float, default=0.0)
+    parser.add_argument("--sample-rate", type=float, default=0.1)
+    args = parser.parse_args()
+    latency = args.disk_latency_ms / 1000
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        base_dir = Path(tmp_dir)
+        logs_dir = base_dir / "operations" / "logs"
+        logs_dir.mkdir(parents=True)
+
+        use_sync_handlers(logs_dir, latency)
+        measure("sync", args.threads, args.requests)
+
+        use_queue_handlers(base_dir, latency, 1.0)
+        measure("queue", args.threads, args.requests)
+        stop_logging()
+
+        use_queue_handlers(base_dir, latency, args.sample_rate)
+        measure(f"queue sampled={args.sample_rate}", args.threads, args.requests)
+        stop_logging()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""
+Benchmark: artifact size and load time of the model and vectorizer pickled separately
+with joblib (as training used to save them) vs registry bundles: float64, float32 (the
+default) and float32 compressed with joblib at level 3. Runs on a TF-IDF logistic
+regression and on a hashed SGD classifier like the incremental model, both trained on a
+synthetic corpus sampled from the incidents CSV with --hosts host names and --codes
+error codes appended to widen the vocabulary. Also times the hot swap of a running
+predictor to a newly activated version.
+Run from the code directory: python benchmarks/bench_model_registry.py --rows 20000 --labels 100
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.linear_model import LogisticRegression, SGDClassifier
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+
+from Platform.prediction_model.incremental import make_vectorizer
+from Platform.prediction_model.predictor import Predictor
+from Platform.prediction_model.registry import BUNDLE, ModelRegistry
+
+DATA_FILE = os.path.join(os.path.dirname(__file__), "..", "data", "incidents-generated-data-v3.csv")
+REPEATS = 5
+
+
+def synthetic_corpus(rows, labels, hosts, codes, seed):
+    rng = np.random.default_rng(seed)
+    source = pd.read_csv(DATA_FILE)
+    df = source.iloc[rng.integers(0, len(source), rows)].reset_index(drop=True)
+    texts = (df['Incident Name'] + " " + df['Incident Description']
+             + " on host" + pd.Series(rng.integers(0, hosts, rows)).astype(str)
+             + " error E" + pd.Series(rng.integers(0, codes, rows)).astype(str))
+    steps = "Runbook " + pd.Series(rng.integers(0, labels, rows)).astype(str)
+    return texts.tolist(), steps.to_numpy(dtype=object)
+
+
+def best_of(func):
+    times = []
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def legacy(directory, model, vectorizer):
+    os.makedirs(directory, exist_ok=True)
+    model_path, vectorizer_path = os.path.join(directory, "model.pkl"), os.path.join(directory, "vectorizer.pkl")
+    joblib.dump(model, model_path)
+    joblib.dump(vectorizer, vectorizer_path)
+    size = os.path.getsize(model_path) + os.path.getsize(vectorizer_path)
+    return size, best_of(lambda: (joblib.load(model_path), joblib.load(vectorizer_path)))
+
+
+def bundle(directory, model, vectorizer, **options):
+    registry = ModelRegistry(directory, **options)
+    version = registry.publish(model, vectorizer)
+    size = os.path.getsize(os.path.join(registry._version_dir(version), BUNDLE))
+    return size, best_of(registry.load)
+
+
+def report(name, model, vectorizer, texts, directory):
+    expected = model.predict(vectorizer.transform(texts[:1000]))
+    print(f"{name}: {len(model.classes_)} classes x {model.coef_.shape[1]} features")
+    legacy_size, legacy_time = legacy(os.path.join(directory, name), model, vectorizer)
+    print(f"  {'separate pickles':28s} {legacy_size / 2 ** 20:8.2f} MiB   load {legacy_time * 1000:8.1f} ms")
+    for label, options in [("bundle float64", {"dtype": "float64", "compress": 0}),
+                           ("bundle float32", {"dtype": "float32", "compress": 0}),
+                           ("bundle float32 compressed", {"dtype": "float32", "compress": 3})]:
+        registry_dir = os.path.join(directory, name, label.replace(" ", "-"))
+        size, load_time = bundle(registry_dir, model, vectorizer, **options)
+        loaded_model, loaded_vectorizer, _ = ModelRegistry(registry_dir).load()
+        agreement = np.mean(loaded_model.predict(loaded_vectorizer.transform(texts[:1000])) == expected)
+        print(f"  {label:28s} {size / 2 ** 20:8.2f} MiB   load {load_time * 1000:8.1f} ms   "
+              f"same predictions {agreement:.1%}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--labels", type=int, default=100)
+    parser.add_argument("--hosts", type=int, default=20000)
+    parser.add_argument("--codes", type=int, default=5000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    texts, steps = synthetic_corpus(args.rows, args.labels, args.hosts, args.codes, args.seed)
+    vectorizer = TfidfVectorizer()
+    model = LogisticRegression(max_iter=50).fit(vectorizer.fit_transform(texts), steps)
+    hashing = make_vectorizer()
+    hashed_model = SGDClassifier(loss="log_loss", random_state=42).fit(hashing.transform(texts), steps)
+
+    with tempfile.TemporaryDirectory() as directory:
+        report("tfidf-logistic", model, vectorizer, texts, directory)
+        report("hashed-sgd", hashed_model, hashing, texts, directory)
+
+        registry = ModelRegistry(os.path.join(directory, "serving"))
+        registry.publish(model, vectorizer)
+        predictor = Predictor(registry=registry, refresh_interval=0)
+        predictor.predict(texts[:1])
+        registry.publish(model, vectorizer)
+        start = time.perf_counter()
+        predictor.refresh()
+        print(f"hot swap to version {predictor.version}: {(time.perf_counter() - start) * 1000:.1f} ms, "
+              f"predictions keep being served meanwhile")
+
+
+if __name__ == "__main__":
+    main()
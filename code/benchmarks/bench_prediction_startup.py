@@ -0,0 +1,60 @@
+"""
+Benchmark: startup cost of the prediction service in fresh interpreters, split into the
+import of Platform.prediction_model.main (which loads nothing), the first prediction
+(which loads the artifacts) and a warm prediction, with the artifacts read into memory
+and memory-mapped.
+Run from the code directory: python benchmarks/bench_prediction_startup.py --repeats 5
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+SRC_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src"))
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+from Platform.prediction_model import main
+imported = time.perf_counter()
+modules = len(sys.modules)
+predictor = main.get_predictor()
+predictor.predict(["Cloud backup failure"])
+first = time.perf_counter()
+predictor.predict(["Database connection refused"])
+warm = time.perf_counter()
+print(json.dumps({
+    "import": imported - start,
+    "first_prediction": first - imported,
+    "warm_prediction": warm - first,
+    "modules": modules,
+}))
+"""
+
+
+def probe(mmap_mode):
+    env = dict(os.environ, PYTHONPATH=SRC_DIR, PREDICTION_MMAP_MODE=mmap_mode or "")
+    # Startup without an API key must work, the key is only needed to format steps
+    env.pop("GEMINI_API_KEY", None)
+    output = subprocess.run([sys.executable, "-c", PROBE], env=env, check=True,
+                            capture_output=True, text=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    for label, mmap_mode in (("memory", None), ("mmap", "r")):
+        runs = [probe(mmap_mode) for _ in range(args.repeats)]
+        timings = {key: statistics.median(run[key] for run in runs) * 1000
+                   for key in ("import", "first_prediction", "warm_prediction")}
+        print(f"{label:<7} import={timings['import']:8.1f}ms first_prediction={timings['first_prediction']:8.1f}ms "
+              f"warm_prediction={timings['warm_prediction']:6.2f}ms modules_after_import={runs[0]['modules']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+Benchmark: predicting debugging steps for a batch of incidents one description at a
+time vs the batch entry point, each starting from an empty flow cache, and one at a time
+again with the flow cache already filled. The LLM formatting is replaced by a stub that
+takes --llm-latency-ms per call so no Gemini key is needed.
+Run from the code directory: python benchmarks/bench_predictions.py --incidents 10000 --llm-latency-ms 1
+"""
+import argparse
+import os
+import sys
+import time
+from unittest.mock import patch
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+
+DATA_FILE = os.path.join(os.path.dirname(__file__), "..", "data", "incidents-generated-data-v3.csv")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--incidents", type=int, default=10000)
+    parser.add_argument("--llm-latency-ms", type=float, default=1.0, help="simulated formatting call time")
+    args = parser.parse_args()
+
+    os.environ.setdefault("GEMINI_API_KEY", "offline-benchmark")
+    from Platform.prediction_model import main as prediction
+    from Platform.prediction_model.flow_cache import FlowCache, set_flow_cache
+
+    descriptions = pd.read_csv(DATA_FILE)["Incident Description"].dropna().astype(str)
+    incidents = descriptions.sample(args.incidents, replace=True, random_state=0).tolist()
+
+    calls = []
+
+    def format_stub(steps):
+        calls.append(steps)
+        time.sleep(args.llm_latency_ms / 1000)
+        return steps
+
+    results = {}
+    with patch.object(prediction, "format_debugging_steps_with_llm", format_stub):
+        for label, cold in (("single", True), ("batch", True), ("cached", False)):
+            if cold:
+                set_flow_cache(FlowCache(path=None))
+            calls.clear()
+            start = time.perf_counter()
+            if label == "batch":
+                output = prediction.predict_debugging_steps_batch(incidents)
+            else:
+                output = [prediction.predict_debugging_step(incident) for incident in incidents]
+            results[label] = (output, time.perf_counter() - start, len(calls))
+
+    assert results["single"][0] == results["batch"][0] == results["cached"][0]
+    for label, (_, seconds, format_calls) in results.items():
+        print(f"{label:<7} incidents={len(incidents):<7} total={seconds:8.3f}s "
+              f"incidents/s={len(incidents) / seconds:10.1f} format_calls={format_calls}")
+    print(f"batch speedup: {results['single'][1] / results['batch'][1]:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Benchmark: cleaning a synthetic incidents file row by row (clean_text through
+DataFrame.apply and a row-wise join, as the preprocessing used to) vs the vectorized
+prepare_incidents, and loading the cleaned corpus from the preprocessing cache.
+The synthetic rows are sampled from the incidents CSV with one of 500 host names and
+100 error codes appended. Lemmatizing needs the wordnet corpus, without it run with
+PREDICTION_LEMMATIZE=false, which makes the row-wise baseline cheaper than it is with
+WordNetLemmatizer.
+Run from the code directory: python benchmarks/bench_preprocess.py --rows 1000000
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+
+from Platform.prediction_model.preprocess import TEXT_COLUMNS, clean_text, load_prepared_incidents, prepare_incidents
+
+DATA_FILE = os.path.join(os.path.dirname(__file__), "..", "data", "incidents-generated-data-v3.csv")
+
+
+def synthetic_incidents(rows, seed):
+    rng = np.random.default_rng(seed)
+    source = pd.read_csv(DATA_FILE)
+    df = source.iloc[rng.integers(0, len(source), rows)].reset_index(drop=True)
+    df['Incident Name'] = df['Incident Name'] + " on host-" + pd.Series(rng.integers(0, 500, rows)).astype(str)
+    df['Incident Description'] = (df['Incident Description'] + " Error code E"
+                                  + pd.Series(rng.integers(0, 100, rows)).astype(str) + ".")
+    return df
+
+
+def row_wise(df):
+    df = df[TEXT_COLUMNS].fillna({'Incident Name': 'Unknown Incident', 'Incident Description': 'No Description',
+                                  'Resolution': 'No Resolution', 'First Debugging Step': 'Unknown Step'})
+    df = df.fillna('').astype(str)
+    for column in TEXT_COLUMNS[:4]:
+        df[column] = df[column].apply(lambda x: clean_text(x, remove_stopwords=False))
+    return df[TEXT_COLUMNS].apply(lambda x: ' '.join(x), axis=1)
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1000000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    df = synthetic_incidents(args.rows, args.seed)
+    with tempfile.TemporaryDirectory() as directory:
+        csv = os.path.join(directory, "incidents.csv")
+        df.to_csv(csv, index=False)
+
+        expected, row_seconds = timed(row_wise, df)
+        prepared, vectorized_seconds = timed(prepare_incidents, df)
+        assert prepared['combined_text'].tolist() == expected.tolist()
+
+        cache_dir = os.path.join(directory, "cache")
+        _, cold_seconds = timed(load_prepared_incidents, csv, cache_dir)
+        cached, warm_seconds = timed(load_prepared_incidents, csv, cache_dir)
+        assert cached['combined_text'].tolist() == expected.tolist()
+        cache_file = os.listdir(cache_dir)[0]
+
+    print(f"rows={args.rows}")
+    print(f"row_wise    {row_seconds:8.3f}s")
+    print(f"vectorized  {vectorized_seconds:8.3f}s  speedup={row_seconds / vectorized_seconds:6.1f}x")
+    print(f"cache_cold  {cold_seconds:8.3f}s  (read CSV, clean, write {os.path.splitext(cache_file)[1]})")
+    print(f"cache_warm  {warm_seconds:8.3f}s  speedup={row_seconds / warm_seconds:6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
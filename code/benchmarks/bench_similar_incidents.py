@@ -0,0 +1,81 @@
+"""
+Benchmark: similar incident search over a growing synthetic incident history, reporting
+the time to build the index, to add a batch of new incidents, and the p50/p99 latency of
+top-k queries, against a brute force scan that recomputes the TF-IDF weights of every
+incident per query.
+Run from the code directory: python benchmarks/bench_similar_incidents.py --sizes 10000,100000 --queries 200
+"""
+import argparse
+import os
+import sys
+import time
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+
+from Platform.prediction_model.similar_incidents import SimilarIncidentIndex
+
+DATA_FILE = os.path.join(os.path.dirname(__file__), "..", "data", "incidents-generated-data-v3.csv")
+
+
+def synthetic_incidents(rows, seed):
+    rng = np.random.default_rng(seed)
+    source = pd.read_csv(DATA_FILE)
+    df = source.iloc[rng.integers(0, len(source), rows)].reset_index(drop=True)
+    df["Incident ID"] = [f"INC{seed}-{i}" for i in range(rows)]
+    df["Incident Description"] = (df["Incident Description"] + " on host-" + pd.Series(rng.integers(0, 5000, rows)).astype(str)
+                                  + " error E" + pd.Series(rng.integers(0, 1000, rows)).astype(str))
+    return df.to_dict("records")
+
+
+def brute_force(index, text, k):
+    # Recomputes the idf weights and norms on every query, as an index without precomputation would
+    index._snapshot = None
+    return index.query(text, k)
+
+
+def percentiles(func, queries, k):
+    timings = []
+    for query in queries:
+        start = time.perf_counter()
+        func(query, k)
+        timings.append(time.perf_counter() - start)
+    return np.percentile(timings, 50) * 1000, np.percentile(timings, 99) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", default="10000,100000", help="comma separated history sizes")
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--batch", type=int, default=1000, help="incidents added incrementally")
+    parser.add_argument("--k", type=int, default=5)
+    args = parser.parse_args()
+
+    queries = [incident["Incident Description"] for incident in synthetic_incidents(args.queries, seed=99)]
+    batch = synthetic_incidents(args.batch, seed=7)
+
+    for size in (int(s) for s in args.sizes.split(",")):
+        incidents = synthetic_incidents(size, seed=0)
+        index = SimilarIncidentIndex()
+
+        start = time.perf_counter()
+        index.add(incidents)
+        index.query("warm up", args.k)
+        build_seconds = time.perf_counter() - start
+
+        p50, p99 = percentiles(index.query, queries, args.k)
+
+        start = time.perf_counter()
+        index.add(batch)
+        index.query("warm up", args.k)
+        add_seconds = time.perf_counter() - start
+
+        brute_p50, _ = percentiles(lambda text, k: brute_force(index, text, k), queries[:20], args.k)
+
+        print(f"size={size:<8} build={build_seconds:7.3f}s add_{args.batch}={add_seconds * 1000:8.1f}ms "
+              f"query_p50={p50:7.2f}ms query_p99={p99:7.2f}ms brute_force_p50={brute_p50:8.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+Benchmark: generating measurements for a fleet of simulated applications, one
+random.randrange call per app and metric as the measure agents used to do vs the
+vectorized fleet simulator, plus per-app reads through the simulator.
+Run from the code directory: python benchmarks/bench_simulation.py --apps 10000 --ticks 32
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+
+from Platform.Agents.Measure.simulation import METRICS, FleetSimulator
+
+
+def scalar(apps, ticks):
+    generator = random.Random(0)
+    for _ in range(ticks):
+        for spec in METRICS.values():
+            for _ in range(apps):
+                generator.randrange(spec["low"], spec["high"], spec["step"])
+
+
+def vectorized(apps, ticks, incident_rate):
+    simulator = FleetSimulator(n_apps=apps, seed=0, incident_rate=incident_rate, block_size=ticks)
+    for tick in range(ticks):
+        simulator.tick(tick)
+
+
+def reads(apps, ticks, incident_rate):
+    simulator = FleetSimulator(n_apps=apps, seed=0, incident_rate=incident_rate)
+    for _ in range(ticks):
+        for metric in METRICS:
+            for app in range(apps):
+                simulator.read(metric, app)
+
+
+def measure(label, func, readings):
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<12} readings={readings:<9} total={elapsed:8.3f}s per_million={elapsed / readings * 1e6:8.3f}s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--apps", type=int, default=10000)
+    parser.add_argument("--ticks", type=int, default=32)
+    parser.add_argument("--incident-rate", type=float, default=0.01)
+    args = parser.parse_args()
+    readings = args.apps * args.ticks * len(METRICS)
+
+    measure("randrange", lambda: scalar(args.apps, args.ticks), readings)
+    measure("vectorized", lambda: vectorized(args.apps, args.ticks, args.incident_rate), readings)
+    measure("reads", lambda: reads(args.apps, args.ticks, args.incident_rate), readings)
+
+
+if __name__ == "__main__":
+    main()
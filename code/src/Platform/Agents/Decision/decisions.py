@@ -1,61 +1,117 @@
-from langchain_openai import ChatOpenAI
-from langchain.prompts import PromptTemplate
-from langchain.chains import RetrievalQA
-from langchain_community.llms import OpenAI
-from Platform.Utilities.agent_response_management import get_history_object
-import json
-import os
+from Platform.Utilities.agent_response_management import history_entry, serialize_history
+from Platform.Utilities.llm_clients import get_chain
+from Platform.Agents.agent_registry import get_agent_registry
+from Platform.Agents.Decision.router import get_router, router_stats
+from Platform.Agents.Decision.response_cache import get_decision_cache, make_key, normalize_history
+from Platform.Flows.instrumentation import record_llm_usage
+import re
+import time
 
-def execute_operation(state):
-    action = state['operation']
-    llm = ChatOpenAI(model="gpt-4o-mini", temperature=0)
-    prompt = PromptTemplate.from_template("""
-    You are an agent that executes a given opertion step by step, 
+MODEL = "gpt-4o-mini"
+
+EXECUTE_OPERATION_PROMPT = """
+    You are an agent that executes a given opertion step by step,
     the operation description is passed to you, the already completed steps is passed as state
- 
+
     Operation : {operation}
-                                          
+
     State : {history}
 
-    Analyse the operation and state. Indicate in a short scentence which action to to be taken next, 
+    Analyse the operation and state. Indicate in a short scentence which action to to be taken next,
+    if several checks can be done next and do not depend on each others results, name all of them in the same scentence,
     if operation is completed give a single word 'completed'".
 
-    """)
-    chain = prompt | llm
-    response = chain.invoke({"operation":action,"history": state["history"]})
-    decision = response.content.strip().lower()
-    new_history =  get_history_object({"history":state["history"]},{"agent":"execute_operation","output":decision})
+    """
+
+EXECUTE_AGENT_PROMPT = """
+    You are an agent that identifies the which is the agent that has to be called to full fill the action requested,
+    the list of agents and discription are provided in the agents property
+
+    action: {action}
+    agents : {agents}
+
+    Analyse and output a single word which is the name of the agent to be called,
+    if the action asks for several independent checks output the names of all the agents separated by commas, no other text should be included".
+
+    """
+
+def invoke_decision(node, template, inputs, key_inputs):
+    """
+    Runs the prompt chain for a decision node. The models run with temperature 0, so a
+    repeated prompt is served from the response cache instead of a new LLM call.
+    Returns the response text and whether it came from the cache.
+    """
+    cache = get_decision_cache()
+    if cache is not None:
+        key = make_key(node, MODEL, template, **key_inputs)
+        content = cache.get(key)
+        if content is not None:
+            return content, True
+
+    response = get_chain(node, template, model=MODEL).invoke(inputs)
+    record_llm_usage(node, response)
+    content = response.content
+
+    if cache is not None:
+        cache.set(key, content)
+    return content, False
+
+def execute_operation(state):
+    action = state['operation']
+    content, _ = invoke_decision(
+        "execute_operation",
+        EXECUTE_OPERATION_PROMPT,
+        {"operation":action,"history": serialize_history(state["history"])},
+        {"operation":action,"history": normalize_history(state["history"])}
+    )
+    decision = content.strip().lower()
+    new_history = history_entry("execute_operation", decision)
 
     if 'completed' in decision:
         return {"history": new_history,"action":"completed"}
     else:
         return {"history": new_history,"action":"execute_agent", "input":decision}
 
+def parse_agent_names(content, known_agents):
+    """
+    Splits the routing answer into agent names, keeping only agents that exist and
+    the order in which they were given.
+    """
+    agents = []
+    for name in re.split(r"[\s,;]+", content.strip().lower()):
+        name = name.strip(".'\"`")
+        if name in known_agents and name not in agents:
+            agents.append(name)
+    return agents
+
 def execute_agent(state):
-    llm = ChatOpenAI(model="gpt-4o-mini", temperature=0)
     next_action = state["input"]
+    registry = get_agent_registry()
 
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    parent = os.path.dirname(script_dir)
-    file_path = os.path.join(parent,"agents.json")
-
-    # Open and read the JSON file
-    with open(file_path, 'r') as file:
-        agents = json.load(file)
-
-    prompt = PromptTemplate.from_template("""
-    You are an agent that identifies the which is the agent that has to be called to full fill the action requested, 
-    the list of agents and discription are provided in the agents property
- 
-    action: {action}                                     
-    agents : {agents}
-   
-    Analyse and output a single word which is the name of the agent to be called, no other text should be included".
+    # Obvious actions are mapped locally, the LLM is only asked when the match is ambiguous
+    agents_to_call = get_router().route_all(next_action)
+    fast_path = agents_to_call is not None
+    if fast_path:
+        router_stats.record_hit()
+    else:
+        router_stats.record_miss()
 
-    """)
-    chain = prompt | llm
-    response = chain.invoke({"action":next_action, "agents":agents})
-    agent_to_call = response.content.strip().lower()
+        start = time.perf_counter()
+        content, cached = invoke_decision(
+            "execute_agent",
+            EXECUTE_AGENT_PROMPT,
+            {"action":next_action, "agents":registry.catalog()},
+            {"action":next_action, "agents":registry.content_hash}
+        )
+        if not cached:
+            router_stats.record_llm_call(time.perf_counter() - start)
+        agents_to_call = parse_agent_names(content, registry.names())
 
-    new_history =  get_history_object({"history":state["history"]},{"agent":"execute_agent","output":agent_to_call})
-    return {"history": new_history,"action":agent_to_call}
+    # Independent agents fan out in parallel within one graph step
+    new_history = history_entry("execute_agent", ", ".join(agents_to_call))
+    return {
+        "history": new_history,
+        "action": ", ".join(agents_to_call),
+        "agents": agents_to_call,
+        "fast_path_hits": 1 if fast_path else 0
+    }
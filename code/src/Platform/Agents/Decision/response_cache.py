@@ -0,0 +1,209 @@
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from Platform.Utilities.agent_response_management import HistoryFold
+
+# Defaults for the shared decision cache, DECISION_CACHE_PATH enables the SQLite tier
+CACHE_ENABLED = os.getenv("DECISION_CACHE_ENABLED", "true").lower() != "false"
+CACHE_SIZE = int(os.getenv("DECISION_CACHE_SIZE", "1024"))
+CACHE_TTL = float(os.getenv("DECISION_CACHE_TTL", "86400"))
+CACHE_PATH = os.getenv("DECISION_CACHE_PATH")
+CACHE_DISK_SIZE = int(os.getenv("DECISION_CACHE_DISK_SIZE", "100000"))
+
+_WHITESPACE = re.compile(r"\s+")
+# Output fields that differ between runs with the same outcome, such as the age of a
+# reused measurement, left out of the key so they do not defeat the cache
+VOLATILE_FIELDS = frozenset({"age_seconds"})
+
+
+def _normalize(value):
+    if isinstance(value, str):
+        return _WHITESPACE.sub(" ", value).strip().lower()
+    if isinstance(value, dict):
+        return {str(k): _normalize(v) for k, v in value.items() if k not in VOLATILE_FIELDS}
+    if isinstance(value, (list, tuple)):
+        return [_normalize(v) for v in value]
+    return value
+
+
+def _normalize_entry(entry):
+    return json.dumps(_normalize(entry), sort_keys=True, separators=(",", ":"))
+
+
+_normalized_entries = HistoryFold(_normalize_entry, ",")
+
+
+def normalize_history(history):
+    """
+    Canonical text form of a history, so runs with identical measurement outcomes map
+    to the same cache key regardless of key order, case, whitespace or the age of the
+    readings. Entries are
+    normalized once per run, as in serialize_history.
+    """
+    return "[" + _normalized_entries(history) + "]"
+
+
+def make_key(node, model, template, **inputs):
+    """
+    Cache key for one decision call, built from the node, the model, the prompt template
+    and the prompt inputs. The template hash keeps answers given under an older prompt
+    from being served after the prompt changes.
+    """
+    template_hash = hashlib.sha256(template.encode("utf-8")).hexdigest()
+    payload = json.dumps(
+        {"node": node, "model": model, "template": template_hash, "inputs": _normalize(inputs)},
+        sort_keys=True,
+        separators=(",", ":")
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """
+    Two tier cache for LLM decisions: an in-process LRU and an optional SQLite file
+    shared between processes and restarts. Entries expire after ttl seconds and each
+    tier is bounded in size.
+    """
+
+    def __init__(self, max_entries=CACHE_SIZE, ttl=CACHE_TTL, sqlite_path=None,
+                 max_disk_entries=CACHE_DISK_SIZE, clock=time.time):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.max_disk_entries = max_disk_entries
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._memory = OrderedDict()
+        self._db = None
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        if sqlite_path:
+            self._db = sqlite3.connect(str(sqlite_path), check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, created_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS responses_accessed_at ON responses (accessed_at)")
+            self._db.commit()
+
+    def get(self, key):
+        now = self.clock()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                value, created_at = entry
+                if now - created_at < self.ttl:
+                    self._memory.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._memory[key]
+
+            if self._db is not None:
+                row = self._db.execute(
+                    "SELECT value, created_at FROM responses WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None and now - row[1] < self.ttl:
+                    self._db.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+                    self._db.commit()
+                    self._remember(key, row[0], row[1])
+                    self.hits += 1
+                    self.disk_hits += 1
+                    return row[0]
+                if row is not None:
+                    self._db.execute("DELETE FROM responses WHERE key = ?", (key,))
+                    self._db.commit()
+
+            self.misses += 1
+            return None
+
+    def set(self, key, value):
+        now = self.clock()
+        with self._lock:
+            self._remember(key, value, now)
+
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO responses (key, value, created_at, accessed_at) VALUES (?, ?, ?, ?)",
+                    (key, value, now, now)
+                )
+                # Drop expired rows, then the least recently used ones beyond the size bound
+                self._db.execute("DELETE FROM responses WHERE created_at <= ?", (now - self.ttl,))
+                self._db.execute(
+                    "DELETE FROM responses WHERE key IN ("
+                    "SELECT key FROM responses ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                    (self.max_disk_entries,)
+                )
+                self._db.commit()
+
+    def _remember(self, key, value, created_at):
+        self._memory[key] = (value, created_at)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+            self.evictions += 1
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "memory_entries": len(self._memory)
+            }
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM responses")
+                self._db.commit()
+
+    def close(self):
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+
+# Not built yet, the shared cache is created on first use so importing this module opens no file
+_UNSET = object()
+_decision_cache = _UNSET
+_decision_cache_lock = threading.Lock()
+
+
+def get_decision_cache():
+    """
+    Returns the cache used by the decision nodes, None when caching is disabled.
+    """
+    global _decision_cache
+    if _decision_cache is _UNSET:
+        with _decision_cache_lock:
+            if _decision_cache is _UNSET:
+                _decision_cache = ResponseCache(sqlite_path=CACHE_PATH) if CACHE_ENABLED else None
+    return _decision_cache
+
+
+def set_decision_cache(cache):
+    """
+    Replaces the cache used by the decision nodes, pass None to disable caching.
+    """
+    global _decision_cache
+    _decision_cache = cache
+
+
+def reset_decision_cache():
+    """
+    Drops the shared cache, the next get_decision_cache builds it again from the settings.
+    """
+    global _decision_cache
+    _decision_cache = _UNSET
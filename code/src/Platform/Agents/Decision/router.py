@@ -0,0 +1,240 @@
+import math
+import os
+import re
+import threading
+from collections import Counter
+from dataclasses import dataclass
+from Platform.Agents.agent_registry import get_agent_registry
+
+# Set ROUTER_FAST_PATH=false to always route through the LLM
+FAST_PATH_ENABLED = os.getenv("ROUTER_FAST_PATH", "true").lower() != "false"
+
+# Minimum cosine similarity and lead over the runner-up before the LLM is skipped
+MIN_SCORE = float(os.getenv("ROUTER_MIN_SCORE", "0.35"))
+MIN_MARGIN = float(os.getenv("ROUTER_MIN_MARGIN", "0.15"))
+
+# Agent names carry more signal than the free text description
+NAME_WEIGHT = 2
+
+STOP_WORDS = {
+    "a", "an", "and", "any", "are", "be", "by", "can", "check", "checks", "do", "for", "from",
+    "if", "in", "is", "it", "its", "next", "now", "of", "on", "or", "part", "report", "reports",
+    "the", "then", "there", "this", "to", "u", "we", "whether", "with"
+}
+
+# Common variants used by the operation text that do not appear in agents.json
+SYNONYMS = {
+    "db": "database",
+    "databse": "database",
+    "applucation": "application",
+    "logs": "log",
+    "queload": "queue load",
+    "latency": "response time",
+    "common": "frequent",
+    "login": "credentials",
+    "password": "credentials",
+    "connectivity": "connection"
+}
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+# Separators between independent checks asked for in one action, "then" implies an order and is not split
+CLAUSE_PATTERN = re.compile(r",|;|\band\b|\bas well as\b|\balong with\b")
+
+
+def tokenize(text):
+    """
+    Lower cases, splits on anything that is not a letter or digit (including the
+    underscores in agent names) and maps known synonyms. Plurals are kept, "connection"
+    and "connections" point at different agents.
+    """
+    tokens = []
+    for word in TOKEN_PATTERN.findall(str(text).lower()):
+        for token in SYNONYMS.get(word, word).split():
+            if token not in STOP_WORDS:
+                tokens.append(token)
+    return tokens
+
+
+@dataclass
+class RouteDecision:
+    agent: str
+    score: float
+    margin: float
+
+
+class RouterStats:
+    """
+    Thread safe counters for fast path hits, LLM fallbacks and the routing latency saved.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.llm_calls = 0
+        self.llm_seconds = 0.0
+
+    def record_hit(self):
+        with self._lock:
+            self.hits += 1
+
+    def record_miss(self):
+        with self._lock:
+            self.misses += 1
+
+    def record_llm_call(self, seconds):
+        with self._lock:
+            self.llm_calls += 1
+            self.llm_seconds += seconds
+
+    @property
+    def average_llm_seconds(self):
+        return self.llm_seconds / self.llm_calls if self.llm_calls else 0.0
+
+    def latency_saved(self, hits=None):
+        """Estimated seconds saved by the given number of hits, all hits by default"""
+        return (self.hits if hits is None else hits) * self.average_llm_seconds
+
+    def snapshot(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0,
+                "llm_calls": self.llm_calls,
+                "average_llm_seconds": self.average_llm_seconds,
+                "latency_saved_seconds": self.latency_saved()
+            }
+
+    def reset(self):
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+            self.llm_calls = 0
+            self.llm_seconds = 0.0
+
+
+class AgentRouter:
+    """
+    Scores an action sentence against the agents catalog with TF-IDF cosine similarity
+    over agent names and descriptions. Returns an agent only when the match is clear,
+    otherwise None so the caller falls back to the LLM.
+    """
+
+    def __init__(self, registry=None, min_score=MIN_SCORE, min_margin=MIN_MARGIN):
+        self.registry = registry or get_agent_registry()
+        self.min_score = min_score
+        self.min_margin = min_margin
+        self._lock = threading.Lock()
+        self._catalog_hash = None
+        self._vectors = {}
+        self._idf = {}
+
+    def _build(self):
+        catalog_hash = self.registry.content_hash
+        if catalog_hash == self._catalog_hash:
+            return
+
+        with self._lock:
+            if catalog_hash == self._catalog_hash:
+                return
+
+            documents = {}
+            for agent in self.registry.agents():
+                counts = Counter(tokenize(agent.get("discription", "")))
+                counts.update(tokenize(agent.get("addtionalinfo", "")))
+                for token in tokenize(agent["name"]):
+                    counts[token] += NAME_WEIGHT
+                documents[agent["name"]] = counts
+
+            document_frequency = Counter(token for counts in documents.values() for token in counts)
+            idf = {token: math.log((1 + len(documents)) / (1 + df)) + 1 for token, df in document_frequency.items()}
+
+            vectors = {}
+            for name, counts in documents.items():
+                vector = {token: count * idf[token] for token, count in counts.items()}
+                norm = math.sqrt(sum(v * v for v in vector.values())) or 1.0
+                vectors[name] = {token: v / norm for token, v in vector.items()}
+
+            self._idf = idf
+            self._vectors = vectors
+            self._catalog_hash = catalog_hash
+
+    def score(self, action):
+        """Returns (agent, similarity) pairs, best first"""
+        self._build()
+        counts = Counter(token for token in tokenize(action) if token in self._idf)
+        if not counts:
+            return []
+
+        query = {token: count * self._idf[token] for token, count in counts.items()}
+        norm = math.sqrt(sum(v * v for v in query.values()))
+        scores = [
+            (name, sum(weight * vector.get(token, 0.0) for token, weight in query.items()) / norm)
+            for name, vector in self._vectors.items()
+        ]
+        return sorted(scores, key=lambda item: item[1], reverse=True)
+
+    def route(self, action):
+        """Returns a RouteDecision when one agent clearly matches the action, else None"""
+        if not FAST_PATH_ENABLED:
+            return None
+
+        text = str(action).lower()
+        names = self.registry.names()
+
+        # An agent named verbatim in the action is an unambiguous match
+        named = [name for name in names if name in text or name.replace("_", " ") in text]
+        if len(named) == 1:
+            return RouteDecision(agent=named[0], score=1.0, margin=1.0)
+
+        scores = self.score(action)
+        if not scores:
+            return None
+
+        best_agent, best_score = scores[0]
+        runner_up = scores[1][1] if len(scores) > 1 else 0.0
+        margin = best_score - runner_up
+        if best_score >= self.min_score and margin >= self.min_margin:
+            return RouteDecision(agent=best_agent, score=best_score, margin=margin)
+        return None
+
+    def route_all(self, action):
+        """
+        Routes an action that may ask for several independent checks. Returns the agent
+        names in the order they were asked for, or None if any part is ambiguous.
+        """
+        clauses = [clause for clause in CLAUSE_PATTERN.split(str(action)) if clause.strip()]
+        if len(clauses) > 1:
+            agents = []
+            for clause in clauses:
+                decision = self.route(clause)
+                if decision is None:
+                    agents = None
+                    break
+                if decision.agent not in agents:
+                    agents.append(decision.agent)
+            if agents:
+                return agents
+
+        decision = self.route(action)
+        return [decision.agent] if decision is not None else None
+
+
+router_stats = RouterStats()
+_router = None
+_router_lock = threading.Lock()
+
+
+def get_router():
+    """
+    Returns the shared router over the default agents catalog.
+    """
+    global _router
+    if _router is None:
+        with _router_lock:
+            if _router is None:
+                _router = AgentRouter()
+    return _router
@@ -0,0 +1,316 @@
+import json
+import logging
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+import requests
+from requests.adapters import HTTPAdapter
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import SQLAlchemyError
+from Platform.Agents.Measure import simulation
+from Platform.Agents.Measure.measurement_cache import get_measurement_cache
+
+# JSON file describing the real backends, the measure agents fall back to the simulator without it
+COLLECTORS_FILE = os.getenv("MEASURE_COLLECTORS_FILE")
+
+logger = logging.getLogger(__name__)
+
+
+class Collector(ABC):
+    """
+    Plugin interface for reading a measurement from a real backend. A collector serves
+    the metrics it lists, for any number of targets, and keeps its connections open
+    between calls so graph steps do not reconnect.
+
+    Its readings are graded by the thresholds it gives for them, in the units of the
+    backend, or by the agent's defaults, which are scaled to the simulator, when it has
+    none. Thresholds in the collectors file take precedence over both.
+    """
+    metrics = ()
+    # Upper bounds of the green and yellow ranges of each metric, a single bound for database_ping
+    THRESHOLDS = {}
+
+    @abstractmethod
+    def collect(self, metric, target):
+        """Current reading of metric from target"""
+
+    def thresholds(self, metric, target):
+        """Thresholds grading the readings of metric from target, None for the agent's defaults"""
+        return self.THRESHOLDS.get(metric)
+
+    def close(self):
+        pass
+
+
+class SqlAlchemyCollector(Collector):
+    """
+    Database ping and connection count over one pooled SQLAlchemy engine per database URL.
+    database_ping returns the round trip of SELECT 1 in milliseconds, None if the database
+    cannot be reached.
+    """
+    metrics = ("database_ping", "database_connections")
+
+    # Ping round trip in milliseconds
+    THRESHOLDS = {"database_ping": 50}
+
+    # Number of sessions connected to the server, by dialect
+    CONNECTIONS_QUERIES = {
+        "postgresql": "SELECT count(*) FROM pg_stat_activity",
+        "mysql": "SELECT VARIABLE_VALUE FROM performance_schema.global_status WHERE VARIABLE_NAME = 'Threads_connected'",
+        "mssql": "SELECT count(*) FROM sys.dm_exec_sessions WHERE is_user_process = 1",
+        "oracle": "SELECT count(*) FROM v$session WHERE type = 'USER'",
+    }
+
+    def __init__(self, pool_size=5, max_overflow=5, pool_recycle=1800, pool_timeout=5, connections_query=None):
+        self.engine_options = {
+            "pool_size": pool_size,
+            "max_overflow": max_overflow,
+            "pool_recycle": pool_recycle,
+            "pool_timeout": pool_timeout,
+        }
+        self.connections_query = connections_query
+        self._lock = threading.Lock()
+        self._engines = {}
+
+    def engine(self, target):
+        engine = self._engines.get(target)
+        if engine is None:
+            with self._lock:
+                engine = self._engines.get(target)
+                if engine is None:
+                    engine = self._engines[target] = create_engine(target, **self.engine_options)
+        return engine
+
+    def collect(self, metric, target):
+        engine = self.engine(target)
+        if metric == "database_ping":
+            start = time.perf_counter()
+            try:
+                with engine.connect() as connection:
+                    connection.execute(text("SELECT 1"))
+            except SQLAlchemyError:
+                return None
+            return round((time.perf_counter() - start) * 1000, 3)
+
+        query = self.connections_query or self.CONNECTIONS_QUERIES.get(engine.dialect.name)
+        if query is None:
+            # Dialects without a session view, such as SQLite, report the pooled connections in use
+            return engine.pool.checkedout()
+        with engine.connect() as connection:
+            return int(connection.execute(text(query)).scalar())
+
+    def thresholds(self, metric, target):
+        if metric == "database_connections" and not self.connections_query \
+                and self.engine(target).dialect.name not in self.CONNECTIONS_QUERIES:
+            # Pooled connections in use, busy once the pool is exhausted and red once the overflow is
+            pool_size = self.engine_options["pool_size"]
+            return (pool_size, pool_size + self.engine_options["max_overflow"])
+        return super().thresholds(metric, target)
+
+    def close(self):
+        with self._lock:
+            for engine in self._engines.values():
+                engine.dispose()
+            self._engines.clear()
+
+
+class HttpQueueCollector(Collector):
+    """
+    Queue statistics from an HTTP management API, such as RabbitMQ's /api/queues/<vhost>/<name>,
+    over one pooled requests.Session. fields maps each metric to a dotted path in the JSON
+    response, a metric mapped to None reports the round trip of the stats request in milliseconds.
+    """
+    metrics = ("queue_load", "queue_response_time")
+
+    FIELDS = {"queue_load": "messages", "queue_response_time": None}
+    # Messages waiting in the queue and round trip of the stats request in milliseconds
+    THRESHOLDS = {"queue_load": (1000, 10000), "queue_response_time": (100, 500)}
+
+    def __init__(self, fields=None, auth=None, timeout=5.0, pool_connections=10, pool_maxsize=10):
+        self.fields = {**self.FIELDS, **(fields or {})}
+        self.timeout = timeout
+        self.session = requests.Session()
+        if auth:
+            self.session.auth = tuple(auth)
+        adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def collect(self, metric, target):
+        start = time.perf_counter()
+        response = self.session.get(target, timeout=self.timeout)
+        response.raise_for_status()
+        elapsed = round((time.perf_counter() - start) * 1000, 3)
+
+        path = self.fields.get(metric)
+        if path is None:
+            return elapsed
+        value = response.json()
+        for key in path.split("."):
+            value = value[key]
+        return value
+
+    def close(self):
+        self.session.close()
+
+
+# Collector types that can be named in the collectors file
+COLLECTOR_TYPES = {
+    "sqlalchemy": SqlAlchemyCollector,
+    "http_queue": HttpQueueCollector,
+}
+
+
+def register_collector_type(name, collector_class):
+    """Makes a Collector subclass available to the collectors file under name"""
+    COLLECTOR_TYPES[name] = collector_class
+
+
+class CollectorRegistry:
+    """
+    Maps each metric to the collector serving it and the target of every application.
+    Collectors are created once and shared by all investigations.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._routes = {}
+        self._collectors = []
+
+    def register(self, collector, targets, metrics=None, thresholds=None):
+        """
+        Serves metrics (all of the collector's by default) with collector. targets maps
+        application names to targets, the "default" target is used for other apps.
+        thresholds maps metrics to the bounds grading their readings, replacing the
+        collector's own, either for every app or per app name with a "default" entry.
+        """
+        with self._lock:
+            self._collectors.append(collector)
+            for metric in metrics or collector.metrics:
+                self._routes[metric] = (collector, dict(targets), dict(thresholds or {}))
+
+    def serves(self, metric):
+        return metric in self._routes
+
+    def target(self, metric, app_name=None):
+        _, targets, _ = self._routes[metric]
+        target = targets.get(app_name) or targets.get("default")
+        if target is None:
+            raise KeyError(f"No {metric} target configured for {app_name}")
+        return target
+
+    def collect(self, metric, app_name=None):
+        collector, _, _ = self._routes[metric]
+        return collector.collect(metric, self.target(metric, app_name))
+
+    def thresholds(self, metric, app_name=None):
+        """Thresholds grading the readings of metric for an app, None for the agent's defaults"""
+        collector, _, thresholds = self._routes[metric]
+        configured = thresholds.get(metric)
+        if isinstance(configured, dict):
+            configured = configured.get(app_name, configured.get("default"))
+        if configured is not None:
+            return configured
+        return collector.thresholds(metric, self.target(metric, app_name))
+
+    def close(self):
+        with self._lock:
+            for collector in self._collectors:
+                collector.close()
+            self._collectors.clear()
+            self._routes.clear()
+
+
+def load_collectors(path):
+    """
+    Builds a registry from a JSON file of the form
+    {"collectors": [{"type": "sqlalchemy", "targets": {"default": "postgresql://..."}, "options": {...},
+                     "thresholds": {"database_connections": [150, 180]}}]}
+    """
+    with open(path, "r") as f:
+        config = json.load(f)
+
+    registry = CollectorRegistry()
+    for entry in config.get("collectors", []):
+        collector = COLLECTOR_TYPES[entry["type"]](**entry.get("options", {}))
+        registry.register(collector, entry["targets"], entry.get("metrics"), entry.get("thresholds"))
+    return registry
+
+
+_collectors = None
+_collectors_lock = threading.Lock()
+
+
+def get_collectors():
+    """
+    Returns the shared collector registry, loaded from MEASURE_COLLECTORS_FILE on first
+    use. Without the file the registry is empty and every metric is simulated.
+    """
+    global _collectors
+    if _collectors is None:
+        with _collectors_lock:
+            if _collectors is None:
+                _collectors = load_collectors(COLLECTORS_FILE) if COLLECTORS_FILE else CollectorRegistry()
+    return _collectors
+
+
+def set_collectors(registry):
+    """
+    Replaces the shared collector registry, pass None to reload it from the environment.
+    """
+    global _collectors
+    _collectors = registry
+
+
+def measure(metric, state, incident=False):
+    """
+    Next reading of a metric for the application of the graph state, from its real
+    collector when one is configured and from the simulator otherwise. Readings are
+    shared per (metric, target) through the measurement cache, returns the reading and
+    its age in seconds, None when it was measured for this call. With incident set the
+    reading is returned with the simulated incident active at it, None for readings of
+    real collectors.
+
+    A collector that fails, because its backend is down, answers with an error or a
+    response without the configured field, or because no target is configured for the
+    app, reads as None, which the agents report as unavailable instead of failing the
+    investigation. Failed readings are not cached.
+    """
+    app_name = state.get("app_name")
+    registry = get_collectors()
+    if registry.serves(metric):
+        try:
+            value, age = get_measurement_cache().get_or_measure(
+                (metric, registry.target(metric, app_name)),
+                lambda: registry.collect(metric, app_name)
+            )
+        except Exception as e:
+            logger.warning("Could not measure %s for %s: %s", metric, app_name, e)
+            value, age = None, None
+        return ((value, None) if incident else value), age
+
+    simulator = simulation.get_simulator()
+    (value, active), age = get_measurement_cache().get_or_measure(
+        (metric, "simulator", simulator.identity, simulator.app_index(app_name)),
+        lambda: simulator.read(metric, app_name)
+    )
+    return ((value, active) if incident else value), age
+
+
+def thresholds(metric, state, default):
+    """
+    Thresholds grading the readings of metric for the application of the graph state:
+    those of its collector or the collectors file when the metric is collected, default
+    when it is simulated or its collector has none.
+    """
+    registry = get_collectors()
+    if registry.serves(metric):
+        try:
+            configured = registry.thresholds(metric, state.get("app_name"))
+        except Exception:
+            # No target for the app, its reading is unavailable whatever the thresholds
+            configured = None
+        if configured is not None:
+            return configured
+    return default
@@ -1,23 +1,16 @@
-import random
+from Platform.Agents.Measure.collectors import measure, thresholds
+from Platform.Agents.Measure.measurement_cache import with_age
+from Platform.Agents.Measure.simulation import health
 
-def cpu_utlization(state):
-    choose = random.randrange(20, 99, 3)
+# Upper bounds of the green and yellow ranges of each simulated reading, collectors give their own
+CPU_UTILIZATION_THRESHOLDS = (60, 85)
+CPU_READY_TIME_THRESHOLDS = (100, 500)
 
-    if choose<=60:
-        return {"health": "green", "score": choose}
-    elif choose<=85:
-        return {"health": "yellow", "score": choose}
-    elif choose>85:
-        return {"health": "red", "score": choose}
+def cpu_utlization(state):
+    choose, age = measure("cpu_utilization", state)
+    return with_age({"health": health(choose, *thresholds("cpu_utilization", state, CPU_UTILIZATION_THRESHOLDS)), "score": choose}, age)
 
 
 def cpu_ready_time(state):
-    choose = random.randrange(50, 1000, 10)
-
-    if choose<=100:
-        return {"health": "green", "score": choose}
-    elif choose<=500:
-        return {"health": "yellow", "score": choose}
-    elif choose>500:
-        return {"health": "red", "score": choose}
-
+    choose, age = measure("cpu_ready_time", state)
+    return with_age({"health": health(choose, *thresholds("cpu_ready_time", state, CPU_READY_TIME_THRESHOLDS)), "score": choose}, age)
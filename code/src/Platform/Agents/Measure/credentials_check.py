@@ -1,10 +1,14 @@
-import random
+from Platform.Agents.Measure.collectors import measure
+from Platform.Agents.Measure.measurement_cache import with_age
+from Platform.Utilities.agent_response_management import history_entry
 
 def credentials_check(state):
-    choose = random.randrange(20, 99, 3)
+    choose, age = measure("credentials_check", state)
 
-    if choose>=1:
-        return {"health": "green", "score": choose}
-    elif choose<=1:
-        return {"health": "red", "score": choose}
+    # A reading that could not be taken is red, as in the other measurements
+    if choose is not None and choose>=1:
+        output = {"health": "green", "score": choose}
+    else:
+        output = {"health": "red", "score": choose}
 
+    return {"history": history_entry("credentials_check", with_age(output, age))}
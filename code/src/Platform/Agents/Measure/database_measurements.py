@@ -1,29 +1,25 @@
-import random
-from Platform.Utilities.agent_response_management import get_history_object
+from Platform.Agents.Measure.collectors import measure, thresholds
+from Platform.Agents.Measure.measurement_cache import with_age
+from Platform.Agents.Measure.simulation import health
+from Platform.Utilities.agent_response_management import history_entry
+
+# Pings answered faster than this many milliseconds succeed, unanswered pings read as None
+DATABASE_PING_THRESHOLD = 50
+# Upper bounds of the green and yellow ranges of the simulated connection count, collectors give their own
+DATABASE_CONNECTIONS_THRESHOLDS = (60, 85)
 
 def database_ping(state):
-    choose = random.randrange(20, 99, 3)
+    choose, age = measure("database_ping", state)
 
-    if choose<50:
+    if choose is not None and choose<thresholds("database_ping", state, DATABASE_PING_THRESHOLD):
         output = {"database ping": "Success"}
     else:
         output = {"database ping": "Failed"}
 
-    new_history =  get_history_object({"history":state["history"]},
-                                          {"agent":"database_ping","output":output})
-    return {"history": new_history}
+    return {"history": history_entry("database_ping", with_age(output, age))}
 
 def database_connections(state):
-  
-    choose = random.randrange(20, 99, 3)
-
-    if choose<=60:
-        output = {"health": "green", "no_of_connections": choose}
-    elif choose<=85:
-        output = {"health": "yellow", "no_of_connections": choose}
-    elif choose>85:
-        output = {"health": "red", "no_of_connections": choose}
+    choose, age = measure("database_connections", state)
+    output = with_age({"health": health(choose, *thresholds("database_connections", state, DATABASE_CONNECTIONS_THRESHOLDS)), "no_of_connections": choose}, age)
 
-    new_history =  get_history_object({"history":state["history"]},
-                                          {"agent":"database_connections","output":output})
-    return {"history": new_history}
\ No newline at end of file
+    return {"history": history_entry("database_connections", output)}
@@ -1,32 +1,21 @@
-import random
-from Platform.Utilities.agent_response_management import get_history_object
+from Platform.Agents.Measure.collectors import measure, thresholds
+from Platform.Agents.Measure.measurement_cache import with_age
+from Platform.Agents.Measure.simulation import get_simulator, health
+from Platform.Utilities.agent_response_management import history_entry
 
-def error_count(state):
+# Upper bounds of the green and yellow ranges of the simulated error count, collectors give their own
+ERROR_COUNT_THRESHOLDS = (30, 40)
 
-    #application_name = state['app_name']
+def error_count(state):
+    choose, age = measure("error_count", state)
+    output = with_age({"health": health(choose, *thresholds("error_count", state, ERROR_COUNT_THRESHOLDS)), "score": choose}, age)
 
-    choose = random.randrange(20, 99, 3)
-        
-    if choose<=30:
-        output = {"health": "green", "score": choose}    
-    elif choose<=40:
-        output =  {"health": "yellow", "score": choose}
-    elif choose>40:
-        output =  {"health": "red", "score": choose}
-    
-    new_history =  get_history_object({"history":state["history"]},
-                                          {"agent":"error_count","output":output})
-    return {"history": new_history}
+    return {"history": history_entry("error_count", output)}
     
 
 def frequent_error(state):
+    (choose, incident), age = measure("frequent_error", state, incident=True)
 
-    #application_name = state['app_name']
-
-    choose = random.randrange(20, 99, 3)
-    
-    output = {"error": "Unable to connect to the database", "count": choose}
+    output = with_age({"error": get_simulator().error_message(incident), "count": choose}, age)
 
-    new_history =  get_history_object({"history":state["history"]},
-                                          {"agent":"frequent_error","output":output})
-    return {"history": new_history}    
\ No newline at end of file
+    return {"history": history_entry("frequent_error", output)}
@@ -0,0 +1,127 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+
+# Seconds a measurement is reused by other investigations, 0 disables the cache
+MEASUREMENT_CACHE_TTL = float(os.getenv("MEASUREMENT_CACHE_TTL", "10"))
+MEASUREMENT_CACHE_SIZE = int(os.getenv("MEASUREMENT_CACHE_SIZE", "10000"))
+
+
+class _Flight:
+    __slots__ = ("event", "value", "measured_at", "error")
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.value = None
+        self.measured_at = None
+        self.error = None
+
+
+class MeasurementCache:
+    """
+    Short lived cache of measurements keyed by (agent, target). Concurrent requests for a
+    key that is not cached wait for the single measurement in flight instead of hitting
+    the backend themselves. Failed measurements are not cached.
+    """
+
+    def __init__(self, ttl=MEASUREMENT_CACHE_TTL, max_entries=MEASUREMENT_CACHE_SIZE, clock=time.monotonic):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._flights = {}
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    def get_or_measure(self, key, measure):
+        """
+        Returns the value for key and its age in seconds, measuring it with measure() when
+        it is not cached. The age is None for a value measured by this call.
+        """
+        if self.ttl <= 0:
+            return measure(), None
+
+        with self._lock:
+            now = self.clock()
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, measured_at = entry
+                if now - measured_at < self.ttl:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value, now - measured_at
+                del self._entries[key]
+
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+                self.misses += 1
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            flight.event.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.value, self.clock() - flight.measured_at
+
+        try:
+            flight.value = measure()
+            flight.measured_at = self.clock()
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+                if flight.error is None:
+                    self._entries[key] = (flight.value, flight.measured_at)
+                    while len(self._entries) > self.max_entries:
+                        self._entries.popitem(last=False)
+            flight.event.set()
+        return flight.value, None
+
+    def stats(self):
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "coalesced": self.coalesced,
+                "entries": len(self._entries)
+            }
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+_measurement_cache = MeasurementCache()
+
+
+def get_measurement_cache():
+    """
+    Returns the cache shared by the measure agents of all investigations.
+    """
+    return _measurement_cache
+
+
+def set_measurement_cache(cache):
+    """
+    Replaces the cache shared by the measure agents.
+    """
+    global _measurement_cache
+    _measurement_cache = cache
+
+
+def with_age(output, age):
+    """
+    Adds the age of a reused measurement to an agent output, so the decision node
+    knows how fresh the data is. Fresh measurements are left as they are.
+    """
+    if age is not None:
+        output["age_seconds"] = round(age, 1)
+    return output
@@ -1,31 +1,21 @@
-import random
-from Platform.Utilities.agent_response_management import get_history_object
+from Platform.Agents.Measure.collectors import measure, thresholds
+from Platform.Agents.Measure.measurement_cache import with_age
+from Platform.Agents.Measure.simulation import health
+from Platform.Utilities.agent_response_management import history_entry
+
+# Upper bounds of the green and yellow ranges of each simulated reading, collectors give their own
+QUEUE_LOAD_THRESHOLDS = (60, 85)
+QUEUE_RESPONSE_TIME_THRESHOLDS = (100, 500)
 
 def queue_load(state):
-    choose = random.randrange(20, 99, 3)
+    choose, age = measure("queue_load", state)
+    output = with_age({"health": health(choose, *thresholds("queue_load", state, QUEUE_LOAD_THRESHOLDS)), "score": choose}, age)
 
-    if choose<=60:
-        output = {"health": "green", "score": choose}
-    elif choose<=85:
-        output = {"health": "yellow", "score": choose}
-    elif choose>85:
-        output = {"health": "red", "score": choose}
-    
-    new_history =  get_history_object({"history":state["history"]},
-                                          {"agent":"queue_load","output":output})
-    return {"history": new_history}
+    return {"history": history_entry("queue_load", output)}
 
 
 def queue_response_time(state):
-    choose = random.randrange(50, 1000, 10)
+    choose, age = measure("queue_response_time", state)
+    output = with_age({"health": health(choose, *thresholds("queue_response_time", state, QUEUE_RESPONSE_TIME_THRESHOLDS)), "score": choose}, age)
 
-    if choose<=100:
-        output = {"health": "green", "score": choose}
-    elif choose<=500:
-        output = {"health": "yellow", "score": choose}
-    elif choose>500:
-        output = {"health": "red", "score": choose}
-    
-    new_history =  get_history_object({"history":state["history"]},
-                                          {"agent":"queue_response_time","output":output})
-    return {"history": new_history}
+    return {"history": history_entry("queue_response_time", output)}
@@ -0,0 +1,223 @@
+import os
+import threading
+import zlib
+from collections import OrderedDict
+import numpy as np
+
+# Fleet size, seed and incident rate of the shared simulator, unset SIMULATION_SEED draws a fresh seed
+SIMULATION_APPS = int(os.getenv("SIMULATION_APPS", "1"))
+SIMULATION_SEED = os.getenv("SIMULATION_SEED")
+SIMULATION_INCIDENT_RATE = float(os.getenv("SIMULATION_INCIDENT_RATE", "0"))
+
+# Distribution of every simulated metric. The defaults are the uniform grids the measure
+# agents used to draw with random.randrange(low, high, step).
+METRICS = {
+    "database_ping": {"distribution": "uniform", "low": 20, "high": 99, "step": 3},
+    "database_connections": {"distribution": "uniform", "low": 20, "high": 99, "step": 3},
+    "queue_load": {"distribution": "uniform", "low": 20, "high": 99, "step": 3},
+    "queue_response_time": {"distribution": "uniform", "low": 50, "high": 1000, "step": 10},
+    "error_count": {"distribution": "uniform", "low": 20, "high": 99, "step": 3},
+    "frequent_error": {"distribution": "uniform", "low": 20, "high": 99, "step": 3},
+    "credentials_check": {"distribution": "uniform", "low": 20, "high": 99, "step": 3},
+    "cpu_utilization": {"distribution": "uniform", "low": 20, "high": 99, "step": 3},
+    "cpu_ready_time": {"distribution": "uniform", "low": 50, "high": 1000, "step": 10},
+}
+
+# Metric values forced while an incident is active, chosen to read as red by the agents
+INCIDENTS = {
+    "database_outage": {
+        "metrics": {"database_ping": 98, "error_count": 95, "frequent_error": 90},
+        "error": "Unable to connect to the database"
+    },
+    "connection_exhaustion": {
+        "metrics": {"database_connections": 98, "error_count": 80, "frequent_error": 70},
+        "error": "Too many connections to the database"
+    },
+    "queue_backlog": {
+        "metrics": {"queue_load": 98, "queue_response_time": 990, "error_count": 60},
+        "error": "Timed out waiting for the message queue"
+    },
+}
+
+DEFAULT_ERROR = "Unable to connect to the database"
+
+
+def _draw(rng, spec, size):
+    low, high, step = spec["low"], spec["high"], spec.get("step", 1)
+    distribution = spec.get("distribution", "uniform")
+    if distribution == "uniform":
+        return low + step * rng.integers(0, -(-(high - low) // step), size=size)
+    if distribution == "normal":
+        values = rng.normal(spec["mean"], spec["std"], size=size)
+    elif distribution == "lognormal":
+        values = rng.lognormal(spec["mean"], spec["sigma"], size=size)
+    elif distribution == "poisson":
+        values = rng.poisson(spec["lam"], size=size)
+    else:
+        raise ValueError(f"Unknown distribution {distribution}")
+    # Snap to the same grid as randrange(low, high, step)
+    steps = np.clip(np.round((values - low) / step), 0, -(-(high - low) // step) - 1)
+    return (low + step * steps).astype(np.int64)
+
+
+class FleetSimulator:
+    """
+    Generates metric streams for n_apps applications at once. Readings are produced in
+    blocks of block_size ticks for the whole fleet with one NumPy call per metric, each
+    block drawn from a generator seeded by (seed, block), so the sequence an app sees
+    depends only on the seed. Every metric of an app has its own read cursor, and the
+    i-th reading of all metrics of an app share the incident state of tick i.
+    """
+
+    def __init__(self, n_apps=SIMULATION_APPS, seed=None, metrics=None, incident_rate=SIMULATION_INCIDENT_RATE,
+                 incidents=None, block_size=16, cached_blocks=8):
+        self.n_apps = n_apps
+        self.seed = int(seed) if seed is not None else int(np.random.SeedSequence().entropy % (2 ** 63))
+        self.metrics = {**METRICS, **(metrics or {})}
+        self.metric_names = list(self.metrics)
+        self._metric_index = {name: i for i, name in enumerate(self.metric_names)}
+        self.incident_rate = incident_rate
+        self.incidents = {**INCIDENTS, **(incidents or {})}
+        self.incident_names = list(self.incidents)
+        self.block_size = block_size
+        self.cached_blocks = cached_blocks
+        self._lock = threading.Lock()
+        self._blocks = OrderedDict()
+        self._cursors = np.zeros((len(self.metric_names), n_apps), dtype=np.int64)
+        self._injected = {}
+
+    @property
+    def identity(self):
+        """Settings the readings depend on, simulators with the same identity replay the same streams"""
+        return (self.seed, self.n_apps, self.incident_rate, self.block_size)
+
+    def app_index(self, app_name=None):
+        """Maps an application to its slot, unknown names are spread over the fleet by hash"""
+        if app_name is None:
+            return 0
+        if isinstance(app_name, (int, np.integer)):
+            return int(app_name) % self.n_apps
+        if app_name.startswith("app-") and app_name[4:].isdigit():
+            return int(app_name[4:]) % self.n_apps
+        return zlib.crc32(app_name.encode("utf-8")) % self.n_apps
+
+    def _block(self, block):
+        cached = self._blocks.get(block)
+        if cached is not None:
+            self._blocks.move_to_end(block)
+            return cached
+
+        rng = np.random.default_rng([self.seed, block])
+        shape = (self.block_size, self.n_apps)
+        values = np.stack([_draw(rng, self.metrics[name], shape) for name in self.metric_names])
+        # 0 means no incident, k means the k-th incident type
+        incidents = np.zeros(shape, dtype=np.int8)
+        if self.incident_rate > 0:
+            hit = rng.random(shape) < self.incident_rate
+            incidents[hit] = rng.integers(1, len(self.incident_names) + 1, size=int(hit.sum()))
+        for kind, effect in enumerate(self.incident_names, start=1):
+            mask = incidents == kind
+            if mask.any():
+                for metric, value in self.incidents[effect]["metrics"].items():
+                    values[self._metric_index[metric]][mask] = value
+
+        self._blocks[block] = (values, incidents)
+        while len(self._blocks) > self.cached_blocks:
+            self._blocks.popitem(last=False)
+        return values, incidents
+
+    def tick(self, tick):
+        """
+        Returns the readings of every metric for the whole fleet at one tick, as a dict of
+        metric name to an array of n_apps values, plus the array of active incidents.
+        """
+        with self._lock:
+            values, incidents = self._block(tick // self.block_size)
+            row = tick % self.block_size
+            snapshot = {name: values[i, row].copy() for i, name in enumerate(self.metric_names)}
+            active = np.array([None] + self.incident_names, dtype=object)[incidents[row]]
+        return snapshot, active
+
+    def read(self, metric, app_name=None):
+        """
+        Returns the next reading of a metric for one application and the name of the
+        incident active at that reading, None if there is none.
+        """
+        app = self.app_index(app_name)
+        metric_index = self._metric_index[metric]
+        with self._lock:
+            tick = int(self._cursors[metric_index, app])
+            self._cursors[metric_index, app] = tick + 1
+            block, row = divmod(tick, self.block_size)
+            values, incidents = self._block(block)
+            value = int(values[metric_index, row, app])
+            kind = int(incidents[row, app])
+            incident = self.incident_names[kind - 1] if kind else None
+            injected = self._injected.get(app)
+            if injected is not None:
+                name, start, end = injected
+                if start <= tick < end:
+                    incident = name
+                    value = self.incidents[name]["metrics"].get(metric, value)
+        return value, incident
+
+    def inject(self, app_name, incident, duration, start=None):
+        """
+        Forces an incident on one application for duration readings, starting at its
+        current reading unless start is given.
+        """
+        if incident not in self.incidents:
+            raise ValueError(f"Unknown incident {incident}")
+        app = self.app_index(app_name)
+        with self._lock:
+            if start is None:
+                start = int(self._cursors[:, app].min())
+            self._injected[app] = (incident, start, start + duration)
+
+    def error_message(self, incident):
+        return self.incidents[incident]["error"] if incident else DEFAULT_ERROR
+
+    def reset(self):
+        """Rewinds every application to its first reading"""
+        with self._lock:
+            self._cursors[:] = 0
+            self._injected.clear()
+
+
+_simulator = None
+_simulator_lock = threading.Lock()
+
+
+def get_simulator():
+    """
+    Returns the simulator the measure agents read from, built from the SIMULATION_*
+    environment variables on first use.
+    """
+    global _simulator
+    if _simulator is None:
+        with _simulator_lock:
+            if _simulator is None:
+                _simulator = FleetSimulator(seed=SIMULATION_SEED)
+    return _simulator
+
+
+def set_simulator(simulator):
+    """
+    Replaces the simulator the measure agents read from, pass None to rebuild the default.
+    """
+    global _simulator
+    _simulator = simulator
+
+
+def health(score, green, yellow):
+    """
+    Health of a reading given the upper bounds of the green and yellow ranges, a reading
+    that could not be taken is red.
+    """
+    if score is None:
+        return "red"
+    if score <= green:
+        return "green"
+    if score <= yellow:
+        return "yellow"
+    return "red"
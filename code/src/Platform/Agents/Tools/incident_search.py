@@ -0,0 +1,33 @@
+from Platform.Utilities.agent_response_management import history_entry
+
+# Number of historical incidents reported to the decision node
+SIMILAR_INCIDENTS_K = 3
+
+
+def incident_query(state):
+    """
+    Text searched for, the most recent error reported by frequent_error, or the action
+    that asked for the search when no error was measured yet.
+    """
+    for step in reversed(state.get("history") or []):
+        output = step.get("output")
+        if step.get("agent") == "frequent_error" and isinstance(output, dict) and output.get("error"):
+            return output["error"]
+    return state.get("input") or state.get("operation") or ""
+
+
+def similar_incidents(state):
+    # Imported on first use, building the index loads scikit-learn and the incident files
+    from Platform.prediction_model.similar_incidents import get_similar_incidents
+
+    query = incident_query(state)
+    matches = get_similar_incidents().query(query, SIMILAR_INCIDENTS_K)
+    output = {
+        "query": query,
+        "matches": [
+            {key: match[key] for key in ("incident_id", "name", "debugging_steps", "resolution", "score")}
+            for match in matches
+        ]
+    }
+
+    return {"history": history_entry("similar_incidents", output)}
@@ -0,0 +1,108 @@
+import hashlib
+import json
+import os
+import threading
+import time
+
+# Default catalog shipped with the platform
+AGENTS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "agents.json")
+
+# Seconds between checks of the catalog file for changes
+CHECK_INTERVAL = float(os.getenv("AGENT_REGISTRY_CHECK_INTERVAL", "5"))
+
+
+class AgentRegistry:
+    """
+    Loads the agents catalog once and indexes it by agent name and type. The file is
+    only re-read when its mtime or size changes, and only re-parsed when its content
+    hash changes, so lookups on the hot path do no disk I/O.
+    """
+
+    def __init__(self, file_path=AGENTS_FILE, check_interval=CHECK_INTERVAL):
+        self.file_path = str(file_path)
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._checked_at = None
+        self._stat_key = None
+        self._hash = None
+        self._catalog = None
+        self._by_name = {}
+        self._by_type = {}
+        self.loads = 0
+
+    def _refresh(self):
+        now = time.monotonic()
+        if self._checked_at is not None and now - self._checked_at < self.check_interval:
+            return
+
+        with self._lock:
+            if self._checked_at is not None and now - self._checked_at < self.check_interval:
+                return
+
+            stat = os.stat(self.file_path)
+            stat_key = (stat.st_mtime_ns, stat.st_size)
+            if stat_key != self._stat_key:
+                with open(self.file_path, 'rb') as f:
+                    raw = f.read()
+                content_hash = hashlib.sha256(raw).hexdigest()
+                if content_hash != self._hash:
+                    self._index(json.loads(raw))
+                    self._hash = content_hash
+                    self.loads += 1
+                self._stat_key = stat_key
+            self._checked_at = now
+
+    def _index(self, catalog):
+        by_name = {}
+        by_type = {}
+        for agent in catalog.get("agents", []):
+            by_name[agent["name"]] = agent
+            by_type.setdefault(agent.get("type", ""), []).append(agent)
+
+        # Swap in complete indexes so readers never see a half built catalog
+        self._catalog = catalog
+        self._by_name = by_name
+        self._by_type = by_type
+
+    def catalog(self):
+        """The catalog as stored in the file, {"agents": [...]}"""
+        self._refresh()
+        return self._catalog
+
+    def agents(self):
+        self._refresh()
+        return list(self._by_name.values())
+
+    def names(self):
+        self._refresh()
+        return list(self._by_name)
+
+    def get(self, name):
+        self._refresh()
+        return self._by_name.get(name)
+
+    def by_type(self, agent_type):
+        self._refresh()
+        return list(self._by_type.get(agent_type, []))
+
+    @property
+    def content_hash(self):
+        self._refresh()
+        return self._hash
+
+
+_registries = {}
+_registries_lock = threading.Lock()
+
+
+def get_agent_registry(file_path=AGENTS_FILE):
+    """
+    Returns the shared registry for a catalog file, so the decision nodes and the REST
+    API read the same in-memory index.
+    """
+    key = os.path.realpath(str(file_path))
+    registry = _registries.get(key)
+    if registry is None:
+        with _registries_lock:
+            registry = _registries.setdefault(key, AgentRegistry(key))
+    return registry
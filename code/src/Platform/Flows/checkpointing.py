@@ -0,0 +1,43 @@
+import os
+import sqlite3
+import threading
+from langgraph.checkpoint.sqlite import SqliteSaver
+
+# Local SQLite file holding the checkpoints of every investigation, keyed by investigation id,
+# kept in the runtime directory code/var, outside the source package
+CHECKPOINT_PATH = os.getenv(
+    "CHECKPOINT_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "..", "var", "checkpoints", "investigations.sqlite")
+)
+
+_checkpointers = {}
+_lock = threading.Lock()
+
+
+def get_checkpointer(path=CHECKPOINT_PATH):
+    """
+    Returns the shared SQLite checkpointer for a file. The saver serializes access to its
+    connection, so one instance is shared by all investigation threads.
+    """
+    key = os.path.abspath(str(path))
+    checkpointer = _checkpointers.get(key)
+    if checkpointer is None:
+        with _lock:
+            checkpointer = _checkpointers.get(key)
+            if checkpointer is None:
+                os.makedirs(os.path.dirname(key), exist_ok=True)
+                connection = sqlite3.connect(key, check_same_thread=False)
+                # WAL keeps the per step checkpoint writes cheap and readers unblocked
+                connection.execute("PRAGMA journal_mode=WAL")
+                connection.execute("PRAGMA synchronous=NORMAL")
+                checkpointer = SqliteSaver(connection)
+                checkpointer.setup()
+                _checkpointers[key] = checkpointer
+    return checkpointer
+
+
+def thread_config(investigation_id):
+    """
+    Graph config that stores and resumes checkpoints under the investigation id.
+    """
+    return {"configurable": {"thread_id": str(investigation_id)}}
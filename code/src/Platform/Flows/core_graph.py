@@ -1,10 +1,15 @@
 from langgraph.graph import StateGraph, END
 from typing import Annotated, TypedDict
+import operator
 from Platform.Agents.Measure.database_measurements import database_connections, database_ping
 from Platform.Agents.Measure.queue_measurements import queue_load, queue_response_time
 from Platform.Agents.Measure.log_measurements import error_count, frequent_error
 from Platform.Agents.Measure.credentials_check import credentials_check
+from Platform.Agents.Tools.incident_search import similar_incidents
 from Platform.Agents.Decision.decisions import execute_agent, execute_operation
+from Platform.Flows import graph_registry
+from Platform.Flows.instrumentation import instrument
+from Platform.Flows.checkpointing import get_checkpointer
 
 class AgentState(TypedDict):
     input: str
@@ -12,21 +17,33 @@ class AgentState(TypedDict):
     operation: str
     action: str
     decision: str
-    history: str
+    agents: list
+    app_name: str
+    history: Annotated[list, operator.add]
+    fast_path_hits: Annotated[int, operator.add]
 
 
-def create_graph():
+def select_agents(state):
+    """
+    Next nodes after routing, back to execute_operation if no known agent was selected.
+    """
+    return state.get("agents") or ["execute_operation"]
+
+
+def create_graph(checkpointer=None):
     workflow = StateGraph(AgentState)
 
-    workflow.add_node("execute_operation", execute_operation)
-    workflow.add_node("execute_agent", execute_agent)
-    workflow.add_node("database_ping", database_ping)
-    workflow.add_node("database_connections", database_connections)
-    workflow.add_node("error_count", error_count)
-    workflow.add_node("frequent_error", frequent_error)
-    workflow.add_node("queue_response_time", queue_response_time)
-    workflow.add_node("queue_load", queue_load)
-    workflow.add_node("credentials_check", credentials_check)
+    # execute_operation starts every iteration of the decision loop
+    workflow.add_node("execute_operation", instrument("core", "execute_operation", execute_operation, loop=True))
+    workflow.add_node("execute_agent", instrument("core", "execute_agent", execute_agent))
+    workflow.add_node("database_ping", instrument("core", "database_ping", database_ping))
+    workflow.add_node("database_connections", instrument("core", "database_connections", database_connections))
+    workflow.add_node("error_count", instrument("core", "error_count", error_count))
+    workflow.add_node("frequent_error", instrument("core", "frequent_error", frequent_error))
+    workflow.add_node("queue_response_time", instrument("core", "queue_response_time", queue_response_time))
+    workflow.add_node("queue_load", instrument("core", "queue_load", queue_load))
+    workflow.add_node("credentials_check", instrument("core", "credentials_check", credentials_check))
+    workflow.add_node("similar_incidents", instrument("core", "similar_incidents", similar_incidents))
 
     workflow.add_conditional_edges(
         "execute_operation",
@@ -37,9 +54,11 @@ def create_graph():
         }
     )
 
+    # Returning several agents runs them as parallel branches of the same step, their history
+    # entries are merged by the reducer in node name order once all of them have finished
     workflow.add_conditional_edges(
         "execute_agent",
-        lambda x: x["action"],
+        select_agents,
         {
             "database_ping": "database_ping",
             "database_connections": "database_connections",
@@ -47,7 +66,9 @@ def create_graph():
             "frequent_error": "frequent_error",
             "queue_response_time": "queue_response_time",
             "queue_load": "queue_load",
-            "credentials_check": "credentials_check"
+            "credentials_check": "credentials_check",
+            "similar_incidents": "similar_incidents",
+            "execute_operation": "execute_operation"
         }
     )
 
@@ -59,7 +80,21 @@ def create_graph():
     workflow.add_edge("queue_response_time", "execute_operation")
     workflow.add_edge("queue_load", "execute_operation")
     workflow.add_edge("credentials_check", "execute_operation")
+    workflow.add_edge("similar_incidents", "execute_operation")
 
     workflow.add_edge("execute_operation", END)
 
-    return workflow.compile()
\ No newline at end of file
+    return graph_registry.compile_once(workflow, checkpointer=checkpointer)
+
+def get_graph():
+    """
+    Returns the shared compiled core graph, building it on first use.
+    """
+    return graph_registry.get_or_build("core_graph", create_graph)
+
+def get_checkpointed_graph():
+    """
+    Returns the shared core graph that checkpoints every step to the local SQLite file,
+    so an interrupted investigation can resume from its last completed node.
+    """
+    return graph_registry.get_or_build("core_graph_checkpointed", lambda: create_graph(get_checkpointer()))
\ No newline at end of file
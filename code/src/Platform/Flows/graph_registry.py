@@ -0,0 +1,83 @@
+import hashlib
+import threading
+from langgraph.graph import StateGraph
+
+# Process wide store of compiled graphs, keyed by the fingerprint of their definition
+_compiled_graphs = {}
+_lock = threading.Lock()
+
+
+def _callable_name(runnable):
+    """
+    Returns a stable name for the function behind a graph node or branch.
+    """
+    func = getattr(runnable, "func", None) or getattr(runnable, "afunc", None) or runnable
+    module = getattr(func, "__module__", "")
+    name = getattr(func, "__qualname__", None) or getattr(func, "__name__", None) or type(func).__name__
+    return f"{module}.{name}"
+
+
+def graph_fingerprint(workflow: StateGraph, **compile_kwargs):
+    """
+    Builds a key from the nodes, edges and conditional edges of a workflow, so two
+    workflows with the same definition share one compiled graph.
+    """
+    parts = [f"schema:{_callable_name(workflow.schema)}"]
+
+    for name in sorted(workflow.nodes):
+        parts.append(f"node:{name}:{_callable_name(workflow.nodes[name].runnable)}")
+
+    for start, end in sorted(workflow.edges):
+        parts.append(f"edge:{start}->{end}")
+
+    for start in sorted(workflow.branches):
+        for name, branch in sorted(workflow.branches[start].items()):
+            ends = sorted((str(k), str(v)) for k, v in (branch.ends or {}).items())
+            parts.append(f"branch:{start}:{name}:{_callable_name(branch.path)}:{ends}:{branch.then}")
+
+    for key in sorted(compile_kwargs):
+        value = compile_kwargs[key]
+        # Objects such as checkpointers are shared by identity, not by value
+        parts.append(f"compile:{key}:{type(value).__name__}:{id(value) if value is not None else None}")
+
+    return hashlib.sha256("\n".join(parts).encode("utf-8")).hexdigest()
+
+
+def compile_once(workflow: StateGraph, **compile_kwargs):
+    """
+    Returns the compiled graph for the workflow definition, compiling it only the
+    first time the definition is seen. Compiled graphs are safe to share across threads.
+    """
+    key = graph_fingerprint(workflow, **compile_kwargs)
+
+    graph = _compiled_graphs.get(key)
+    if graph is not None:
+        return graph
+
+    with _lock:
+        graph = _compiled_graphs.get(key)
+        if graph is None:
+            graph = workflow.compile(**compile_kwargs)
+            _compiled_graphs[key] = graph
+    return graph
+
+
+def get_or_build(name, builder):
+    """
+    Returns the compiled graph registered under name, calling builder() to create it
+    the first time. Avoids rebuilding the StateGraph itself on the hot path.
+    """
+    graph = _compiled_graphs.get(name)
+    if graph is None:
+        built = builder()
+        with _lock:
+            graph = _compiled_graphs.setdefault(name, built)
+    return graph
+
+
+def clear():
+    """
+    Drops all compiled graphs, used when node definitions change at runtime and in tests.
+    """
+    with _lock:
+        _compiled_graphs.clear()
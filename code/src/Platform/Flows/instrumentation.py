@@ -0,0 +1,227 @@
+import bisect
+import contextvars
+import functools
+import threading
+import time
+from contextlib import contextmanager
+
+# Upper bounds in seconds of the latency histogram buckets
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+# Upper bounds of the loop iterations per run histogram buckets
+ITERATION_BUCKETS = (1, 2, 3, 5, 8, 13, 21, 34)
+
+
+class Histogram:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class MetricsRegistry:
+    """
+    Process wide counters and histograms of the graph runs, rendered in the Prometheus
+    text exposition format.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters = {}
+        self._histograms = {}
+        self._help = {}
+
+    def inc(self, name, labels=None, value=1, help_text=""):
+        key = (name, tuple(sorted((labels or {}).items())))
+        with self._lock:
+            self._help.setdefault(name, ("counter", help_text))
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def observe(self, name, value, labels=None, buckets=DURATION_BUCKETS, help_text=""):
+        key = (name, tuple(sorted((labels or {}).items())))
+        with self._lock:
+            self._help.setdefault(name, ("histogram", help_text))
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram(buckets)
+            histogram.observe(value)
+
+    def value(self, name, labels=None):
+        key = (name, tuple(sorted((labels or {}).items())))
+        with self._lock:
+            if key in self._counters:
+                return self._counters[key]
+            histogram = self._histograms.get(key)
+            return None if histogram is None else {"count": histogram.count, "sum": histogram.sum}
+
+    def render(self):
+        """Returns all metrics in the Prometheus text format"""
+        with self._lock:
+            lines = []
+            for name in sorted(self._help):
+                metric_type, help_text = self._help[name]
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} {metric_type}")
+                if metric_type == "counter":
+                    for (key_name, labels), value in sorted(self._counters.items()):
+                        if key_name == name:
+                            lines.append(f"{name}{_labels(labels)} {_number(value)}")
+                    continue
+                for (key_name, labels), histogram in sorted(self._histograms.items()):
+                    if key_name != name:
+                        continue
+                    cumulative = 0
+                    for bound, count in zip(histogram.buckets, histogram.counts):
+                        cumulative += count
+                        lines.append(f"{name}_bucket{_labels(labels + (('le', _number(bound)),))} {cumulative}")
+                    lines.append(f"{name}_bucket{_labels(labels + (('le', '+Inf'),))} {histogram.count}")
+                    lines.append(f"{name}_sum{_labels(labels)} {_number(histogram.sum)}")
+                    lines.append(f"{name}_count{_labels(labels)} {histogram.count}")
+            return "\n".join(lines) + "\n"
+
+    def clear(self):
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+            self._help.clear()
+
+
+def _labels(labels):
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels) + "}"
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _number(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class RunMetrics:
+    """
+    Per run summary of wall time, LLM token usage and loop iterations by node. Parallel
+    branches of a step record into the same instance, so updates are locked.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.started = time.perf_counter()
+        self.finished = None
+        self.iterations = 0
+        self.nodes = {}
+
+    def _node(self, node):
+        stats = self.nodes.get(node)
+        if stats is None:
+            stats = self.nodes[node] = {
+                "calls": 0, "seconds": 0.0, "llm_calls": 0, "prompt_tokens": 0, "completion_tokens": 0
+            }
+        return stats
+
+    def record_node(self, node, seconds, loop):
+        with self._lock:
+            stats = self._node(node)
+            stats["calls"] += 1
+            stats["seconds"] += seconds
+            if loop:
+                self.iterations += 1
+
+    def record_llm(self, node, prompt_tokens, completion_tokens):
+        with self._lock:
+            stats = self._node(node)
+            stats["llm_calls"] += 1
+            stats["prompt_tokens"] += prompt_tokens
+            stats["completion_tokens"] += completion_tokens
+
+    def node_seconds(self, node):
+        """Total seconds recorded for a node so far, 0 if it has not run"""
+        with self._lock:
+            stats = self.nodes.get(node)
+            return stats["seconds"] if stats is not None else 0.0
+
+    def summary(self):
+        with self._lock:
+            end = self.finished if self.finished is not None else time.perf_counter()
+            nodes = {node: dict(stats, seconds=round(stats["seconds"], 6)) for node, stats in self.nodes.items()}
+            return {
+                "wall_seconds": round(end - self.started, 6),
+                "iterations": self.iterations,
+                "llm_calls": sum(stats["llm_calls"] for stats in nodes.values()),
+                "prompt_tokens": sum(stats["prompt_tokens"] for stats in nodes.values()),
+                "completion_tokens": sum(stats["completion_tokens"] for stats in nodes.values()),
+                "nodes": nodes
+            }
+
+
+metrics = MetricsRegistry()
+_current_run = contextvars.ContextVar("current_run", default=None)
+
+
+@contextmanager
+def track_run(graph="core"):
+    """
+    Collects the metrics of every instrumented node executed inside the block into a
+    RunMetrics, which is also added to the process wide run totals when the block exits.
+    """
+    run = RunMetrics()
+    token = _current_run.set(run)
+    try:
+        yield run
+    finally:
+        _current_run.reset(token)
+        run.finished = time.perf_counter()
+        metrics.inc("graph_runs_total", {"graph": graph}, help_text="Completed or failed graph runs")
+        metrics.observe("graph_run_duration_seconds", run.finished - run.started, {"graph": graph},
+                        help_text="Wall time of a graph run")
+        metrics.observe("graph_run_iterations", run.iterations, {"graph": graph}, buckets=ITERATION_BUCKETS,
+                        help_text="Loop iterations of a graph run")
+
+
+def instrument(graph, node, func, loop=False):
+    """
+    Wraps a node function to record its wall time. loop marks the node that starts each
+    iteration of the decision loop, so its calls count the loop iterations of a run.
+    """
+    labels = {"graph": graph, "node": node}
+
+    @functools.wraps(func)
+    def wrapper(state):
+        start = time.perf_counter()
+        try:
+            return func(state)
+        finally:
+            seconds = time.perf_counter() - start
+            metrics.inc("graph_node_calls_total", labels, help_text="Node executions")
+            metrics.observe("graph_node_duration_seconds", seconds, labels, help_text="Wall time of a node execution")
+            if loop:
+                metrics.inc("graph_loop_iterations_total", {"graph": graph}, help_text="Decision loop iterations")
+            run = _current_run.get()
+            if run is not None:
+                run.record_node(node, seconds, loop)
+
+    return wrapper
+
+
+def record_llm_usage(node, response):
+    """
+    Records one LLM call and the prompt and completion tokens reported in the usage
+    metadata of its response.
+    """
+    usage = getattr(response, "usage_metadata", None) or {}
+    prompt_tokens = usage.get("input_tokens", 0) or 0
+    completion_tokens = usage.get("output_tokens", 0) or 0
+    labels = {"node": node}
+    metrics.inc("llm_calls_total", labels, help_text="LLM calls")
+    metrics.inc("llm_prompt_tokens_total", labels, prompt_tokens, help_text="LLM prompt tokens")
+    metrics.inc("llm_completion_tokens_total", labels, completion_tokens, help_text="LLM completion tokens")
+    run = _current_run.get()
+    if run is not None:
+        run.record_llm(node, prompt_tokens, completion_tokens)
@@ -1,15 +1,69 @@
 import json
+import threading
+from collections import OrderedDict
 
-def get_history_object(state,new_history):
-    history_so_far = state['history']
+def history_entry(agent, output):
+    """
+    Builds the history update for one agent step. AgentState.history is an append-only
+    list with an operator.add reducer, so each node only returns its own entry.
+    """
+    return [{"agent": agent, "output": output}]
 
-    if history_so_far == '':
-        history_so_far = '{"history":[]}'
-    
-    json_history = json.loads(history_so_far)
+class HistoryFold:
+    """
+    Text built entry by entry over an append-only history, the encoded entries joined by
+    separator. The text of every history seen is memoized under its last entry, so the
+    next step of the same run only encodes the entries added since instead of the whole
+    history. A history that does not extend a memoized one is encoded from the start.
+    """
 
-    json_history['history'].append(new_history)
+    # Entries a single graph step may add, one per agent run in parallel
+    LOOKBACK = 32
 
-    json_string = json.dumps(json_history)
-      
-    return json_string
\ No newline at end of file
+    def __init__(self, encode, separator, max_runs=1024):
+        self.encode = encode
+        self.separator = separator
+        self.max_runs = max_runs
+        self._lock = threading.Lock()
+        # id of the last entry -> (last entry, entry before it, length, text). The entries
+        # are kept referenced, so their ids cannot be reused while memoized
+        self._memo = OrderedDict()
+
+    def _prefix(self, history):
+        with self._lock:
+            for index in range(len(history) - 1, max(len(history) - 1 - self.LOOKBACK, -1), -1):
+                memo = self._memo.get(id(history[index]))
+                if (memo is not None and memo[0] is history[index] and memo[2] == index + 1
+                        and (index == 0 or memo[1] is history[index - 1])):
+                    # A run extends its history once, the superseded prefix is not needed again
+                    del self._memo[id(history[index])]
+                    return index + 1, memo[3]
+        return 0, None
+
+    def __call__(self, history):
+        history = history or []
+        start, text = self._prefix(history)
+        parts = [self.encode(entry) for entry in history[start:]]
+        if text is None:
+            text = self.separator.join(parts)
+        elif parts:
+            text = self.separator.join([text] + parts)
+
+        if history:
+            with self._lock:
+                self._memo[id(history[-1])] = (history[-1], history[-2] if len(history) > 1 else None,
+                                               len(history), text)
+                self._memo.move_to_end(id(history[-1]))
+                while len(self._memo) > self.max_runs:
+                    self._memo.popitem(last=False)
+        return text
+
+_serialized_entries = HistoryFold(json.dumps, ", ")
+
+def serialize_history(history):
+    """
+    Converts the structured history into the JSON document used at the API boundary
+    and in the LLM prompts. Entries already serialized for an earlier step of the same
+    history are not encoded again.
+    """
+    return '{"history": [' + _serialized_entries(history) + ']}'
@@ -0,0 +1,91 @@
+import os
+import threading
+import httpx
+from langchain_openai import ChatOpenAI
+from langchain.prompts import PromptTemplate
+
+# Connection pool settings for the shared HTTP client used by every chat model
+MAX_CONNECTIONS = int(os.getenv("LLM_MAX_CONNECTIONS", "32"))
+MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("LLM_MAX_KEEPALIVE_CONNECTIONS", "16"))
+KEEPALIVE_EXPIRY = float(os.getenv("LLM_KEEPALIVE_EXPIRY", "60"))
+REQUEST_TIMEOUT = float(os.getenv("LLM_REQUEST_TIMEOUT", "60"))
+
+_lock = threading.RLock()
+_http_client = None
+_chat_models = {}
+_chains = {}
+
+
+def get_http_client():
+    """
+    Returns the process wide httpx client, so LLM calls reuse keep-alive connections
+    instead of paying a TCP/TLS handshake on every graph step.
+    """
+    global _http_client
+    if _http_client is None:
+        with _lock:
+            if _http_client is None:
+                _http_client = httpx.Client(
+                    limits=httpx.Limits(
+                        max_connections=MAX_CONNECTIONS,
+                        max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS,
+                        keepalive_expiry=KEEPALIVE_EXPIRY
+                    ),
+                    timeout=REQUEST_TIMEOUT
+                )
+    return _http_client
+
+
+def get_chat_model(model="gpt-4o-mini", temperature=0, base_url=None):
+    """
+    Returns a shared chat model for the given settings. The base url defaults to the
+    OPENAI_BASE_URL environment variable, which is how the fake LLM server is wired in.
+    """
+    base_url = base_url or os.getenv("OPENAI_BASE_URL")
+    key = (model, temperature, base_url)
+
+    llm = _chat_models.get(key)
+    if llm is None:
+        with _lock:
+            llm = _chat_models.get(key)
+            if llm is None:
+                llm = ChatOpenAI(
+                    model=model,
+                    temperature=temperature,
+                    base_url=base_url,
+                    http_client=get_http_client()
+                )
+                _chat_models[key] = llm
+    return llm
+
+
+def get_chain(name, template, model="gpt-4o-mini", temperature=0):
+    """
+    Returns the prompt | llm chain registered under name, building it the first time.
+    Chains are keyed by their template too, so a changed prompt is never served a stale chain.
+    """
+    base_url = os.getenv("OPENAI_BASE_URL")
+    key = (name, template, model, temperature, base_url)
+
+    chain = _chains.get(key)
+    if chain is None:
+        llm = get_chat_model(model, temperature, base_url)
+        with _lock:
+            chain = _chains.get(key)
+            if chain is None:
+                chain = PromptTemplate.from_template(template) | llm
+                _chains[key] = chain
+    return chain
+
+
+def clear():
+    """
+    Drops cached chains and models and closes the shared HTTP client.
+    """
+    global _http_client
+    with _lock:
+        _chains.clear()
+        _chat_models.clear()
+        if _http_client is not None:
+            _http_client.close()
+            _http_client = None
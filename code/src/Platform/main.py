@@ -4,11 +4,16 @@ import os
 #Always use proper key management practices.
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 
-from Platform.Flows.core_graph import create_graph
+from Platform.Flows.core_graph import get_graph, get_checkpointed_graph
+from Platform.Flows.checkpointing import thread_config
+from Platform.Flows import graph_registry
+from Platform.Flows.instrumentation import instrument, track_run
 from typing import Annotated, TypedDict
 from langgraph.graph import StateGraph, END
-from Platform.Utilities.agent_response_management import get_history_object
+from Platform.Utilities.agent_response_management import serialize_history
+from Platform.Agents.Decision.router import router_stats
 import os
+import time
 
 
 class UserInput(TypedDict):
@@ -27,28 +32,96 @@ def get_operation(state: UserInput) -> UserInput:
         "continue_conversation": False
     }
 
+def run_operation(operation_text, investigation_id=None, app_name=None):
+    """
+    Runs the core graph for an operation description and returns the final state with
+    the metrics summary of the run. With an investigation id every step is checkpointed
+    under that id, app_name selects the application the measure agents check.
+    """
+    state = {"operation": operation_text,"history":[]}
+    if app_name is not None:
+        state["app_name"] = app_name
+    with track_run() as run:
+        if investigation_id is None:
+            result = get_graph().invoke(state)
+        else:
+            graph = get_checkpointed_graph()
+            result = graph.invoke(state, thread_config(investigation_id))
+    return {**result, "metrics": run.summary()}
+
+def get_checkpoint_status(investigation_id):
+    """
+    Returns None if no checkpoint exists for the investigation, otherwise the nodes
+    still to run, an empty tuple meaning the investigation finished.
+    """
+    snapshot = get_checkpointed_graph().get_state(thread_config(investigation_id))
+    if not snapshot.values:
+        return None
+    return snapshot.next
+
+def resume_operation(investigation_id):
+    """
+    Continues an interrupted investigation from its last completed node.
+    """
+    graph = get_checkpointed_graph()
+    with track_run() as run:
+        result = graph.invoke(None, thread_config(investigation_id))
+    return {**result, "metrics": run.summary()}
+
+def stream_operation(operation_text):
+    """
+    Runs the core graph and yields each node's output as soon as the node completes,
+    with the seconds the node itself ran and the seconds since the start of the run.
+    The run is tracked like run_operation, so it shows in the metrics, and its metrics
+    summary is returned as the generator's value once the graph finished.
+    """
+    graph = get_graph()
+    with track_run() as run:
+        reported = {}
+        for chunk in graph.stream({"operation": operation_text,"history":[]}, stream_mode="updates"):
+            now = time.perf_counter()
+            for node, update in chunk.items():
+                # Seconds recorded by instrument() since this node was last reported
+                total = run.node_seconds(node)
+                yield {
+                    "node": node,
+                    "output": update,
+                    "node_seconds": round(total - reported.get(node, 0.0), 6),
+                    "elapsed_seconds": round(now - run.started, 6)
+                }
+                reported[node] = total
+    return run.summary()
+
 def process_operation(state: UserInput):
-    graph = create_graph()
-    result = graph.invoke({"operation": state["input"],"history":'{"history":[]}'})
+    result = run_operation(state["input"])
     print("\n--- Execution Result ---")
-    print(result["history"])
+    print(serialize_history(result["history"]))
+    fast_path_hits = result.get("fast_path_hits", 0)
+    print(f"Fast path routing: {fast_path_hits} LLM calls skipped, "
+          f"~{router_stats.latency_saved(fast_path_hits):.2f}s saved")
     return state
 
 def create_main_graph():
     workflow = StateGraph(UserInput)
 
-    workflow.add_node("get_operation", get_operation)
-    workflow.add_node("process_operation", process_operation)
+    workflow.add_node("get_operation", instrument("main", "get_operation", get_operation))
+    workflow.add_node("process_operation", instrument("main", "process_operation", process_operation))
 
     workflow.set_entry_point("get_operation")
     
     workflow.add_edge("get_operation", "process_operation")
     workflow.add_edge("process_operation", END)
 
-    return workflow.compile()
+    return graph_registry.compile_once(workflow)
+
+def get_main_graph():
+    """
+    Returns the shared compiled outer graph, building it on first use.
+    """
+    return graph_registry.get_or_build("main_graph", create_main_graph)
 
 def main():
-    conversation_graph = create_main_graph()
+    conversation_graph = get_main_graph()
     conversation_graph.invoke({"input": "downtime.txt", "continue_conversation": True})
 
 
@@ -1,6 +1,6 @@
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Optional, Dict, Union, Tuple
+from typing import Optional, Dict, Union, Tuple, List
 from dataclasses import asdict
 from flask import jsonify
 from werkzeug.wrappers import Response
@@ -28,6 +28,20 @@ class OperationResponse:
     name: str
     content: Optional[str] = None
 
+@dataclass
+class OperationSummary:
+    name: str
+    size: int
+    hash: str
+
+@dataclass
+class OperationsPage:
+    operations: List[OperationSummary]
+    total: int
+    page: int
+    page_size: int
+    etag: str
+
 @dataclass
 class AgentResponse:
     name: str
@@ -39,6 +53,46 @@ class Investigation:
     name: str
     status: str
     created_at: str
+    started_at: Optional[str] = None
+    finished_at: Optional[str] = None
+    result: Optional[Dict] = None
+    error: Optional[str] = None
+
+@dataclass
+class PredictionRequest:
+    incidents: List[str]
+
+@dataclass
+class PredictionResponse:
+    incident: str
+    debugging_steps: str
+
+@dataclass
+class SimilarIncidentsRequest:
+    query: str
+    k: int = 5
+
+@dataclass
+class SimilarIncident:
+    incident_id: Optional[str]
+    name: Optional[str]
+    description: Optional[str]
+    debugging_steps: Optional[str]
+    resolution: Optional[str]
+    score: float
+
+@dataclass
+class TrainingRequest:
+    incidents: List[Dict[str, str]]
+    publish: bool = True
+
+@dataclass
+class TrainingResponse:
+    added: int
+    trained_incidents: int
+    model_version: int
+    # Version predictions are served from, an incremental version knowing fewer debugging steps is not activated
+    served_version: Optional[int] = None
 
 
 @dataclass
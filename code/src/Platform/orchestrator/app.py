@@ -1,39 +1,15 @@
 from flask import Flask,request
 import logging
-from logging.handlers import RotatingFileHandler
 from pathlib import Path
+from logging_config import configure_logging
 from operations_service import OperationsService
 from operations_controller import OperationsController
 
 
 def configure_app_logging(base_dir: Path):
     """Configure application-wide logging"""
-    logs_dir = base_dir / "operations" / "logs"
-    logs_dir.mkdir(parents=True, exist_ok=True)
-    
-    # Application logger
-    app_logger = logging.getLogger('operations_app')
-    app_logger.setLevel(logging.INFO)
-    
-    # File handler
-    file_handler = RotatingFileHandler(
-        logs_dir / 'operations_app.log',
-        maxBytes=1024*1024,
-        backupCount=5
-    )
-    file_handler.setFormatter(logging.Formatter(
-        '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-    ))
-    app_logger.addHandler(file_handler)
-    
-    # Console handler for development
-    console_handler = logging.StreamHandler()
-    console_handler.setFormatter(logging.Formatter(
-        '%(asctime)s - %(levelname)s - %(message)s'
-    ))
-    app_logger.addHandler(console_handler)
-    
-    return app_logger
+    configure_logging(base_dir)
+    return logging.getLogger('operations_app')
 
 app = Flask(__name__)
 
@@ -57,6 +33,12 @@ app.add_url_rule(
     methods=['GET']
 )
 
+app.add_url_rule(
+    '/api/operations/<operation_name>',
+    view_func=controller.get_operation,
+    methods=['GET']
+)
+
 app.add_url_rule(
     '/api/agents',
     view_func=controller.get_agents,
@@ -70,30 +52,73 @@ app.add_url_rule(
     methods=['POST']  # Only POST allowed
 )
 
+app.add_url_rule(
+    '/api/operations/stream/<operation_name>',
+    view_func=controller.stream_operation,
+    methods=['GET']
+)
+
 app.add_url_rule(
     '/api/investigations',
     view_func=controller.list_investigations,
     methods=['GET']
 )
 
+app.add_url_rule(
+    '/api/investigations/<investigation_id>',
+    view_func=controller.get_investigation,
+    methods=['GET']
+)
+
+app.add_url_rule(
+    '/api/investigations/<investigation_id>/resume',
+    view_func=controller.resume_investigation,
+    methods=['POST']
+)
+
 app.add_url_rule(
     '/api/investigations/trigger/<investigation_name>',
     view_func=controller.trigger_investigation,
     methods=['POST']
 )
 
+app.add_url_rule(
+    '/api/predictions/batch',
+    view_func=controller.predict_debugging_steps,
+    methods=['POST']
+)
+
+app.add_url_rule(
+    '/api/predictions/incidents',
+    view_func=controller.add_training_incidents,
+    methods=['POST']
+)
+
+app.add_url_rule(
+    '/api/incidents/similar',
+    view_func=controller.find_similar_incidents,
+    methods=['POST']
+)
+
+app.add_url_rule(
+    '/metrics',
+    view_func=controller.get_metrics,
+    methods=['GET']
+)
+
 
 @app.before_request
 def log_request_start():
     """Log incoming requests"""
-    app_logger.info(f"Request started: {request.method} {request.path}")
+    app_logger.info("Request started: %s %s", request.method, request.path, extra={"sampled": True})
 
 @app.after_request
 def log_request_completion(response):
     """Log completed requests"""
     app_logger.info(
-        f"Request completed: {request.method} {request.path} "
-        f"=> {response.status_code}"
+        "Request completed: %s %s => %s",
+        request.method, request.path, response.status_code,
+        extra={"sampled": True}
     )
     return response
 
@@ -24,4 +24,9 @@ class ConflictException(BusinessException):
 class ServiceException(BusinessException):
     """Service level errors"""
     def __init__(self, message: str, error_code: str = "service_error"):
-        super().__init__(message, error_code, 500)
\ No newline at end of file
+        super().__init__(message, error_code, 500)
+
+class ServiceUnavailableException(BusinessException):
+    """Service temporarily unable to accept work"""
+    def __init__(self, message: str, error_code: str = "service_unavailable"):
+        super().__init__(message, error_code, 503)
\ No newline at end of file
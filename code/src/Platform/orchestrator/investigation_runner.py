@@ -0,0 +1,182 @@
+import logging
+import os
+import threading
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Callable, Iterable, Iterator, List, Optional
+from api_models import Investigation
+from exceptions import ConflictException, ServiceUnavailableException
+
+
+class InvestigationRunner:
+    """
+    Runs investigations on a bounded worker pool so API requests return immediately.
+    At most max_workers investigations run at once and max_queue more may wait, further
+    submissions are rejected until capacity frees up.
+    """
+
+    def __init__(self, run_operation: Callable[[str, str], dict],
+                 resume_operation: Optional[Callable[[str], dict]] = None,
+                 max_workers: int = int(os.getenv("INVESTIGATION_WORKERS", "4")),
+                 max_queue: int = int(os.getenv("INVESTIGATION_QUEUE_SIZE", "32")),
+                 max_history: int = int(os.getenv("INVESTIGATION_HISTORY_SIZE", "1000"))):
+        self.run_operation = run_operation
+        self.resume_operation = resume_operation
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.max_history = max_history
+        self.logger = logging.getLogger('operations_service')
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="investigation")
+        self._slots = threading.BoundedSemaphore(max_workers + max_queue)
+        self._lock = threading.Lock()
+        self._investigations = OrderedDict()
+
+    def submit(self, name: str, operation_text: str) -> Investigation:
+        """Queues an investigation, raises ServiceUnavailableException when the queue is full"""
+        investigation = Investigation(
+            id=f"inv-{uuid.uuid4().hex[:12]}",
+            name=name,
+            status="queued",
+            created_at=datetime.utcnow().isoformat()
+        )
+        return self._enqueue(investigation, lambda: self.run_operation(operation_text, investigation.id))
+
+    def resume(self, investigation_id: str, name: Optional[str] = None) -> Investigation:
+        """
+        Queues an interrupted investigation to continue from its last checkpoint. Raises
+        ConflictException while it is still queued or running and ServiceUnavailableException
+        when the queue is full, in which case its record is left as it was.
+        """
+        self._acquire_slot()
+        investigation = previous = None
+        try:
+            with self._lock:
+                investigation = self._investigations.get(investigation_id)
+                if investigation is None:
+                    # Interrupted before a restart, the record only survives in the checkpoint store
+                    investigation = Investigation(
+                        id=investigation_id,
+                        name=name or investigation_id,
+                        status="queued",
+                        created_at=datetime.utcnow().isoformat()
+                    )
+                    self._investigations[investigation_id] = investigation
+                    self._trim_history()
+                elif investigation.status in ("queued", "running"):
+                    raise ConflictException(
+                        f"Investigation '{investigation_id}' is still {investigation.status}",
+                        "investigation_in_progress"
+                    )
+                else:
+                    previous = (investigation.status, investigation.error, investigation.finished_at)
+                    investigation.status = "queued"
+                    investigation.error = None
+                    investigation.finished_at = None
+            self._executor.submit(self._run, investigation, lambda: self.resume_operation(investigation_id))
+        except Exception as e:
+            self._slots.release()
+            if not isinstance(e, ConflictException):
+                with self._lock:
+                    if previous is not None:
+                        investigation.status, investigation.error, investigation.finished_at = previous
+                    else:
+                        self._investigations.pop(investigation_id, None)
+            raise
+        return investigation
+
+    def stream(self, events: Iterable) -> Iterator:
+        """
+        Takes a slot for an investigation the caller runs itself, such as a streamed one, and
+        returns its events. Raises ServiceUnavailableException when the queue is full, the
+        slot is released once the events are exhausted or the stream is closed.
+        """
+        self._acquire_slot()
+        return _SlotStream(iter(events), self._slots)
+
+    def _acquire_slot(self):
+        if not self._slots.acquire(blocking=False):
+            raise ServiceUnavailableException(
+                "Too many investigations in progress, retry later",
+                "investigation_queue_full"
+            )
+
+    def _enqueue(self, investigation: Investigation, job: Callable[[], dict]) -> Investigation:
+        self._acquire_slot()
+
+        with self._lock:
+            self._investigations[investigation.id] = investigation
+            self._trim_history()
+
+        try:
+            self._executor.submit(self._run, investigation, job)
+        except Exception:
+            self._slots.release()
+            raise
+        return investigation
+
+    def _run(self, investigation: Investigation, job: Callable[[], dict]):
+        investigation.status = "running"
+        investigation.started_at = datetime.utcnow().isoformat()
+        try:
+            investigation.result = job()
+            investigation.status = "completed"
+        except Exception as e:
+            self.logger.error("Investigation %s failed: %s", investigation.id, e, exc_info=True)
+            investigation.error = str(e)
+            investigation.status = "failed"
+        finally:
+            investigation.finished_at = datetime.utcnow().isoformat()
+            self._slots.release()
+
+    def _trim_history(self):
+        # Drop the oldest finished investigations once the history bound is reached
+        while len(self._investigations) > self.max_history:
+            for investigation_id, investigation in self._investigations.items():
+                if investigation.status in ("completed", "failed"):
+                    del self._investigations[investigation_id]
+                    break
+            else:
+                break
+
+    def get(self, investigation_id: str) -> Optional[Investigation]:
+        with self._lock:
+            return self._investigations.get(investigation_id)
+
+    def list(self) -> List[Investigation]:
+        with self._lock:
+            return list(self._investigations.values())
+
+    def shutdown(self, wait: bool = True):
+        self._executor.shutdown(wait=wait)
+
+
+class _SlotStream:
+    """Iterator over streamed events holding a runner slot until it is exhausted or closed"""
+
+    def __init__(self, events: Iterator, slots: threading.BoundedSemaphore):
+        self._events = events
+        self._slots = slots
+        self._released = False
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        try:
+            return next(self._events)
+        except BaseException:
+            self.close()
+            raise
+
+    def close(self):
+        # Called by the WSGI server once the response is sent, also when the client goes away
+        if not self._released:
+            self._released = True
+            try:
+                close = getattr(self._events, "close", None)
+                if close is not None:
+                    close()
+            finally:
+                self._slots.release()
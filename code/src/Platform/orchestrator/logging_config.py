@@ -0,0 +1,138 @@
+import atexit
+import json
+import logging
+import os
+import queue
+import random
+import threading
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from pathlib import Path
+from typing import Optional
+
+# Fraction of the per request "started"/"completed" lines that are written, failures are always kept
+REQUEST_LOG_SAMPLE_RATE = float(os.getenv("REQUEST_LOG_SAMPLE_RATE", "1.0"))
+
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+CONSOLE_FORMAT = '%(asctime)s - %(levelname)s - %(message)s'
+
+# Logger name -> log file, the application logger also goes to the console
+LOG_FILES = {
+    'operations_app': 'operations_app.log',
+    'operations_service': 'operations_service.log',
+    'operations_controller': 'operations_controller.log'
+}
+
+_lock = threading.Lock()
+_listener: Optional[QueueListener] = None
+_queue_handler: Optional[QueueHandler] = None
+
+
+class LazyJson:
+    """
+    Defers json.dumps of a log entry until the record is formatted on the writer thread,
+    and skips it entirely for records that are filtered out.
+    """
+    __slots__ = ('entry',)
+
+    def __init__(self, entry: dict):
+        self.entry = entry
+
+    def __str__(self):
+        return json.dumps(self.entry, default=str)
+
+
+class DeferredQueueHandler(QueueHandler):
+    """
+    Enqueues the record as is. The standard QueueHandler formats the message on the
+    calling thread, here all formatting happens on the listener thread.
+    """
+
+    def prepare(self, record):
+        return record
+
+
+class SampleFilter(logging.Filter):
+    """
+    Keeps a fraction of the records logged with extra={"sampled": True}.
+    """
+
+    def __init__(self, rate: float):
+        super().__init__()
+        self.rate = rate
+
+    def filter(self, record):
+        if not getattr(record, 'sampled', False) or self.rate >= 1.0:
+            return True
+        return random.random() < self.rate
+
+
+class _LoggerNameFilter(logging.Filter):
+    def __init__(self, names):
+        super().__init__()
+        self.names = set(names)
+
+    def filter(self, record):
+        return record.name in self.names
+
+
+def configure_logging(base_dir: Path, sample_rate: float = REQUEST_LOG_SAMPLE_RATE) -> QueueListener:
+    """
+    Routes the orchestrator loggers through one queue to a single background writer
+    thread that owns the file and console handlers. Safe to call more than once, the
+    pipeline is only built the first time.
+    """
+    global _listener, _queue_handler
+    with _lock:
+        if _listener is not None:
+            _queue_handler.filters[0].rate = sample_rate
+            return _listener
+
+        logs_dir = Path(base_dir) / "operations" / "logs"
+        logs_dir.mkdir(parents=True, exist_ok=True)
+
+        handlers = []
+        for logger_name, filename in LOG_FILES.items():
+            if logger_name == 'operations_app':
+                file_handler = RotatingFileHandler(logs_dir / filename, maxBytes=1024*1024, backupCount=5)
+            else:
+                file_handler = logging.FileHandler(logs_dir / filename)
+            file_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+            file_handler.addFilter(_LoggerNameFilter([logger_name]))
+            handlers.append(file_handler)
+
+        console_handler = logging.StreamHandler()
+        console_handler.setFormatter(logging.Formatter(CONSOLE_FORMAT))
+        console_handler.addFilter(_LoggerNameFilter(['operations_app']))
+        handlers.append(console_handler)
+
+        log_queue = queue.SimpleQueue()
+        _queue_handler = DeferredQueueHandler(log_queue)
+        _queue_handler.addFilter(SampleFilter(sample_rate))
+
+        for logger_name in LOG_FILES:
+            logger = logging.getLogger(logger_name)
+            logger.setLevel(logging.INFO)
+            logger.propagate = False
+            logger.addHandler(_queue_handler)
+
+        _listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+        _listener.start()
+        atexit.register(stop_logging)
+        return _listener
+
+
+def stop_logging():
+    """
+    Flushes the queue and stops the writer thread.
+    """
+    global _listener, _queue_handler
+    with _lock:
+        if _listener is None:
+            return
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        for logger_name in LOG_FILES:
+            logging.getLogger(logger_name).removeHandler(_queue_handler)
+        _listener = None
+        _queue_handler = None
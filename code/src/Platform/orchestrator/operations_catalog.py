@@ -0,0 +1,109 @@
+import hashlib
+import os
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+
+@dataclass
+class CatalogEntry:
+    name: str
+    path: str
+    size: int
+    mtime_ns: int
+    hash: str
+
+
+class OperationsCatalog:
+    """
+    In-memory index of the runbooks in the operations docs directory. The directory is
+    rescanned at most every rescan_interval seconds and only files whose mtime or size
+    changed are read and hashed again, so listing costs no file reads.
+    """
+
+    def __init__(self, docs_dir: Path, rescan_interval: float = float(os.getenv("OPERATIONS_RESCAN_INTERVAL", "2"))):
+        self.docs_dir = Path(docs_dir)
+        self.rescan_interval = rescan_interval
+        self._lock = threading.Lock()
+        self._entries: Dict[str, CatalogEntry] = {}
+        self._ordered: List[CatalogEntry] = []
+        self._etag = None
+        self._scanned_at = None
+
+    def _refresh(self):
+        now = time.monotonic()
+        if self._scanned_at is not None and now - self._scanned_at < self.rescan_interval:
+            return
+
+        with self._lock:
+            if self._scanned_at is not None and now - self._scanned_at < self.rescan_interval:
+                return
+
+            entries = {}
+            with os.scandir(self.docs_dir) as it:
+                for dir_entry in it:
+                    if not dir_entry.name.endswith('.txt') or not dir_entry.is_file():
+                        continue
+                    stat = dir_entry.stat()
+                    name = os.path.splitext(dir_entry.name)[0]
+                    known = self._entries.get(name)
+                    if known is not None and known.mtime_ns == stat.st_mtime_ns and known.size == stat.st_size:
+                        entries[name] = known
+                        continue
+                    with open(dir_entry.path, 'rb') as f:
+                        content_hash = hashlib.sha256(f.read()).hexdigest()
+                    entries[name] = CatalogEntry(
+                        name=name,
+                        path=dir_entry.path,
+                        size=stat.st_size,
+                        mtime_ns=stat.st_mtime_ns,
+                        hash=content_hash
+                    )
+
+            if entries.keys() != self._entries.keys() or any(
+                entries[name] is not self._entries[name] for name in entries
+            ):
+                ordered = sorted(entries.values(), key=lambda entry: entry.name)
+                digest = hashlib.sha256()
+                for entry in ordered:
+                    digest.update(f"{entry.name}:{entry.hash}\n".encode("utf-8"))
+                self._entries = entries
+                self._ordered = ordered
+                self._etag = digest.hexdigest()
+            self._scanned_at = now
+
+    def invalidate(self):
+        """Forces a rescan on the next access, used after writing a runbook"""
+        with self._lock:
+            self._scanned_at = None
+
+    @property
+    def etag(self) -> str:
+        self._refresh()
+        return self._etag
+
+    def list(self, offset: int = 0, limit: Optional[int] = None) -> Tuple[List[CatalogEntry], int]:
+        """Returns one page of entries ordered by name and the total number of entries"""
+        self._refresh()
+        ordered = self._ordered
+        end = None if limit is None else offset + limit
+        return ordered[offset:end], len(ordered)
+
+    def get(self, name: str) -> Optional[CatalogEntry]:
+        self._refresh()
+        return self._entries.get(name)
+
+    def read(self, name: str) -> Optional[str]:
+        """Returns the full text of a runbook, None if it does not exist"""
+        entry = self.get(name)
+        if entry is None:
+            return None
+        try:
+            with open(entry.path, 'r') as f:
+                return f.read()
+        except FileNotFoundError:
+            # Removed since the last scan
+            self.invalidate()
+            return None
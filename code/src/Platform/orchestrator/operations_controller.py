@@ -1,13 +1,19 @@
-from flask import request
+from flask import request, Response
 import logging
-import json
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, List
-from api_models import BaseResponse,OperationRequest
+from api_models import BaseResponse,OperationRequest,PredictionRequest,TrainingRequest,SimilarIncidentsRequest
 from operations_service import OperationsService
 from exceptions import BusinessException, ValidationException
 from dataclasses import asdict
+from logging_config import LazyJson, configure_logging
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+MAX_PREDICTION_BATCH = 10000
+MAX_TRAINING_BATCH = 10000
+MAX_SIMILAR_INCIDENTS = 100
 
 class OperationsController:
     def __init__(self, service: OperationsService):
@@ -17,16 +23,7 @@ class OperationsController:
 
     def _setup_controller_logger(self):
         """Configure controller-specific logging"""
-        logs_dir = self.service.base_dir / "operations" / "logs"
-        logs_dir.mkdir(parents=True, exist_ok=True)
-        
-        handler = logging.FileHandler(logs_dir / 'operations_controller.log')
-        formatter = logging.Formatter(
-            '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-        )
-        handler.setFormatter(formatter)
-        self.logger.addHandler(handler)
-        self.logger.setLevel(logging.INFO)
+        configure_logging(self.service.base_dir)
 
     def _log_request(self, endpoint: str, method: str, status: str, metadata: dict = None):
         """Log API requests"""
@@ -37,7 +34,8 @@ class OperationsController:
             "timestamp": datetime.utcnow().isoformat(),
             **(metadata or {})
         }
-        self.logger.info(json.dumps(log_entry))
+        # Only the routine lines are sampled, failures are always written
+        self.logger.info("%s", LazyJson(log_entry), extra={"sampled": status in ("started", "streaming", "completed")})
 
     def create_operation(self):
         """Handle operation creation requests"""
@@ -98,7 +96,7 @@ class OperationsController:
             ).to_flask_response(e.status_code)
         except Exception as e:
             self.logger.error(
-                f"Unexpected error in create_operation: {str(e)}",
+                "Unexpected error in create_operation: %s", e,
                 exc_info=True
             )
             return BaseResponse(
@@ -109,6 +107,20 @@ class OperationsController:
             ).to_flask_response(500)
 
 
+    def _page_args(self):
+        """Read and validate the page and page_size query parameters"""
+        try:
+            page = int(request.args.get('page', 1))
+            page_size = int(request.args.get('page_size', DEFAULT_PAGE_SIZE))
+        except ValueError:
+            raise ValidationException("page and page_size must be integers", "invalid_request")
+        if page < 1 or page_size < 1 or page_size > MAX_PAGE_SIZE:
+            raise ValidationException(
+                f"page must be at least 1 and page_size between 1 and {MAX_PAGE_SIZE}",
+                "invalid_request"
+            )
+        return page, page_size
+
     def list_operations(self):
         """Handle operations listing requests"""
         try:
@@ -118,11 +130,30 @@ class OperationsController:
                 'started'
             )
             
-            operations = self.service.list_operations()
-            response = BaseResponse(
+            page, page_size = self._page_args()
+            
+            # Clients polling with the last ETag get a 304 without the catalog being listed
+            etag = self.service.operations_etag()
+            if etag in request.if_none_match:
+                self._log_request(
+                    '/api/operations',
+                    'GET',
+                    'completed',
+                    {"status_code": 304}
+                )
+                response = Response(status=304)
+                response.set_etag(etag)
+                return response
+            
+            result = self.service.list_operations(page, page_size)
+            response, status_code = BaseResponse(
                 success=True,
-                data=[op.__dict__ for op in operations]
-            ).to_flask_response(201)
+                data=[asdict(op) for op in result.operations]
+            ).to_flask_response(200)
+            response.set_etag(result.etag)
+            response.headers['X-Total-Count'] = str(result.total)
+            response.headers['X-Page'] = str(result.page)
+            response.headers['X-Page-Size'] = str(result.page_size)
             
             self._log_request(
                 '/api/operations',
@@ -130,11 +161,11 @@ class OperationsController:
                 'completed',
                 {
                     "status_code": 200,
-                    "count": len(operations)
+                    "count": len(result.operations)
                 }
             )
             
-            return response
+            return response, status_code
             
         except BusinessException as e:
             self._log_request(
@@ -155,7 +186,47 @@ class OperationsController:
             ).to_flask_response(e.status_code)
         except Exception as e:
             self.logger.error(
-                f"Unexpected error in list_operations: {str(e)}",
+                "Unexpected error in list_operations: %s", e,
+                exc_info=True
+            )
+            return BaseResponse(
+                success=False,
+                error=True,
+                error_code="internal_error",
+                error_message="Internal server error"
+            ).to_flask_response(500)
+
+    def get_operation(self, operation_name: str):
+        """Handle requests for the full content of one operation"""
+        try:
+            self._log_request('/api/operations/<name>', 'GET', 'started')
+            
+            operation = self.service.get_operation(operation_name)
+            
+            self._log_request('/api/operations/<name>', 'GET', 'completed', {
+                "status_code": 200,
+                "operation": operation_name
+            })
+            
+            return BaseResponse(
+                success=True,
+                data=asdict(operation)
+            ).to_flask_response()
+            
+        except BusinessException as e:
+            self._log_request('/api/operations/<name>', 'GET', 'failed', {
+                "status_code": e.status_code,
+                "error": e.message
+            })
+            return BaseResponse(
+                success=False,
+                error=True,
+                error_code=e.error_code,
+                error_message=e.message
+            ).to_flask_response(e.status_code)
+        except Exception as e:
+            self.logger.error(
+                "Unexpected error in get_operation: %s", e,
                 exc_info=True
             )
             return BaseResponse(
@@ -211,7 +282,7 @@ class OperationsController:
             ).to_flask_response(e.status_code)
         except Exception as e:
             self.logger.error(
-                f"Unexpected error in get_agents: {str(e)}",
+                "Unexpected error in get_agents: %s", e,
                 exc_info=True
             )
             return BaseResponse(
@@ -257,7 +328,57 @@ class OperationsController:
             ).to_flask_response(e.status_code)
         except Exception as e:
             self.logger.error(
-                f"Unexpected error in start operation: {str(e)}",
+                "Unexpected error in start operation: %s", e,
+                exc_info=True
+            )
+            return BaseResponse(
+                success=False,
+                error=True,
+                error_code="internal_error",
+                error_message="Internal server error"
+            ).to_flask_response(500)
+
+    def stream_operation(self, operation_name: str):
+        """API endpoint streaming the progress of an operation as Server-Sent Events"""
+        try:
+            self._log_request('/api/operations/stream', 'GET', 'started')
+            
+            if not operation_name:
+                raise ValidationException("Missing operation name", "invalid_request")
+                
+            events = self.service.stream_operation(
+                OperationRequest(name=operation_name)
+            )
+            
+            # Completion is logged by the service once the stream has been sent
+            self._log_request('/api/operations/stream', 'GET', 'streaming', {
+                "status_code": 200,
+                "operation": operation_name
+            })
+            
+            return Response(
+                events,
+                mimetype='text/event-stream',
+                headers={
+                    'Cache-Control': 'no-cache',
+                    'X-Accel-Buffering': 'no'
+                }
+            )
+            
+        except BusinessException as e:
+            self._log_request('/api/operations/stream', 'GET', 'failed', {
+                "status_code": e.status_code,
+                "error": e.message
+            })
+            return BaseResponse(
+                success=False,
+                error=True,
+                error_code=e.error_code,
+                error_message=e.message
+            ).to_flask_response(e.status_code)
+        except Exception as e:
+            self.logger.error(
+                "Unexpected error in stream operation: %s", e,
                 exc_info=True
             )
             return BaseResponse(
@@ -297,7 +418,88 @@ class OperationsController:
             ).to_flask_response(e.status_code)
         except Exception as e:
             self.logger.error(
-                f"Unexpected error in list investigations: {str(e)}",
+                "Unexpected error in list investigations: %s", e,
+                exc_info=True
+            )
+            return BaseResponse(
+                success=False,
+                error=True,
+                error_code="internal_error",
+                error_message="Internal server error"
+            ).to_flask_response(500)
+
+    def get_investigation(self, investigation_id: str):
+        """API endpoint to poll the status and result of an investigation"""
+        try:
+            self._log_request('/api/investigations/<id>', 'GET', 'started')
+            
+            investigation = self.service.get_investigation(investigation_id)
+            
+            self._log_request('/api/investigations/<id>', 'GET', 'completed', {
+                "status_code": 200,
+                "investigation": investigation_id,
+                "investigation_status": investigation.status
+            })
+            
+            return BaseResponse(
+                success=True,
+                data=asdict(investigation)
+            ).to_flask_response()
+            
+        except BusinessException as e:
+            self._log_request('/api/investigations/<id>', 'GET', 'failed', {
+                "status_code": e.status_code,
+                "error": e.message
+            })
+            return BaseResponse(
+                success=False,
+                error=True,
+                error_code=e.error_code,
+                error_message=e.message
+            ).to_flask_response(e.status_code)
+        except Exception as e:
+            self.logger.error(
+                "Unexpected error in get investigation: %s", e,
+                exc_info=True
+            )
+            return BaseResponse(
+                success=False,
+                error=True,
+                error_code="internal_error",
+                error_message="Internal server error"
+            ).to_flask_response(500)
+
+    def resume_investigation(self, investigation_id: str):
+        """API endpoint to resume an interrupted investigation"""
+        try:
+            self._log_request('/api/investigations/resume', 'POST', 'started')
+            
+            result = self.service.resume_investigation(investigation_id)
+            
+            self._log_request('/api/investigations/resume', 'POST', 'completed', {
+                "status_code": 202,
+                "investigation": investigation_id
+            })
+            
+            return BaseResponse(
+                success=True,
+                data=asdict(result)
+            ).to_flask_response(202)
+            
+        except BusinessException as e:
+            self._log_request('/api/investigations/resume', 'POST', 'failed', {
+                "status_code": e.status_code,
+                "error": e.message
+            })
+            return BaseResponse(
+                success=False,
+                error=True,
+                error_code=e.error_code,
+                error_message=e.message
+            ).to_flask_response(e.status_code)
+        except Exception as e:
+            self.logger.error(
+                "Unexpected error in resume investigation: %s", e,
                 exc_info=True
             )
             return BaseResponse(
@@ -343,7 +545,7 @@ class OperationsController:
                 ).to_flask_response(e.status_code)
         except Exception as e:
                 self.logger.error(
-                    f"Unexpected error in list investigations: {str(e)}",
+                    "Unexpected error in list investigations: %s", e,
                     exc_info=True
                 )
                 return BaseResponse(
@@ -353,4 +555,195 @@ class OperationsController:
                     error_message="Internal server error"
                 ).to_flask_response(500)
 
+    def predict_debugging_steps(self):
+        """Handle batch prediction requests"""
+        try:
+            data = request.get_json(silent=True)
+            self._log_request('/api/predictions/batch', 'POST', 'started')
+
+            incidents = data.get('incidents') if isinstance(data, dict) else None
+            if not isinstance(incidents, list) or not incidents or not all(isinstance(i, str) for i in incidents):
+                raise ValidationException(
+                    "incidents must be a non empty list of incident descriptions",
+                    "invalid_request"
+                )
+            if len(incidents) > MAX_PREDICTION_BATCH:
+                raise ValidationException(
+                    f"At most {MAX_PREDICTION_BATCH} incidents can be predicted per request",
+                    "batch_too_large"
+                )
+
+            predictions = self.service.predict_debugging_steps(PredictionRequest(incidents=incidents))
+            response = BaseResponse(
+                success=True,
+                data=[asdict(prediction) for prediction in predictions]
+            ).to_flask_response(200)
+
+            self._log_request('/api/predictions/batch', 'POST', 'completed', {
+                "status_code": 200,
+                "count": len(predictions)
+            })
+            return response
+
+        except BusinessException as e:
+            self._log_request('/api/predictions/batch', 'POST', 'failed', {
+                "status_code": e.status_code,
+                "error_code": e.error_code,
+                "error": e.message
+            })
+            return BaseResponse(
+                success=False,
+                error=True,
+                error_code=e.error_code,
+                error_message=e.message
+            ).to_flask_response(e.status_code)
+        except Exception as e:
+            self.logger.error(
+                "Unexpected error in predict debugging steps: %s", e,
+                exc_info=True
+            )
+            return BaseResponse(
+                success=False,
+                error=True,
+                error_code="internal_error",
+                error_message="Internal server error"
+            ).to_flask_response(500)
+
+    def find_similar_incidents(self):
+        """Handle similar incident searches"""
+        try:
+            data = request.get_json(silent=True)
+            self._log_request('/api/incidents/similar', 'POST', 'started')
+
+            query = data.get('query') if isinstance(data, dict) else None
+            if not isinstance(query, str) or not query.strip():
+                raise ValidationException(
+                    "query must be a non empty incident description",
+                    "invalid_request"
+                )
+            k = data.get('k', 5)
+            if not isinstance(k, int) or isinstance(k, bool) or not 1 <= k <= MAX_SIMILAR_INCIDENTS:
+                raise ValidationException(
+                    f"k must be an integer between 1 and {MAX_SIMILAR_INCIDENTS}",
+                    "invalid_request"
+                )
+
+            matches = self.service.find_similar_incidents(SimilarIncidentsRequest(query=query, k=k))
+            response = BaseResponse(
+                success=True,
+                data=[asdict(match) for match in matches]
+            ).to_flask_response(200)
+
+            self._log_request('/api/incidents/similar', 'POST', 'completed', {
+                "status_code": 200,
+                "count": len(matches)
+            })
+            return response
+
+        except BusinessException as e:
+            self._log_request('/api/incidents/similar', 'POST', 'failed', {
+                "status_code": e.status_code,
+                "error_code": e.error_code,
+                "error": e.message
+            })
+            return BaseResponse(
+                success=False,
+                error=True,
+                error_code=e.error_code,
+                error_message=e.message
+            ).to_flask_response(e.status_code)
+        except Exception as e:
+            self.logger.error(
+                "Unexpected error in find similar incidents: %s", e,
+                exc_info=True
+            )
+            return BaseResponse(
+                success=False,
+                error=True,
+                error_code="internal_error",
+                error_message="Internal server error"
+            ).to_flask_response(500)
+
+    def add_training_incidents(self):
+        """Handle resolved incidents sent to the incremental classifier"""
+        try:
+            data = request.get_json(silent=True)
+            self._log_request('/api/predictions/incidents', 'POST', 'started')
+
+            incidents = data.get('incidents') if isinstance(data, dict) else None
+            if not isinstance(incidents, list) or not incidents or not all(
+                isinstance(i, dict)
+                and isinstance(i.get('Incident Description'), str)
+                and isinstance(i.get('Debugging Steps'), str) and i['Debugging Steps'].strip()
+                for i in incidents
+            ):
+                raise ValidationException(
+                    "incidents must be a non empty list of incidents with an 'Incident Description' and 'Debugging Steps'",
+                    "invalid_request"
+                )
+            if len(incidents) > MAX_TRAINING_BATCH:
+                raise ValidationException(
+                    f"At most {MAX_TRAINING_BATCH} incidents can be added per request",
+                    "batch_too_large"
+                )
+
+            result = self.service.add_training_incidents(TrainingRequest(
+                incidents=incidents,
+                publish=bool(data.get('publish', True))
+            ))
+            response = BaseResponse(
+                success=True,
+                data=asdict(result)
+            ).to_flask_response(200)
+
+            self._log_request('/api/predictions/incidents', 'POST', 'completed', {
+                "status_code": 200,
+                "added": result.added,
+                "model_version": result.model_version
+            })
+            return response
 
+        except BusinessException as e:
+            self._log_request('/api/predictions/incidents', 'POST', 'failed', {
+                "status_code": e.status_code,
+                "error_code": e.error_code,
+                "error": e.message
+            })
+            return BaseResponse(
+                success=False,
+                error=True,
+                error_code=e.error_code,
+                error_message=e.message
+            ).to_flask_response(e.status_code)
+        except Exception as e:
+            self.logger.error(
+                "Unexpected error in add training incidents: %s", e,
+                exc_info=True
+            )
+            return BaseResponse(
+                success=False,
+                error=True,
+                error_code="internal_error",
+                error_message="Internal server error"
+            ).to_flask_response(500)
+
+    def get_metrics(self):
+        """Handle Prometheus scrapes of the graph metrics"""
+        try:
+            self._log_request('/metrics', 'GET', 'started')
+            body = self.service.get_metrics()
+            self._log_request('/metrics', 'GET', 'completed', {
+                "status_code": 200
+            })
+            return Response(body, status=200, mimetype='text/plain; version=0.0.4')
+        except Exception as e:
+            self.logger.error(
+                "Unexpected error in get metrics: %s", e,
+                exc_info=True
+            )
+            return BaseResponse(
+                success=False,
+                error=True,
+                error_code="internal_error",
+                error_message="Internal server error"
+            ).to_flask_response(500)
\ No newline at end of file
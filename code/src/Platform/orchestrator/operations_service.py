@@ -1,37 +1,59 @@
 import json
 import os
+import sys
 import logging
 from pathlib import Path
 from datetime import datetime
 from werkzeug.utils import secure_filename
-from typing import List, Dict
-from api_models import OperationResponse, AgentResponse,OperationRequest,Investigation, OperationStatusResponse
+from typing import List, Dict, Optional, Iterator
+from api_models import OperationResponse, AgentResponse,OperationRequest,Investigation, TriggerInvestigationResponse, OperationSummary, OperationsPage, PredictionRequest, PredictionResponse, TrainingRequest, TrainingResponse, SimilarIncidentsRequest, SimilarIncident
 from exceptions import (
     BusinessException,
     NotFoundException,
     ConflictException,
     ServiceException
 )
+from investigation_runner import InvestigationRunner
+from operations_catalog import OperationsCatalog
+from logging_config import LazyJson, configure_logging
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+from Platform.Agents.agent_registry import get_agent_registry
+from Platform.main import run_operation, stream_operation, resume_operation, get_checkpoint_status
+from Platform.Flows.instrumentation import metrics
+
 class OperationsService:
-    def __init__(self, base_dir: Path):
+    def __init__(self, base_dir: Path, runner: Optional[InvestigationRunner] = None):
         self.base_dir = base_dir
-        self.ops_docs_dir = base_dir / "operations" / "docs"
-        self.agents_file = base_dir / "agents" / "agents.json"
+        self.ops_docs_dir = base_dir / "Operations" / "docs"
+        self.agents_file = base_dir / "Agents" / "agents.json"
+        self.agent_registry = get_agent_registry(self.agents_file)
         self.logger = logging.getLogger('operations_service')
         self._setup_service_logger()
+        self._ensure_dir_exists(self.ops_docs_dir)
+        self.catalog = OperationsCatalog(self.ops_docs_dir)
+        self.runner = runner or InvestigationRunner(self._run_investigation, self._resume_investigation)
+        self._start_incremental_training()
+        self._start_similar_incidents()
+
+    def _start_similar_incidents(self):
+        """Build the similar incidents index in the background unless SIMILAR_INCIDENTS_WARM is false"""
+        if os.getenv("SIMILAR_INCIDENTS_WARM", "true").lower() != "false":
+            # Imported only when enabled, it loads scikit-learn
+            from Platform.prediction_model.similar_incidents import warm_similar_incidents
+            warm_similar_incidents()
+
+    def _start_incremental_training(self):
+        """Watch the incoming incidents directory when INCREMENTAL_WATCH_INTERVAL is set"""
+        interval = float(os.getenv("INCREMENTAL_WATCH_INTERVAL", "0"))
+        if interval > 0:
+            # Imported only when enabled, it loads scikit-learn
+            from Platform.prediction_model.incremental import get_trainer
+            get_trainer().start_watching(interval)
 
     def _setup_service_logger(self):
         """Configure service-specific logging"""
-        logs_dir = self.base_dir / "operations" / "logs"
-        logs_dir.mkdir(parents=True, exist_ok=True)
-        
-        handler = logging.FileHandler(logs_dir / 'operations_service.log')
-        formatter = logging.Formatter(
-            '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-        )
-        handler.setFormatter(formatter)
-        self.logger.addHandler(handler)
-        self.logger.setLevel(logging.INFO)
+        configure_logging(self.base_dir)
 
     def _log_operation(self, action: str, metadata: dict):
         """Helper method for consistent operation logging"""
@@ -40,7 +62,7 @@ class OperationsService:
             "timestamp": datetime.utcnow().isoformat(),
             **metadata
         }
-        self.logger.info(json.dumps(log_entry))
+        self.logger.info("%s", LazyJson(log_entry))
 
     def _ensure_dir_exists(self, path: Path):
         """Ensure directory exists with logging"""
@@ -52,7 +74,7 @@ class OperationsService:
             )
         except Exception as e:
             self.logger.error(
-                f"Failed to create directory {path}: {str(e)}",
+                "Failed to create directory %s: %s", path, e,
                 exc_info=True
             )
             raise ServiceException(
@@ -72,10 +94,9 @@ class OperationsService:
                     "operation_exists"
                 )
             
-            self._ensure_dir_exists(self.ops_docs_dir)
-            
             with open(filepath, 'w') as f:
                 f.write(request.operation_text)
+            self.catalog.invalidate()
             
             operation = [OperationResponse(
                 name=request.name
@@ -97,30 +118,38 @@ class OperationsService:
             )
 
 
-    def list_operations(self) -> List[OperationResponse]:
-        """List all available operations"""
+    def operations_etag(self) -> str:
+        """Entity tag of the operations catalog, changes whenever a runbook changes"""
         try:
-            operations = []
-            self._ensure_dir_exists(self.ops_docs_dir)
-            
-            for filename in os.listdir(self.ops_docs_dir):
-                filepath = self.ops_docs_dir / filename
-                if filepath.is_file() and filename.endswith('.txt'):
-                    with open(filepath, 'r') as f:
-                        content = f.read()
+            return self.catalog.etag
+        except Exception as e:
+            raise ServiceException(
+                f"Error listing operations: {str(e)}",
+                "operation_list_failed"
+            )
 
-                    name = os.path.splitext(filename)[0]
-                    operations.append(OperationResponse(
-                        name=name,
-                        content=content
-                    ))
+    def list_operations(self, page: int = 1, page_size: int = 100) -> OperationsPage:
+        """List one page of runbook names, sizes and hashes"""
+        try:
+            entries, total = self.catalog.list(offset=(page - 1) * page_size, limit=page_size)
+            operations = [
+                OperationSummary(name=entry.name, size=entry.size, hash=entry.hash)
+                for entry in entries
+            ]
             
             self._log_operation("list_operations", {
                 "status": "success",
-                "count": len(operations)
+                "count": len(operations),
+                "total": total
             })
             
-            return operations
+            return OperationsPage(
+                operations=operations,
+                total=total,
+                page=page,
+                page_size=page_size,
+                etag=self.catalog.etag
+            )
             
         except Exception as e:
             raise ServiceException(
@@ -128,23 +157,26 @@ class OperationsService:
                 "operation_list_failed"
             )
 
+    def get_operation(self, name: str) -> OperationResponse:
+        """Get the full content of one runbook"""
+        return OperationResponse(name=name, content=self._read_operation(name))
+
     def get_agents(self) -> List[AgentResponse]:
         """Get all agents from the agents file"""
         try:
-            if not self.agents_file.exists():
+            try:
+                registered_agents = self.agent_registry.agents()
+            except FileNotFoundError:
                 raise NotFoundException(
                     "Agents file not found",
                     "agents_file_not_found"
                 )
             
-            with open(self.agents_file, 'r') as f:
-                data = json.load(f)
-            
             agents = [
                 AgentResponse(
                     name=agent['name'],
                     type=agent['type'],
-                ) for agent in data['agents']
+                ) for agent in registered_agents
             ]
             
             self._log_operation("get_agents", {
@@ -162,26 +194,57 @@ class OperationsService:
                 "agents_retrieval_failed"
             )
         
-    def start_operation(self, request: OperationRequest) -> OperationStatusResponse:
-        """Start a new operation with full logging"""
+    def _read_operation(self, name: str) -> str:
+        """Read the operation text for a runbook name"""
+        # Runbooks are stored under their secured name by create_operation
+        content = self.catalog.read(secure_filename(name))
+        if content is None:
+            raise NotFoundException(
+                f"Operation '{name}' not found",
+                "operation_not_found"
+            )
+        return content
+
+    def _run_investigation(self, operation_text: str, investigation_id: str) -> Dict:
+        """Run the core graph for an operation, called on a runner worker thread"""
+        return self._investigation_result(run_operation(operation_text, investigation_id))
+
+    def _resume_investigation(self, investigation_id: str) -> Dict:
+        """Continue an investigation from its checkpoint, called on a runner worker thread"""
+        return self._investigation_result(resume_operation(investigation_id))
+
+    @staticmethod
+    def _investigation_result(result: Dict) -> Dict:
+        return {
+            "history": result.get("history", []),
+            "fast_path_hits": result.get("fast_path_hits", 0),
+            "metrics": result.get("metrics")
+        }
+
+    def start_operation(self, request: OperationRequest) -> TriggerInvestigationResponse:
+        """Queue an operation to run in the background and return its investigation id"""
         try:
-            self.logger.info(f"Starting operation: {request.name}")
+            self.logger.info("Starting operation: %s", request.name)
             
-            # Your operation logic here
-            output = f"Operation {request.name} started successfully"
+            operation_text = self._read_operation(request.name)
+            investigation = self.runner.submit(request.name, operation_text)
             
-            self.logger.info(f"Operation {request.name} started", extra={
+            self.logger.info("Operation %s queued", request.name, extra={
                 "operation": request.name,
-                "status": "running"
+                "investigation_id": investigation.id,
+                "status": investigation.status
             })
             
-            return OperationStatusResponse(
-                status="running",
-                output=output
+            return TriggerInvestigationResponse(
+                investigation_id=investigation.id,
+                status=investigation.status,
+                message=f"Operation {request.name} queued as investigation {investigation.id}"
             )
             
+        except BusinessException:
+            raise
         except Exception as e:
-            self.logger.error(f"Operation start failed: {str(e)}", exc_info=True, extra={
+            self.logger.error("Operation start failed: %s", e, exc_info=True, extra={
                 "operation": request.name,
                 "error": str(e)
             })
@@ -190,22 +253,61 @@ class OperationsService:
                 "operation_start_failed"
             )
 
+    def stream_operation(self, request: OperationRequest) -> Iterator[str]:
+        """
+        Run an operation and return its node outputs as Server-Sent Events. The stream
+        takes one of the runner's slots, so it is rejected with 503 like a triggered
+        investigation when the runner is at capacity.
+        """
+        # Read before streaming so a missing runbook is reported as a normal error response
+        operation_text = self._read_operation(request.name)
+        self.logger.info("Streaming operation: %s", request.name)
+
+        def events():
+            nodes = 0
+            stream = stream_operation(operation_text)
+            try:
+                while True:
+                    try:
+                        event = next(stream)
+                    except StopIteration as finished:
+                        # The generator returns the metrics summary of the run
+                        summary = finished.value
+                        break
+                    nodes += 1
+                    yield self._sse("node", event)
+                yield self._sse("completed", {"operation": request.name, "metrics": summary})
+                self._log_operation("stream_operation", {
+                    "status": "success",
+                    "operation": request.name,
+                    "nodes": nodes,
+                    "metrics": summary
+                })
+            except Exception as e:
+                self.logger.error("Operation stream failed: %s", e, exc_info=True, extra={
+                    "operation": request.name,
+                    "error": str(e)
+                })
+                yield self._sse("error", {"operation": request.name, "error": str(e)})
+            finally:
+                # Ends the tracked run here when the client disconnects mid stream
+                stream.close()
+
+        return self.runner.stream(events())
+
+    @staticmethod
+    def _sse(event: str, data: Dict) -> str:
+        """Format one Server-Sent Event"""
+        return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
     def list_investigations(self) -> List[Investigation]:
-        """List investigations with audit logging"""
+        """List queued, running and finished investigations"""
         try:
             self.logger.info("Listing investigations")
             
-            # Replace with actual investigation listing logic
-            investigations = [
-                Investigation(
-                    id="inv-123",
-                    name="Security Audit",
-                    status="completed",
-                    created_at="2023-01-15T10:30:00Z"
-                )
-            ]
+            investigations = self.runner.list()
             
-            self.logger.info(f"Found {len(investigations)} investigations")
+            self.logger.info("Found %d investigations", len(investigations))
             return investigations
             
         except Exception as e:
@@ -215,25 +317,181 @@ class OperationsService:
                 "investigation_list_failed"
             )
 
-    def trigger_investigation(self, request: OperationRequest) -> OperationStatusResponse:
-        """Trigger investigation with detailed logging"""
+    def get_investigation(self, investigation_id: str) -> Investigation:
+        """Get the status and, once finished, the result of an investigation"""
+        investigation = self.runner.get(investigation_id)
+        if investigation is None:
+            raise NotFoundException(
+                f"Investigation '{investigation_id}' not found",
+                "investigation_not_found"
+            )
+        return investigation
+
+    def resume_investigation(self, investigation_id: str) -> TriggerInvestigationResponse:
+        """Resume an interrupted investigation from its last completed node"""
         try:
-            self.logger.info(f"Triggering investigation: {request.name}")
+            # Checked again by the runner under its lock, this only orders the error before the checkpoint lookup
+            investigation = self.runner.get(investigation_id)
+            if investigation is not None and investigation.status in ("queued", "running"):
+                raise ConflictException(
+                    f"Investigation '{investigation_id}' is still {investigation.status}",
+                    "investigation_in_progress"
+                )
+
+            pending_nodes = get_checkpoint_status(investigation_id)
+            if pending_nodes is None:
+                raise NotFoundException(
+                    f"No checkpoint found for investigation '{investigation_id}'",
+                    "checkpoint_not_found"
+                )
+            if not pending_nodes:
+                raise ConflictException(
+                    f"Investigation '{investigation_id}' already completed",
+                    "investigation_completed"
+                )
+
+            investigation = self.runner.resume(investigation_id)
+            self.logger.info("Resuming investigation %s at %s", investigation_id, ', '.join(pending_nodes))
+
+            return TriggerInvestigationResponse(
+                investigation_id=investigation.id,
+                status=investigation.status,
+                message=f"Investigation {investigation.id} resumed at {', '.join(pending_nodes)}"
+            )
+
+        except BusinessException:
+            raise
+        except Exception as e:
+            self.logger.error("Investigation resume failed: %s", e, exc_info=True, extra={
+                "investigation_id": investigation_id,
+                "error": str(e)
+            })
+            raise ServiceException(
+                f"Investigation resume failed: {str(e)}",
+                "investigation_resume_failed"
+            )
+
+    def trigger_investigation(self, request: OperationRequest) -> TriggerInvestigationResponse:
+        """Trigger an investigation using the runbook of the same name"""
+        try:
+            self.logger.info("Triggering investigation: %s", request.name)
             
-            # Your investigation triggering logic here
-            investigation_id = "123"
+            operation_text = self._read_operation(request.name)
+            investigation = self.runner.submit(request.name, operation_text)
             
-            return OperationStatusResponse(
-                status="started",
-                output=f"Investigation {investigation_id} started for {request.name}"
+            return TriggerInvestigationResponse(
+                investigation_id=investigation.id,
+                status=investigation.status,
+                message=f"Investigation {investigation.id} started for {request.name}"
             )
             
+        except BusinessException:
+            raise
         except Exception as e:
-            self.logger.error(f"Investigation trigger failed: {str(e)}", exc_info=True, extra={
+            self.logger.error("Investigation trigger failed: %s", e, exc_info=True, extra={
                 "operation": request.name,
                 "error": str(e)
             })
             raise ServiceException(
                 f"Investigation trigger failed: {str(e)}",
                 "investigation_trigger_failed"
-            )
\ No newline at end of file
+            )
+
+    def predict_debugging_steps(self, request: PredictionRequest) -> List[PredictionResponse]:
+        """Predict the debugging steps for a batch of incident descriptions"""
+        try:
+            # Imported on first use, loading the prediction model is slow
+            from Platform.prediction_model.main import predict_debugging_steps_batch
+
+            steps = predict_debugging_steps_batch(request.incidents)
+            predictions = [
+                PredictionResponse(incident=incident, debugging_steps=debugging_steps)
+                for incident, debugging_steps in zip(request.incidents, steps)
+            ]
+
+            self._log_operation("predict_debugging_steps", {
+                "status": "success",
+                "count": len(predictions),
+                "distinct_steps": len(set(steps))
+            })
+
+            return predictions
+
+        except BusinessException:
+            raise
+        except Exception as e:
+            self.logger.error("Prediction failed: %s", e, exc_info=True)
+            raise ServiceException(
+                f"Prediction failed: {str(e)}",
+                "prediction_failed"
+            )
+
+    def find_similar_incidents(self, request: SimilarIncidentsRequest) -> List[SimilarIncident]:
+        """Find the historical incidents most similar to a description"""
+        try:
+            # Imported on first use, the index is built from the incident files
+            from Platform.prediction_model.similar_incidents import get_similar_incidents
+
+            matches = get_similar_incidents().query(request.query, request.k)
+
+            self._log_operation("find_similar_incidents", {
+                "status": "success",
+                "count": len(matches)
+            })
+
+            return [SimilarIncident(**match) for match in matches]
+
+        except BusinessException:
+            raise
+        except Exception as e:
+            self.logger.error("Similar incident search failed: %s", e, exc_info=True)
+            raise ServiceException(
+                f"Similar incident search failed: {str(e)}",
+                "similar_incidents_failed"
+            )
+
+    def add_training_incidents(self, request: TrainingRequest) -> TrainingResponse:
+        """Train the incremental classifier on resolved incidents and optionally publish a new version"""
+        try:
+            # Imported on first use, it loads scikit-learn
+            from Platform.prediction_model.incremental import get_trainer
+            from Platform.prediction_model.similar_incidents import add_similar_incidents
+
+            trainer = get_trainer()
+            added = trainer.add_incidents(request.incidents)
+            # Incidents of a first label alone are held by the trainer, there is no model to publish yet
+            version = trainer.publish() if request.publish and added and trainer.model is not None else trainer.version
+
+            # Resolved incidents are searchable by the similar incidents agent right away. The
+            # model is already updated, so a failure here must not make the client train again
+            try:
+                add_similar_incidents(request.incidents)
+            except Exception as e:
+                self.logger.warning("Indexing the training incidents for search failed: %s", e, exc_info=True)
+
+            self._log_operation("add_training_incidents", {
+                "status": "success",
+                "added": added,
+                "model_version": version,
+                "served_version": trainer.registry.current_version()
+            })
+
+            return TrainingResponse(
+                added=added,
+                trained_incidents=trainer.trained_incidents,
+                model_version=version,
+                served_version=trainer.registry.current_version()
+            )
+
+        except BusinessException:
+            raise
+        except Exception as e:
+            self.logger.error("Incremental training failed: %s", e, exc_info=True)
+            raise ServiceException(
+                f"Incremental training failed: {str(e)}",
+                "training_failed"
+            )
+
+    def get_metrics(self) -> str:
+        """Graph node latency, LLM token and loop iteration metrics in the Prometheus text format"""
+        return metrics.render()
\ No newline at end of file
@@ -0,0 +1,159 @@
+import json
+import os
+import tempfile
+import threading
+import time
+
+# Get the base directory of the current script
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+# Runtime state of the prediction service, kept out of the source tree
+VAR_DIR = os.getenv("PREDICTION_VAR_DIR", os.path.join(BASE_DIR, "..", "..", "..", "var", "prediction_model"))
+
+# JSON file the formatted flows are kept in between restarts, empty keeps them in memory only
+FLOW_CACHE_PATH = os.getenv("PREDICTION_FLOW_CACHE_PATH", os.path.join(VAR_DIR, "flow_cache.json"))
+# Seconds a flow from the fallback formatter is served before the LLM is tried again
+FLOW_FALLBACK_TTL = float(os.getenv("PREDICTION_FLOW_FALLBACK_TTL", "300"))
+
+
+class FlowCache:
+    """
+    Formatted debugging flow of every debugging steps label the model predicts. The
+    model only knows a small set of labels, so each of them is sent to the formatter
+    once and later predictions are answered from memory. Flows are saved to a JSON file
+    together with the fingerprint of the model they were made for, and are all dropped
+    when a retrained model with another fingerprint asks for one.
+
+    Flows produced by the fallback formatter are kept in memory only and for
+    fallback_ttl seconds, so a transient LLM failure is retried by the same process and
+    the next one tries the LLM again.
+    """
+
+    def __init__(self, path=FLOW_CACHE_PATH, fallback_ttl=FLOW_FALLBACK_TTL, clock=time.monotonic):
+        self.path = path or None
+        self.fallback_ttl = fallback_ttl
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._fingerprint = None
+        self._flows = {}
+        # Label of every fallback flow and when it expires
+        self._fallbacks = {}
+        self.hits = 0
+        self.misses = 0
+        self.fallbacks = 0
+        self._load()
+
+    def _load(self):
+        if self.path is None or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                stored = json.load(f)
+        except (OSError, ValueError):
+            # A damaged cache file is rebuilt from scratch
+            return
+        self._fingerprint = stored.get("fingerprint")
+        self._flows = dict(stored.get("flows", {}))
+
+    def _save(self):
+        """Writes the flows to the cache file, a file that cannot be written only costs the reuse after a restart"""
+        if self.path is None:
+            return
+        flows = {label: flow for label, flow in self._flows.items() if label not in self._fallbacks}
+        directory = os.path.dirname(os.path.abspath(self.path))
+        temporary = None
+        try:
+            os.makedirs(directory, exist_ok=True)
+            descriptor, temporary = tempfile.mkstemp(dir=directory, suffix=".tmp")
+            with os.fdopen(descriptor, "w", encoding="utf-8") as f:
+                json.dump({"fingerprint": self._fingerprint, "flows": flows}, f, indent=2)
+            os.replace(temporary, self.path)
+        except OSError as e:
+            if temporary is not None and os.path.exists(temporary):
+                os.unlink(temporary)
+            print(f"Could not save the flow cache to {self.path}: {e}")
+
+    def _check_fingerprint(self, fingerprint):
+        if fingerprint != self._fingerprint:
+            self._fingerprint = fingerprint
+            self._flows.clear()
+            self._fallbacks.clear()
+
+    def get_or_format(self, fingerprint, label, formatter, fallback=None):
+        """
+        Returns the formatted flow of label for the model with fingerprint, calling
+        formatter(label) when it is not cached. If formatter raises ValueError (no API
+        key) or returns None, fallback(label) is used instead until it expires.
+        """
+        with self._lock:
+            self._check_fingerprint(fingerprint)
+            expires = self._fallbacks.get(label)
+            if expires is not None and self.clock() >= expires:
+                del self._fallbacks[label]
+                del self._flows[label]
+            flow = self._flows.get(label)
+            if flow is not None:
+                self.hits += 1
+                return flow
+            self.misses += 1
+
+        # Formatting can take seconds, it runs outside the lock and the first result wins
+        try:
+            flow = formatter(label)
+        except ValueError:
+            flow = None
+        from_fallback = flow is None and fallback is not None
+        if from_fallback:
+            flow = fallback(label)
+        if flow is None:
+            return None
+
+        with self._lock:
+            self._check_fingerprint(fingerprint)
+            if label in self._flows:
+                return self._flows[label]
+            self._flows[label] = flow
+            if from_fallback:
+                self._fallbacks[label] = self.clock() + self.fallback_ttl
+                self.fallbacks += 1
+            else:
+                self._save()
+        return flow
+
+    def stats(self):
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "fallbacks": self.fallbacks,
+                "entries": len(self._flows)
+            }
+
+    def clear(self):
+        with self._lock:
+            self._flows.clear()
+            self._fallbacks.clear()
+            self._save()
+
+
+_flow_cache = None
+_flow_cache_lock = threading.Lock()
+
+
+def get_flow_cache():
+    """
+    Returns the shared flow cache, read from PREDICTION_FLOW_CACHE_PATH on first use.
+    """
+    global _flow_cache
+    if _flow_cache is None:
+        with _flow_cache_lock:
+            if _flow_cache is None:
+                _flow_cache = FlowCache()
+    return _flow_cache
+
+
+def set_flow_cache(cache):
+    """
+    Replaces the shared flow cache, pass None to reload it from PREDICTION_FLOW_CACHE_PATH.
+    """
+    global _flow_cache
+    _flow_cache = cache
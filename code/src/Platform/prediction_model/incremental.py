@@ -0,0 +1,294 @@
+import copy
+import glob
+import os
+import threading
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+from sklearn.feature_extraction.text import HashingVectorizer
+from sklearn.linear_model import SGDClassifier
+from Platform.prediction_model.ingestion import TRAINING_SOURCES, TRAINING_STORE_DIR, ingest, iter_store
+from Platform.prediction_model.predictor import get_predictor
+from Platform.prediction_model.preprocess import LABEL_COLUMN, TEXT_COLUMNS, prepare_incidents
+from Platform.prediction_model.registry import get_registry
+
+# Get the base directory of the current script
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+# Runtime state of the prediction service, kept out of the source tree
+VAR_DIR = os.getenv("PREDICTION_VAR_DIR", os.path.join(BASE_DIR, "..", "..", "..", "var", "prediction_model"))
+
+# Directory watched for CSV files of resolved incidents, processed files move to its processed/ folder
+# and files that could not be trained on to its failed/ folder
+INCREMENTAL_INCOMING_DIR = os.getenv("INCREMENTAL_INCOMING_DIR", os.path.join(VAR_DIR, "incoming"))
+# Width of the hashed feature space, every class keeps one weight per feature
+INCREMENTAL_FEATURES = int(os.getenv("INCREMENTAL_FEATURES", str(2 ** 16)))
+INCREMENTAL_CHUNK_SIZE = int(os.getenv("INCREMENTAL_CHUNK_SIZE", "10000"))
+
+# Source recorded in the registry metadata of the versions published by the trainer
+SOURCE = "incremental"
+
+
+def make_vectorizer(n_features=INCREMENTAL_FEATURES):
+    """Stateless vectorizer, the same text maps to the same features in every process and version"""
+    return HashingVectorizer(n_features=n_features, alternate_sign=False, norm="l2")
+
+
+def _add_classes(model, labels):
+    """
+    Grows a fitted SGDClassifier by the labels it has not seen yet. partial_fit only
+    accepts the classes of its first call, a new debugging steps label starts with zero
+    weights and is learned from the batch that introduced it.
+    """
+    new = np.setdiff1d(np.unique(labels), model.classes_)
+    if not len(new):
+        return
+    coef, intercept = model.coef_, model.intercept_
+    if len(model.classes_) == 2:
+        # Binary models keep one weight vector for the second class, spell out both
+        coef = np.vstack([-coef, coef])
+        intercept = np.concatenate([-intercept, intercept])
+    classes = np.concatenate([model.classes_, new])
+    coef = np.vstack([coef, np.zeros((len(new), coef.shape[1]), dtype=coef.dtype)])
+    intercept = np.concatenate([intercept, np.zeros(len(new), dtype=intercept.dtype)])
+
+    order = np.argsort(classes)
+    model.classes_ = classes[order]
+    model.coef_ = np.ascontiguousarray(coef[order])
+    model.intercept_ = intercept[order]
+
+
+class IncrementalTrainer:
+    """
+    Online trained debugging steps classifier. Text is hashed with a HashingVectorizer, so
+    there is no vocabulary to refit, and new incidents update an SGDClassifier through
+    partial_fit instead of a full retrain. Incidents come from CSV files dropped into
+    incoming_dir or from add_incidents, and publish stores the model as a new version
+    of the model registry, which predictors on the registry swap to. The trainer
+    resumes from the last version it published, a trainer without one first learns the
+    incidents of the training store, so its versions know the debugging steps of the
+    history and not only those of the incidents added since.
+
+    A classifier needs two debugging steps labels to start from, incidents of a first
+    label are held in memory until incidents of another one arrive.
+    """
+
+    def __init__(self, registry=None, incoming_dir=INCREMENTAL_INCOMING_DIR, n_features=INCREMENTAL_FEATURES,
+                 chunksize=INCREMENTAL_CHUNK_SIZE, predictor=None, sources=TRAINING_SOURCES,
+                 store_dir=TRAINING_STORE_DIR):
+        self.registry = registry or get_registry()
+        self.incoming_dir = incoming_dir
+        self.chunksize = chunksize
+        self.predictor = predictor
+        self.sources = sources
+        self.store_dir = store_dir
+        self.model, self.vectorizer, self.version, self.trained_incidents = self._resume(n_features)
+        # A resumed model has learned the training store already
+        self._bootstrapped = self.model is not None
+        self._bootstrap_lock = threading.Lock()
+        # Features and labels received before the first model could be fitted
+        self._pending = []
+        self._lock = threading.Lock()
+        self._publish_lock = threading.Lock()
+        self._watcher = None
+        self._stop = threading.Event()
+
+    def _resume(self, n_features):
+        """Model, vectorizer, version and trained incidents of the last version the trainer published"""
+        for version in reversed(self.registry.versions()):
+            metadata = self.registry.manifest(version)["metadata"]
+            if metadata.get("source") == SOURCE:
+                model, vectorizer, _ = self.registry.load(version)
+                # The registry stores the weights downcast, training goes on in full precision
+                model.coef_ = model.coef_.astype(np.float64)
+                model.intercept_ = model.intercept_.astype(np.float64)
+                return model, vectorizer, version, metadata.get("trained_incidents", 0)
+        return None, make_vectorizer(n_features), 0, 0
+
+    def bootstrap(self):
+        """
+        Trains a trainer without a version to resume from on the incidents of the training
+        store, ingested from sources and read chunk by chunk. Runs once, before the first
+        update. Without any training sources the trainer starts from the incidents it is given.
+        """
+        if self._bootstrapped:
+            return
+        with self._bootstrap_lock:
+            if self._bootstrapped:
+                return
+            try:
+                store = ingest(self.sources, self.store_dir)
+            except FileNotFoundError as e:
+                print(f"Incremental training starts without a training store: {e}")
+            else:
+                for part in iter_store(store):
+                    for start in range(0, len(part), self.chunksize):
+                        self._partial_fit(*self._prepare(part.iloc[start:start + self.chunksize]))
+            self._bootstrapped = True
+
+    @property
+    def pending_incidents(self):
+        """Incidents held until the first model can be fitted"""
+        with self._lock:
+            return sum(len(labels) for _, labels in self._pending)
+
+    def partial_fit(self, texts, labels):
+        """
+        Updates the model with prepared incident texts and their debugging steps and
+        returns the incidents accepted, trained on or held until a second label arrives.
+        """
+        if not len(labels):
+            return 0
+        self.bootstrap()
+        return self._partial_fit(texts, labels)
+
+    def _partial_fit(self, texts, labels):
+        labels = np.asarray(labels, dtype=object)
+        if not len(labels):
+            return 0
+        accepted = len(labels)
+        features = self.vectorizer.transform(texts)
+        with self._lock:
+            if self.model is None:
+                self._pending.append((features, labels))
+                labels = np.concatenate([pending for _, pending in self._pending])
+                if len(np.unique(labels)) < 2:
+                    return accepted
+                features = sp.vstack([pending for pending, _ in self._pending], format="csr")
+                self._pending = []
+                self.model = SGDClassifier(loss="log_loss", random_state=42)
+                self.model.partial_fit(features, labels, classes=np.unique(labels))
+            else:
+                _add_classes(self.model, labels)
+                self.model.partial_fit(features, labels)
+            self.trained_incidents += len(labels)
+        return accepted
+
+    @staticmethod
+    def _prepare(df):
+        """Prepared texts and debugging steps of the labelled incidents of a frame"""
+        df = df.reindex(columns=TEXT_COLUMNS + [LABEL_COLUMN]).astype(object)
+        df = df[df[LABEL_COLUMN].notna() & (df[LABEL_COLUMN].astype(str).str.strip() != "")]
+        if df.empty:
+            return [], []
+        df = prepare_incidents(df)
+        return df['combined_text'], df[LABEL_COLUMN].astype(str)
+
+    def add_frame(self, df):
+        """Trains on a frame of incidents with the columns of the incidents CSV files"""
+        return self.partial_fit(*self._prepare(df))
+
+    def add_csv(self, path):
+        """Trains on a CSV file of incidents, read in chunks"""
+        return sum(self.add_frame(chunk) for chunk in pd.read_csv(path, chunksize=self.chunksize))
+
+    def add_incidents(self, incidents):
+        """Trains on a list of incident dicts keyed by the CSV column names"""
+        return self.add_frame(pd.DataFrame.from_records(list(incidents)))
+
+    def publish(self):
+        """
+        Publishes the current model to the registry as the version served and returns
+        the version. A predictor on the same registry swaps to it right away, others on
+        their next refresh.
+
+        A model that knows fewer debugging steps than the version served would stop
+        predicting the others, it is published for the trainer to resume from but not
+        activated.
+        """
+        with self._publish_lock:
+            with self._lock:
+                if self.model is None:
+                    raise ValueError("No incidents have been trained yet")
+                # Training goes on while the copy is written
+                model = copy.deepcopy(self.model)
+                trained_incidents = self.trained_incidents
+
+            current = self.registry.current_version()
+            served_classes = self.registry.manifest(current).get("classes", 0) if current is not None else 0
+            activate = len(model.classes_) >= served_classes
+            version = self.registry.publish(model, self.vectorizer, metadata={
+                "source": SOURCE,
+                "trained_incidents": trained_incidents,
+            }, activate=activate)
+            self.version = version
+            if not activate:
+                print(f"Incremental version {version} knows {len(model.classes_)} debugging steps, fewer than "
+                      f"the {served_classes} of the served version {current}, it is not activated")
+                return version
+
+            predictor = self.predictor or get_predictor()
+            if predictor.registry is not None and \
+                    os.path.abspath(predictor.registry.directory) == os.path.abspath(self.registry.directory):
+                predictor.refresh()
+        return version
+
+    def poll(self):
+        """
+        Trains on the CSV files waiting in incoming_dir, moves them to processed/ and
+        publishes a new version if the model changed. Returns the incidents added.
+
+        A file that fails part way is moved to failed/ with the chunks read before the
+        error trained, so it is not trained on again, chunk by chunk, at every poll.
+        """
+        added = 0
+        trained = self.trained_incidents
+        for path in sorted(glob.glob(os.path.join(self.incoming_dir, "*.csv"))):
+            try:
+                added += self.add_csv(path)
+                folder = "processed"
+            except Exception as e:
+                print(f"Incremental training on {path} failed, moving it to failed/: {e}")
+                folder = "failed"
+            os.makedirs(os.path.join(self.incoming_dir, folder), exist_ok=True)
+            os.replace(path, os.path.join(self.incoming_dir, folder, os.path.basename(path)))
+        if self.trained_incidents != trained:
+            self.publish()
+        return added
+
+    def start_watching(self, interval=30.0):
+        """Polls incoming_dir every interval seconds on a daemon thread"""
+        if self._watcher is not None and self._watcher.is_alive():
+            return self._watcher
+        self._stop.clear()
+        os.makedirs(self.incoming_dir, exist_ok=True)
+
+        def watch():
+            while not self._stop.wait(interval):
+                try:
+                    self.poll()
+                except Exception as e:
+                    print(f"Incremental training from {self.incoming_dir} failed: {e}")
+
+        self._watcher = threading.Thread(target=watch, name="incremental-trainer", daemon=True)
+        self._watcher.start()
+        return self._watcher
+
+    def stop_watching(self):
+        self._stop.set()
+        if self._watcher is not None:
+            self._watcher.join()
+            self._watcher = None
+
+
+_trainer = None
+_trainer_lock = threading.Lock()
+
+
+def get_trainer():
+    """
+    Returns the shared incremental trainer, resuming from its last version in the model registry.
+    """
+    global _trainer
+    if _trainer is None:
+        with _trainer_lock:
+            if _trainer is None:
+                _trainer = IncrementalTrainer()
+    return _trainer
+
+
+def set_trainer(trainer):
+    """
+    Replaces the shared incremental trainer, pass None to rebuild the default.
+    """
+    global _trainer
+    _trainer = trainer
@@ -0,0 +1,271 @@
+import glob
+import json
+import os
+import re
+import shutil
+import tempfile
+import numpy as np
+import pandas as pd
+from Platform.prediction_model.preprocess import _parquet_available, file_hash
+
+# Get the base directory of the current script
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DATA_DIR = os.path.join(BASE_DIR, "..", "..", "..", "data")
+# Runtime state of the prediction service, kept out of the source tree
+VAR_DIR = os.getenv("PREDICTION_VAR_DIR", os.path.join(BASE_DIR, "..", "..", "..", "var", "prediction_model"))
+
+# Incident CSV files or globs trained on, separated by os.pathsep and oldest first: an incident
+# found in several files is taken from the last one
+TRAINING_SOURCES = os.getenv("TRAINING_SOURCES", os.pathsep.join([
+    os.path.join(DATA_DIR, "incidents-generated-data.csv"),
+    os.path.join(DATA_DIR, "incidents-generated-data-v*.csv"),
+]))
+# Directory of the columnar training store written by ingest
+TRAINING_STORE_DIR = os.getenv("TRAINING_STORE_DIR", os.path.join(VAR_DIR, "training_store"))
+# Rows read from a CSV file at a time, bounds the memory of an ingestion
+INGEST_CHUNK_SIZE = int(os.getenv("INGEST_CHUNK_SIZE", "50000"))
+
+# Bump when the normalization changes, so stores written the old way are ingested again
+STORE_VERSION = 1
+MANIFEST = "manifest.json"
+
+ID_COLUMN = "Incident ID"
+STEPS_COLUMN = "Debugging Steps"
+FIRST_STEP_COLUMN = "First Debugging Step"
+# Columns of the training store, in order
+INCIDENT_COLUMNS = [
+    ID_COLUMN, "Incident Name", "Incident Description", "Priority", "Assigned To", "Status",
+    STEPS_COLUMN, FIRST_STEP_COLUMN, "Resolution", "Communication Log",
+]
+# Column names used by earlier versions of the incidents files
+COLUMN_ALIASES = {"Debugging Step": STEPS_COLUMN}
+
+# Text of the first numbered step, or the whole text when the steps are not numbered
+_FIRST_STEP = re.compile(r"^\s*(?:1\.\s*)?(.*?)(?=\s+2\.\s|$)", re.S)
+
+
+def expand_sources(sources=TRAINING_SOURCES):
+    """
+    Paths of the incident files in sources, a list or an os.pathsep separated string of
+    paths and globs. Globs expand in name order and a file is only read once, at its
+    first position.
+    """
+    if isinstance(sources, str):
+        sources = [source for source in sources.split(os.pathsep) if source]
+    paths = []
+    for source in sources:
+        if glob.has_magic(source):
+            matches = sorted(glob.glob(source))
+        elif os.path.exists(source):
+            matches = [source]
+        else:
+            raise FileNotFoundError(f"Incident file {source} not found")
+        paths.extend(os.path.abspath(path) for path in matches)
+    return list(dict.fromkeys(paths))
+
+
+def normalize_columns(df):
+    """
+    Maps a chunk of any incidents file version onto INCIDENT_COLUMNS: header names are
+    stripped and renamed from their old names, missing columns are added empty and
+    incident IDs are stripped, with blank IDs read as missing.
+    """
+    df = df.rename(columns=lambda column: str(column).strip().lstrip("\ufeff"))
+    df = df.rename(columns=COLUMN_ALIASES).reindex(columns=INCIDENT_COLUMNS).astype(object)
+    ids = df[ID_COLUMN].str.strip()
+    df[ID_COLUMN] = ids.where(ids != "")
+    return df
+
+
+def _collapse_continuations(df):
+    """
+    The first incidents file spreads debugging steps over rows without an incident ID,
+    their steps are appended to the incident above them. Continuation rows before the
+    first incident have nothing to attach to and are dropped.
+    """
+    has_id = df[ID_COLUMN].notna().to_numpy()
+    if has_id.all():
+        return df
+    incident = np.cumsum(has_id)
+    steps = df[STEPS_COLUMN].dropna()
+    joined = steps.groupby(incident[steps.index]).agg(" ".join)
+    df = df[has_id].copy()
+    df[STEPS_COLUMN] = joined.reindex(np.arange(1, len(df) + 1)).to_numpy()
+    return df
+
+
+def _derive_first_step(df):
+    """Fills the first debugging step of files written before it had its own column"""
+    missing = df[FIRST_STEP_COLUMN].isna() & df[STEPS_COLUMN].notna()
+    if missing.any():
+        df.loc[missing, FIRST_STEP_COLUMN] = df.loc[missing, STEPS_COLUMN].str.extract(_FIRST_STEP, expand=False)
+    return df
+
+
+def read_incidents(path, chunksize=INGEST_CHUNK_SIZE):
+    """
+    Streams the incidents of a CSV file as normalized frames of about chunksize rows. The
+    last incident of a chunk is held back until the next one, so its continuation rows
+    are merged even when they fall across a chunk boundary, and the rows read last join
+    the frame before them.
+    """
+    def finish(rows):
+        return _derive_first_step(_collapse_continuations(rows.reset_index(drop=True)))
+
+    ready = pending = None
+    for chunk in pd.read_csv(path, chunksize=chunksize, dtype=str, encoding="utf-8-sig", skip_blank_lines=True):
+        chunk = normalize_columns(chunk)
+        if pending is not None:
+            chunk = pd.concat([pending, chunk], ignore_index=True)
+        starts = np.flatnonzero(chunk[ID_COLUMN].notna().to_numpy())
+        if not len(starts):
+            # Continuation rows only, they belong to the pending incident
+            pending = chunk if pending is not None else None
+            continue
+        if ready is not None:
+            yield finish(ready)
+        ready = chunk.iloc[:starts[-1]] if starts[-1] else None
+        pending = chunk.iloc[starts[-1]:]
+    rest = [rows for rows in (ready, pending) if rows is not None]
+    if rest:
+        yield finish(pd.concat(rest, ignore_index=True))
+
+
+def _compact(df):
+    """Stores repetitive columns as categoricals, a value shared by many incidents is kept once"""
+    for column in df.columns:
+        if column != ID_COLUMN and df[column].nunique() <= len(df) // 2:
+            df[column] = df[column].astype("category")
+    return df
+
+
+def _part_suffix(parquet):
+    return ".parquet" if parquet else ".pkl"
+
+
+def _write_part(df, path, parquet):
+    if parquet:
+        df.to_parquet(path, index=False)
+    else:
+        df.to_pickle(path)
+
+
+def _read_part(path, columns=None):
+    if path.endswith(".parquet"):
+        return pd.read_parquet(path, columns=columns)
+    df = pd.read_pickle(path)
+    return df[columns] if columns is not None else df
+
+
+def read_manifest(store_dir=TRAINING_STORE_DIR):
+    """Manifest of a training store, None if there is no store in store_dir"""
+    path = os.path.join(store_dir, MANIFEST)
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def store_fingerprint(store_dir=TRAINING_STORE_DIR):
+    """SHA-256 of a store's manifest, which lists the hash of every file it was ingested from"""
+    return file_hash(os.path.join(store_dir, MANIFEST))
+
+
+def ingest(sources=TRAINING_SOURCES, store_dir=TRAINING_STORE_DIR, chunksize=INGEST_CHUNK_SIZE, force=False):
+    """
+    Streams the incident files of sources into a columnar training store in store_dir and
+    returns store_dir. Every file is read in chunks of chunksize rows and normalized to
+    INCIDENT_COLUMNS, incidents are deduplicated by Incident ID with the last file
+    winning, and the result is written as Parquet parts when pyarrow is installed and
+    pickles otherwise, with categorical columns for repeated values.
+
+    Memory is bounded by one chunk plus eight bytes per row: a first pass writes the
+    normalized chunks and collects 64-bit hashes of their incident IDs, which tell the
+    last row of every incident, and a second pass rewrites the chunks holding superseded
+    rows without them. A store ingested from the same files is reused unless force is set.
+    """
+    paths = expand_sources(sources)
+    if not paths:
+        raise FileNotFoundError(f"No incident files match {sources}")
+    hashes = [{"path": path, "sha256": file_hash(path)} for path in paths]
+    manifest = read_manifest(store_dir)
+    if not force and manifest and manifest.get("version") == STORE_VERSION and [
+        {"path": source["path"], "sha256": source["sha256"]} for source in manifest.get("sources", [])
+    ] == hashes:
+        return store_dir
+
+    parquet = _parquet_available()
+    parent = os.path.dirname(os.path.abspath(store_dir))
+    os.makedirs(parent, exist_ok=True)
+    staging = tempfile.mkdtemp(dir=parent, suffix=".tmp")
+    try:
+        # First pass: normalized chunks and their hashed incident IDs in source order
+        ids = []
+        parts = []
+        for source in hashes:
+            source["rows"] = 0
+            for chunk in read_incidents(source["path"], chunksize):
+                name = f"part-{len(parts):05d}" + _part_suffix(parquet)
+                _write_part(_compact(chunk), os.path.join(staging, name), parquet)
+                parts.append({"file": name, "rows": len(chunk)})
+                ids.append(pd.util.hash_array(chunk[ID_COLUMN].to_numpy(dtype=object)))
+                source["rows"] += len(chunk)
+
+        # Second pass: drop the rows a later row of the same incident replaced
+        latest = ~pd.Series(np.concatenate(ids)).duplicated(keep="last").to_numpy()
+        del ids
+        offset = 0
+        for part in parts:
+            keep = latest[offset:offset + part["rows"]]
+            offset += part["rows"]
+            if keep.all():
+                continue
+            path = os.path.join(staging, part["file"])
+            part["rows"] = int(keep.sum())
+            if not part["rows"]:
+                os.unlink(path)
+                continue
+            chunk = _read_part(path)[keep].reset_index(drop=True)
+            _write_part(_compact(chunk.astype(object)), path, parquet)
+        parts = [part for part in parts if part["rows"]]
+
+        manifest = {
+            "version": STORE_VERSION,
+            "columns": INCIDENT_COLUMNS,
+            "format": "parquet" if parquet else "pickle",
+            "rows": sum(part["rows"] for part in parts),
+            "parts": parts,
+            "sources": hashes,
+        }
+        with open(os.path.join(staging, MANIFEST), "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=2)
+
+        # Move the previous store aside before the new one takes its name
+        previous = None
+        if os.path.exists(store_dir):
+            previous = store_dir + f".old-{os.getpid()}"
+            os.replace(store_dir, previous)
+        os.replace(staging, store_dir)
+        if previous:
+            shutil.rmtree(previous, ignore_errors=True)
+    except BaseException:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+    return store_dir
+
+
+def iter_store(store_dir=TRAINING_STORE_DIR, columns=None):
+    """Streams the incidents of a training store part by part"""
+    manifest = read_manifest(store_dir)
+    if manifest is None:
+        raise FileNotFoundError(f"No training store in {store_dir}")
+    for part in manifest["parts"]:
+        yield _read_part(os.path.join(store_dir, part["file"]), columns)
+
+
+def read_store(store_dir=TRAINING_STORE_DIR, columns=None):
+    """All incidents of a training store in one frame"""
+    frames = list(iter_store(store_dir, columns))
+    if not frames:
+        return pd.DataFrame(columns=columns or INCIDENT_COLUMNS)
+    return pd.concat([frame.astype(object) for frame in frames], ignore_index=True)
@@ -4,46 +4,62 @@ import os
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
 #print(sys.path)
 
-import joblib
-import os
-from Platform.prediction_model.model import train_and_save_model
+from Platform.prediction_model.flow_cache import get_flow_cache
+from Platform.prediction_model.predictor import get_predictor
 from Platform.prediction_model.transform_debugging_steps import format_debugging_steps
-from Platform.prediction_model.structure_debugging_steps import format_debugging_steps_with_llm
-
+from Platform.prediction_model.structure_debugging_steps import FORMAT_ERROR, format_debugging_steps_with_llm
 
-# Get the base directory of the current script
-BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 
-# File paths
-MODEL_PATH = os.path.join(BASE_DIR, "model.pkl")
-VECTORIZER_PATH = os.path.join(BASE_DIR, "vectorizer.pkl")
+def _format_with_llm(steps):
+    formatted_steps = format_debugging_steps_with_llm(steps)
+    return None if formatted_steps == FORMAT_ERROR else formatted_steps
 
-# Check if model exists, else train it
-if not os.path.exists(MODEL_PATH) or not os.path.exists(VECTORIZER_PATH):
-    print("Model not found! Training a new model...")
-    train_and_save_model()  # Calls the train function from model.py
 
-# Load Model & Vectorizer
-model = joblib.load(MODEL_PATH)
-vectorizer = joblib.load(VECTORIZER_PATH)
+def format_predicted_steps(steps, fingerprint=None):
+    """
+    Formats predicted debugging steps through the flow cache, with the LLM on the first
+    prediction of a label and the rule-based formatter when the LLM is unavailable.
+    """
+    return get_flow_cache().get_or_format(fingerprint, steps, _format_with_llm, format_debugging_steps)
 
 
 def predict_debugging_step(incident_description):
     """
     Predicts the debugging step for a given incident description.
     """
-    # Transform the input description
-    description_tfidf = vectorizer.transform([incident_description])
-
-    # Predict the debugging step
-    prediction = model.predict(description_tfidf)
+    # Predict the debugging step, the model is loaded by the first prediction
+    predictor = get_predictor()
+    prediction = predictor.predict([incident_description])
 
-    # Format the debugging steps using the LLM
-    formatted_steps = format_debugging_steps_with_llm(prediction[0])
+    # Format the debugging steps, with the LLM only the first time this label is predicted
+    formatted_steps = format_predicted_steps(prediction[0], predictor.fingerprint)
 
     return formatted_steps  # Get the formatted predicted steps
 
 
+def predict_debugging_steps_batch(incident_descriptions):
+    """
+    Predicts the debugging steps for many incident descriptions at once. All descriptions
+    are vectorized into one sparse matrix and predicted in a single call, and each
+    distinct predicted step set is looked up in the flow cache only once.
+    """
+    incident_descriptions = list(incident_descriptions)
+    if not incident_descriptions:
+        return []
+
+    # One transform and one predict call for the whole batch
+    predictor = get_predictor()
+    predictions = predictor.predict(incident_descriptions)
+
+    # The model only knows a handful of step sets, format each of them once
+    formatted = {}
+    for prediction in predictions:
+        if prediction not in formatted:
+            formatted[prediction] = format_predicted_steps(prediction, predictor.fingerprint)
+
+    return [formatted[prediction] for prediction in predictions]
+
+
 if __name__ == "__main__":
     # Example test case
     sample_description = "Cloud backup failure"
@@ -1,13 +1,15 @@
 # Description: This file contains the code to train a simple logistic regression model and save it to disk.
-# The model is trained on the preprocessed data and saved to disk using joblib.
+# The model is trained on the preprocessed data and published to the model registry as a new version.
 from sklearn.linear_model import LogisticRegression
-import joblib
 from Platform.prediction_model.preprocess import load_and_preprocess_data
-import os
+from Platform.prediction_model.ingestion import TRAINING_SOURCES, TRAINING_STORE_DIR, ingest, read_manifest, store_fingerprint
+from Platform.prediction_model.registry import get_registry
 from sklearn.metrics import accuracy_score
 
-def train_and_save_model():   
-    X_train, X_test, y_train, y_test, vectorizer = load_and_preprocess_data("code\data\incidents-generated-data-v3.csv")
+def train_and_save_model(sources=TRAINING_SOURCES, store_dir=TRAINING_STORE_DIR, registry=None):
+    # Stream every incidents file into the deduplicated training store, reused while the files are unchanged
+    store = ingest(sources, store_dir)
+    X_train, X_test, y_train, y_test, vectorizer = load_and_preprocess_data(store)
 
     # Train a simple model
     model = LogisticRegression()
@@ -18,11 +20,16 @@ def train_and_save_model():
     accuracy = accuracy_score(y_test, y_pred)
     print(f"Model Accuracy: {accuracy:.2f}")
 
-    # Save the model and vectorizer
-    joblib.dump(model, "src/model.pkl")
-    joblib.dump(vectorizer, "src/vectorizer.pkl")
+    # Save the model and vectorizer as one bundle, predictors on the registry swap to it on their next refresh
+    registry = registry or get_registry()
+    version = registry.publish(model, vectorizer, metadata={
+        "accuracy": round(float(accuracy), 4),
+        "incidents": read_manifest(store)["rows"],
+        "training_store": store_fingerprint(store),
+    })
 
-    print("Model training completed and saved!")
+    print(f"Model training completed and saved as version {version}!")
+    return version
 
 if __name__ == "__main__":
-    train_and_save_model()
\ No newline at end of file
+    train_and_save_model()
@@ -0,0 +1,193 @@
+import hashlib
+import os
+import threading
+import time
+import joblib
+
+# Get the base directory of the current script
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Model and vectorizer files served instead of the model registry
+MODEL_PATH = os.getenv("PREDICTION_MODEL_PATH") or None
+VECTORIZER_PATH = os.getenv("PREDICTION_VECTORIZER_PATH") or None
+# Artifacts of earlier releases, imported as the first version of an empty registry
+LEGACY_MODEL_PATH = os.path.join(BASE_DIR, "model.pkl")
+LEGACY_VECTORIZER_PATH = os.path.join(BASE_DIR, "vectorizer.pkl")
+
+# joblib mmap_mode for the artifacts, e.g. "r" to share their arrays between worker processes
+PREDICTION_MMAP_MODE = os.getenv("PREDICTION_MMAP_MODE") or None
+# Seconds between checks for a newly activated registry version, 0 disables them
+PREDICTION_REFRESH_INTERVAL = float(os.getenv("PREDICTION_REFRESH_INTERVAL", "30"))
+
+
+def file_fingerprint(*paths):
+    """
+    SHA-256 over the contents of the given files, identifying one trained model.
+    """
+    digest = hashlib.sha256()
+    for path in paths:
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                digest.update(chunk)
+    return digest.hexdigest()
+
+
+class Predictor:
+    """
+    Debugging step classifier whose model and vectorizer are loaded on first use, so that
+    importing the prediction package costs nothing until a prediction is made. A missing
+    artifact is trained at that point. With mmap_mode set, the arrays of the artifacts
+    are memory-mapped instead of read into memory. fingerprint identifies the loaded
+    artifacts, so caches derived from a model can tell when it was retrained.
+
+    Without model and vectorizer paths the current version of the model registry is
+    served, and every refresh_interval seconds a prediction checks whether another
+    version was activated and swaps to it.
+
+    A retrained model replaces the loaded one with swap, predictions in flight finish
+    with the model and vectorizer pair they started with.
+    """
+
+    def __init__(self, model_path=MODEL_PATH, vectorizer_path=VECTORIZER_PATH, mmap_mode=PREDICTION_MMAP_MODE,
+                 registry=None, refresh_interval=PREDICTION_REFRESH_INTERVAL):
+        self.model_path = model_path
+        self.vectorizer_path = vectorizer_path
+        self.mmap_mode = mmap_mode
+        self._registry = registry
+        self.refresh_interval = refresh_interval
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._checked = time.monotonic()
+        self._model = None
+        self._vectorizer = None
+        self.fingerprint = None
+        self.version = None
+
+    @property
+    def registry(self):
+        """Registry served from, None when serving model and vectorizer files"""
+        if self._registry is None and self.model_path is None:
+            from Platform.prediction_model.registry import get_registry
+            self._registry = get_registry()
+        return self._registry
+
+    @property
+    def loaded(self):
+        return self._model is not None
+
+    def load(self):
+        """Loads the artifacts if they are not loaded yet, training them when missing"""
+        if self._model is None:
+            with self._lock:
+                if self._model is None:
+                    if self.registry is not None:
+                        self._ensure_published()
+                    elif not os.path.exists(self.model_path) or not os.path.exists(self.vectorizer_path):
+                        print("Model not found! Training a new model...")
+                        from Platform.prediction_model.model import train_and_save_model
+                        train_and_save_model()
+                    self._read_artifacts()
+        return self
+
+    def _ensure_published(self):
+        """Gives an empty registry its first version, from the legacy artifacts or by training"""
+        if self.registry.current_version() is not None:
+            return
+        if os.path.exists(LEGACY_MODEL_PATH) and os.path.exists(LEGACY_VECTORIZER_PATH):
+            print("Model registry is empty, importing the saved model...")
+            self.registry.publish(joblib.load(LEGACY_MODEL_PATH), joblib.load(LEGACY_VECTORIZER_PATH),
+                                  metadata={"source": "legacy artifacts"})
+        else:
+            print("Model not found! Training a new model...")
+            from Platform.prediction_model.model import train_and_save_model
+            train_and_save_model(registry=self.registry)
+
+    def _read_artifacts(self):
+        if self.registry is not None:
+            model, vectorizer, manifest = self.registry.load(mmap_mode=self.mmap_mode)
+            fingerprint, version = manifest["sha256"], manifest["version"]
+        else:
+            fingerprint, version = file_fingerprint(self.model_path, self.vectorizer_path), None
+            vectorizer = joblib.load(self.vectorizer_path, mmap_mode=self.mmap_mode)
+            model = joblib.load(self.model_path, mmap_mode=self.mmap_mode)
+        self._vectorizer, self._model, self.fingerprint, self.version = vectorizer, model, fingerprint, version
+        self._checked = time.monotonic()
+
+    def reload(self):
+        """Reads the artifacts again, after they were replaced on disk or another version was activated"""
+        with self._lock:
+            self._read_artifacts()
+        return self
+
+    def refresh(self):
+        """
+        Swaps to the current registry version if another one was activated since the
+        loaded one, returns whether it did. Loading happens outside the prediction lock,
+        predictions keep being served by the loaded version meanwhile.
+        """
+        self._checked = time.monotonic()
+        if self.registry is None or self._model is None:
+            return False
+        current = self.registry.current_version()
+        if current is None or current == self.version:
+            return False
+        model, vectorizer, manifest = self.registry.load(current, mmap_mode=self.mmap_mode)
+        self.swap(model, vectorizer, manifest["sha256"], version=current)
+        return True
+
+    def _refresh_due(self):
+        if not self.refresh_interval or time.monotonic() - self._checked < self.refresh_interval:
+            return
+        # One thread checks, the others go on predicting with the loaded version
+        if not self._refresh_lock.acquire(blocking=False):
+            return
+        try:
+            self.refresh()
+        except Exception as e:
+            print(f"Refreshing the model from {self.registry.directory} failed: {e}")
+        finally:
+            self._refresh_lock.release()
+
+    def swap(self, model, vectorizer, fingerprint, version=None):
+        """Serves an already loaded model and vectorizer from now on"""
+        with self._lock:
+            self._vectorizer, self._model, self.fingerprint, self.version = vectorizer, model, fingerprint, version
+
+    @property
+    def model(self):
+        return self.load()._model
+
+    @property
+    def vectorizer(self):
+        return self.load()._vectorizer
+
+    def predict(self, incident_descriptions):
+        """Predicted debugging steps of every description, in one transform and one predict call"""
+        self.load()._refresh_due()
+        with self._lock:
+            vectorizer, model = self._vectorizer, self._model
+        return model.predict(vectorizer.transform(list(incident_descriptions)))
+
+
+_predictor = None
+_predictor_lock = threading.Lock()
+
+
+def get_predictor():
+    """
+    Returns the shared predictor, its artifacts are loaded by the first prediction.
+    """
+    global _predictor
+    if _predictor is None:
+        with _predictor_lock:
+            if _predictor is None:
+                _predictor = Predictor()
+    return _predictor
+
+
+def set_predictor(predictor):
+    """
+    Replaces the shared predictor, pass None to rebuild the default.
+    """
+    global _predictor
+    _predictor = predictor
@@ -1,37 +1,134 @@
 import pandas as pd
 from sklearn.model_selection import train_test_split
 from sklearn.feature_extraction.text import TfidfVectorizer
+import hashlib
+import importlib.util
+import os
 import re 
+import tempfile
+from functools import lru_cache
 import nltk
 from nltk.corpus import stopwords
 from nltk.stem import WordNetLemmatizer
 
-nltk.download('stopwords') 
-nltk.download('wordnet') 
-stop_words = set(stopwords.words('english')) 
-lemmatizer = WordNetLemmatizer()
+# NLTK data shipped with the package (the English stopwords), searched after the user's NLTK data
+NLTK_DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "nltk_data")
+# Allow downloading missing NLTK corpora into the NLTK data directory, off by default so nothing needs the network
+NLTK_DOWNLOAD = os.getenv("PREDICTION_NLTK_DOWNLOAD", "false").lower() == "true"
+# Lemmatize words with the wordnet corpus, false cleans text without it, such as for tests run offline
+LEMMATIZE = os.getenv("PREDICTION_LEMMATIZE", "true").lower() != "false"
+# Runtime state of the prediction service, kept out of the source tree
+VAR_DIR = os.getenv(
+    "PREDICTION_VAR_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "..", "var", "prediction_model")
+)
+# Directory of the cleaned corpora, keyed by the hash of their CSV file, empty disables the cache
+PREPROCESS_CACHE_DIR = os.getenv("PREPROCESS_CACHE_DIR", os.path.join(VAR_DIR, "preprocess_cache"))
+# Bump when the cleaning changes, so corpora cleaned the old way are not reused
+PREPROCESS_VERSION = 1
+
+_SPECIAL_CHARACTERS = re.compile(r'[^a-zA-Z0-9 ]')
+
+
+class _IdentityLemmatizer:
+    """Stand-in used when lemmatization is turned off with PREDICTION_LEMMATIZE=false"""
+
+    def lemmatize(self, word):
+        return word
+
+
+def _find_nltk_resource(path, package):
+    if NLTK_DATA_DIR not in nltk.data.path:
+        nltk.data.path.append(NLTK_DATA_DIR)
+    try:
+        nltk.data.find(path)
+        return True
+    except LookupError:
+        return NLTK_DOWNLOAD and nltk.download(package, quiet=True)
+
+
+@lru_cache(maxsize=None)
+def get_stop_words():
+    """English stopwords, loaded on first use from the NLTK data or the bundled copy"""
+    _find_nltk_resource('corpora/stopwords', 'stopwords')
+    return frozenset(stopwords.words('english'))
+
+
+@lru_cache(maxsize=None)
+def get_lemmatizer():
+    """
+    WordNet lemmatizer, loaded on first use. A missing wordnet corpus is an error rather
+    than a silent change of the cleaned text, which would no longer match the text the
+    model was trained on, unless lemmatization is turned off with PREDICTION_LEMMATIZE.
+    """
+    if not LEMMATIZE:
+        return _IdentityLemmatizer()
+    if _find_nltk_resource('corpora/wordnet', 'wordnet'):
+        return WordNetLemmatizer()
+    raise LookupError(
+        "NLTK wordnet corpus not found, install it with 'python -m nltk.downloader wordnet', "
+        "set PREDICTION_NLTK_DOWNLOAD=true to download it on first use "
+        "or PREDICTION_LEMMATIZE=false to clean text without lemmatization"
+    )
+
+
+@lru_cache(maxsize=None)
+def lemmatize(word):
+    """Memoized lemma of a word, incident text only has a small vocabulary"""
+    return get_lemmatizer().lemmatize(word)
+
 
 def clean_text(text, remove_stopwords=True):
     if pd.isna(text):
         return ""
     text = str(text).lower()  # Convert to lowercase
-    text = re.sub(r'[^a-zA-Z0-9 ]', '', text)  # Remove special characters
+    text = _SPECIAL_CHARACTERS.sub('', text)  # Remove special characters
     words = text.split()
     
     # Keep critical words in debugging steps by skipping stopword removal
     if remove_stopwords:
-        words = [lemmatizer.lemmatize(word) for word in words if word not in stop_words]
+        stop_words = get_stop_words()
+        words = [lemmatize(word) for word in words if word not in stop_words]
     else:
-        words = [lemmatizer.lemmatize(word) for word in words]
+        words = [lemmatize(word) for word in words]
     
     return " ".join(words)
 
-def load_and_preprocess_data(filename):
-    # Load dataset
-    df = pd.read_csv(filename)
 
-    # Select relevant columns
-    df = df[['Incident Name', 'Incident Description', 'Resolution', 'First Debugging Step', 'Communication Log', 'Debugging Steps']]
+def clean_column(values, remove_stopwords=True):
+    """
+    clean_text over a whole column. Every distinct value is cleaned once with pandas
+    string operations, its words are lemmatized through a lookup table built for the
+    vocabulary of the column, and the results are mapped back onto the rows.
+    """
+    values = pd.Series(values)
+    codes, uniques = pd.factorize(values)
+    cleaned = pd.Series(uniques, dtype=object).astype(str).str.lower().str.replace(_SPECIAL_CHARACTERS, '', regex=True)
+    tokens = cleaned.str.split()
+
+    vocabulary = {word for words in tokens for word in words}
+    if remove_stopwords:
+        vocabulary -= get_stop_words()
+    lemmas = {word: lemmatize(word) for word in vocabulary}
+    cleaned = [" ".join([lemmas[word] for word in words if word in lemmas]) for words in tokens]
+
+    # Missing values are coded -1, they clean to the empty string
+    result = pd.Series(cleaned + [""], dtype=object).to_numpy()[codes]
+    return pd.Series(result, index=values.index, name=values.name)
+
+
+# Incident fields the classifier is trained on and the label it predicts
+TEXT_COLUMNS = ['Incident Name', 'Incident Description', 'Resolution', 'First Debugging Step', 'Communication Log']
+LABEL_COLUMN = 'Debugging Steps'
+
+
+def prepare_incidents(df):
+    """
+    Cleans the text fields of a frame of incidents and adds their concatenation as
+    combined_text, the input of the classifier.
+    """
+    # Select relevant columns, as plain objects since the training store keeps categoricals
+    df = df[TEXT_COLUMNS + [LABEL_COLUMN]].astype(object)
 
     # Drop any missing values
     #df.dropna(inplace=True)
@@ -42,21 +139,84 @@ def load_and_preprocess_data(filename):
     #Ensure no NaN values remain
     df.fillna('', inplace=True)
 
-    # Convert all values to strings before cleaning
-    df['Incident Name'] = df['Incident Name'].astype(str)
-    df['Incident Description'] = df['Incident Description'].astype(str)
-    df['Resolution'] = df['Resolution'].astype(str)
-    df['First Debugging Step'] = df['First Debugging Step'].astype(str)
+    # Clean text fields, no stopword removal to keep critical words in debugging steps
+    for column in ['Incident Name', 'Incident Description', 'Resolution', 'First Debugging Step']:
+        df[column] = clean_column(df[column], remove_stopwords=False)
     df['Communication Log'] = df['Communication Log'].astype(str)
 
-    # Clean text fields
-    df['Incident Name'] = df['Incident Name'].apply(lambda x: clean_text(x, remove_stopwords=False))
-    df['Incident Description'] = df['Incident Description'].apply(lambda x: clean_text(x, remove_stopwords=False))
-    df['Resolution'] = df['Resolution'].apply(lambda x: clean_text(x, remove_stopwords=False))
-    df['First Debugging Step'] = df['First Debugging Step'].apply(lambda x: clean_text(x, remove_stopwords=False))  # No stopword removal
+    # Combine text fields into a single string for each row, zipping the column arrays is
+    # about three times faster than Series.str.cat or adding the columns
+    columns = [df[column].to_numpy() for column in TEXT_COLUMNS]
+    df['combined_text'] = [' '.join(fields) for fields in zip(*columns)]
+    return df
+
+
+def _parquet_available():
+    return importlib.util.find_spec("pyarrow") is not None
+
+
+def file_hash(filename):
+    """SHA-256 of a file's contents"""
+    digest = hashlib.sha256()
+    with open(filename, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
 
-    # Combine text fields into a single string for each row
-    df['combined_text'] = df[['Incident Name', 'Incident Description', 'Resolution', 'First Debugging Step', 'Communication Log']].apply(lambda x: ' '.join(x), axis=1)
+def _prepare_source(filename):
+    """combined_text and label of a CSV file or of a training store, part by part"""
+    if os.path.isdir(filename):
+        from Platform.prediction_model.ingestion import iter_store
+        frames = [prepare_incidents(part)[['combined_text', LABEL_COLUMN]] for part in iter_store(filename)]
+        return pd.concat(frames, ignore_index=True)
+    return prepare_incidents(pd.read_csv(filename))[['combined_text', LABEL_COLUMN]].reset_index(drop=True)
+
+
+def _source_hash(filename):
+    if os.path.isdir(filename):
+        from Platform.prediction_model.ingestion import store_fingerprint
+        return store_fingerprint(filename)
+    return file_hash(filename)
+
+
+def load_prepared_incidents(filename, cache_dir=PREPROCESS_CACHE_DIR):
+    """
+    prepare_incidents of a CSV file or of a training store directory, with its
+    combined_text and label columns cached in cache_dir under the hash of the file or of
+    the store manifest. The cache is Parquet when pyarrow is installed and a pickle
+    otherwise, an edited CSV or a store ingested again gets a new hash and is cleaned again.
+    """
+    if not cache_dir:
+        return _prepare_source(filename)
+
+    parquet = _parquet_available()
+    # The lemmatizer in use changes the cleaned text, corpora cleaned without lemmatization are kept apart
+    lemmatizer = type(get_lemmatizer()).__name__
+    key = f"{_source_hash(filename)}-v{PREPROCESS_VERSION}-{lemmatizer}"
+    path = os.path.join(cache_dir, key + (".parquet" if parquet else ".pkl"))
+    if os.path.exists(path):
+        return pd.read_parquet(path) if parquet else pd.read_pickle(path)
+
+    df = _prepare_source(filename)
+    os.makedirs(cache_dir, exist_ok=True)
+    descriptor, temporary = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+    os.close(descriptor)
+    try:
+        if parquet:
+            df.to_parquet(temporary, index=False)
+        else:
+            df.to_pickle(temporary)
+        os.replace(temporary, path)
+    except BaseException:
+        if os.path.exists(temporary):
+            os.unlink(temporary)
+        raise
+    return df
+
+def load_and_preprocess_data(filename):
+    # Load the cleaned dataset, from the preprocessing cache when the CSV or store was cleaned before
+    df = load_prepared_incidents(filename)
 
     # Split data into training and test sets
     X_train, X_test, y_train, y_test = train_test_split(df['combined_text'], df['Debugging Steps'], test_size=0.2, random_state=42)
@@ -0,0 +1,290 @@
+import argparse
+import copy
+import json
+import os
+import re
+import shutil
+import tempfile
+import threading
+from datetime import datetime, timezone
+import joblib
+import numpy as np
+from Platform.prediction_model.predictor import file_fingerprint
+
+# Get the base directory of the current script
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+# Runtime state of the prediction service, kept out of the source tree
+VAR_DIR = os.getenv("PREDICTION_VAR_DIR", os.path.join(BASE_DIR, "..", "..", "..", "var", "prediction_model"))
+
+# Directory of the model versions and of the CURRENT file naming the one served
+REGISTRY_DIR = os.getenv("PREDICTION_REGISTRY_DIR", os.path.join(VAR_DIR, "registry"))
+# joblib compression level of the bundles, smaller files that load several times slower and
+# cannot be memory-mapped, 0 stores them uncompressed
+REGISTRY_COMPRESS = int(os.getenv("PREDICTION_REGISTRY_COMPRESS", "0"))
+# Floating point type of the stored coefficients, float64 keeps them as trained
+REGISTRY_DTYPE = os.getenv("PREDICTION_REGISTRY_DTYPE", "float32")
+# Coefficients with at most this share of non-zero weights are stored as a sparse matrix
+REGISTRY_SPARSE_DENSITY = float(os.getenv("PREDICTION_REGISTRY_SPARSE_DENSITY", "0.25"))
+# Versions kept on publish besides the current one, 0 keeps all of them
+REGISTRY_KEEP = int(os.getenv("PREDICTION_REGISTRY_KEEP", "5"))
+
+# Bump when the bundle layout changes
+BUNDLE_FORMAT = 1
+BUNDLE = "bundle.joblib"
+MANIFEST = "manifest.json"
+CURRENT = "CURRENT"
+
+_VERSION_DIR = re.compile(r"^v(\d{6})$")
+
+
+def _pack_model(model, dtype, sparse_density):
+    """
+    Copy of a linear model with its coefficients downcast to dtype, and sparsified when
+    few of them are non-zero, as in a hashed model most features never occur.
+    """
+    if getattr(model, "coef_", None) is None:
+        return model
+    model = copy.copy(model)
+    model.coef_ = model.coef_.astype(dtype, copy=False)
+    model.intercept_ = np.asarray(model.intercept_).astype(dtype, copy=False)
+    density = np.count_nonzero(model.coef_) / max(model.coef_.size, 1)
+    if density <= sparse_density and hasattr(model, "sparsify"):
+        model.sparsify()
+    return model
+
+
+def _unpack_model(model):
+    if hasattr(model, "densify") and getattr(model, "coef_", None) is not None:
+        model.densify()
+    return model
+
+
+def _pack_vectorizer(vectorizer):
+    """
+    Copy of a fitted vectorizer with its vocabulary replaced by the terms in index order,
+    joined into one string. A vocabulary dict pickles one entry per term, the string
+    costs one byte per character and compresses well. Hashing vectorizers have no
+    vocabulary and are stored as they are.
+    """
+    vocabulary = getattr(vectorizer, "vocabulary_", None)
+    if vocabulary is None:
+        return vectorizer, None
+    terms = [None] * len(vocabulary)
+    for term, index in vocabulary.items():
+        terms[index] = term
+    if any(not isinstance(term, str) or "\n" in term for term in terms):
+        return vectorizer, None
+    vectorizer = copy.copy(vectorizer)
+    del vectorizer.vocabulary_
+    return vectorizer, {"count": len(terms), "terms": "\n".join(terms)}
+
+
+def _unpack_vectorizer(vectorizer, vocabulary):
+    if vocabulary is not None:
+        terms = vocabulary["terms"].split("\n") if vocabulary["count"] else []
+        vectorizer.vocabulary_ = {term: index for index, term in enumerate(terms)}
+    return vectorizer
+
+
+def _atomic_write(text, path):
+    directory = os.path.dirname(os.path.abspath(path))
+    descriptor, temporary = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(descriptor, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.replace(temporary, path)
+    except BaseException:
+        if os.path.exists(temporary):
+            os.unlink(temporary)
+        raise
+
+
+class ModelRegistry:
+    """
+    Versioned store of trained debugging step classifiers. A version is one joblib bundle
+    holding the model and the vectorizer it was trained with, written once, next to a
+    manifest with the bundle's SHA-256 and the metadata of its training. The CURRENT file
+    names the version served, so activating a version, or rolling back to an earlier one,
+    is a single os.replace that predictors on the registry pick up without a restart.
+
+    Bundles are kept compact: coefficients are downcast to dtype and stored sparse when
+    mostly zero, the vocabulary is stored as one string, and with compress set the file
+    is compressed with joblib at that level.
+    """
+
+    def __init__(self, directory=REGISTRY_DIR, compress=REGISTRY_COMPRESS, dtype=REGISTRY_DTYPE,
+                 sparse_density=REGISTRY_SPARSE_DENSITY, keep=REGISTRY_KEEP):
+        self.directory = directory
+        self.compress = compress
+        self.dtype = np.dtype(dtype)
+        self.sparse_density = sparse_density
+        self.keep = keep
+        self._lock = threading.Lock()
+
+    def _version_dir(self, version):
+        return os.path.join(self.directory, f"v{version:06d}")
+
+    def versions(self):
+        """Published versions, oldest first"""
+        if not os.path.isdir(self.directory):
+            return []
+        versions = []
+        for name in os.listdir(self.directory):
+            match = _VERSION_DIR.match(name)
+            if match and os.path.exists(os.path.join(self.directory, name, MANIFEST)):
+                versions.append(int(match.group(1)))
+        return sorted(versions)
+
+    def current_version(self):
+        """Version named by the CURRENT file, None before the first publish"""
+        try:
+            with open(os.path.join(self.directory, CURRENT), encoding="utf-8") as f:
+                return int(f.read().strip())
+        except FileNotFoundError:
+            return None
+
+    def manifest(self, version=None):
+        version = self.current_version() if version is None else version
+        if version is None:
+            raise FileNotFoundError(f"No model has been published to {self.directory}")
+        path = os.path.join(self._version_dir(version), MANIFEST)
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"Model version {version} not found in {self.directory}")
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+
+    def publish(self, model, vectorizer, metadata=None, activate=True):
+        """
+        Stores a model and its vectorizer as the next version and returns the version.
+        The bundle is written to a staging directory that is renamed into place, so a
+        version directory is always complete.
+        """
+        packed_vectorizer, vocabulary = _pack_vectorizer(vectorizer)
+        bundle = {
+            "format": BUNDLE_FORMAT,
+            "model": _pack_model(model, self.dtype, self.sparse_density),
+            "vectorizer": packed_vectorizer,
+            "vocabulary": vocabulary,
+        }
+        os.makedirs(self.directory, exist_ok=True)
+        staging = tempfile.mkdtemp(dir=self.directory, suffix=".tmp")
+        try:
+            joblib.dump(bundle, os.path.join(staging, BUNDLE), compress=self.compress)
+            with self._lock:
+                version = self._claim(staging, model, vectorizer, metadata)
+        except BaseException:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+
+        if activate:
+            self.activate(version)
+        self.prune()
+        return version
+
+    def _claim(self, staging, model, vectorizer, metadata):
+        """
+        Renames the staging directory to the next free version. Renaming onto a version
+        another process has just published fails, the next number is tried then.
+        """
+        while True:
+            version = (self.versions() or [0])[-1] + 1
+            manifest = {
+                "version": version,
+                "format": BUNDLE_FORMAT,
+                "sha256": file_fingerprint(os.path.join(staging, BUNDLE)),
+                "created": datetime.now(timezone.utc).isoformat(),
+                "model": type(model).__name__,
+                "vectorizer": type(vectorizer).__name__,
+                "classes": len(getattr(model, "classes_", [])),
+                "dtype": self.dtype.name,
+                "compress": self.compress,
+                "size": os.path.getsize(os.path.join(staging, BUNDLE)),
+                "metadata": metadata or {},
+            }
+            with open(os.path.join(staging, MANIFEST), "w", encoding="utf-8") as f:
+                json.dump(manifest, f, indent=2)
+            try:
+                os.rename(staging, self._version_dir(version))
+                return version
+            except OSError:
+                if not os.path.exists(self._version_dir(version)):
+                    raise
+
+    def activate(self, version):
+        """Serves version from now on, predictors on this registry swap to it on their next refresh"""
+        self.manifest(version)
+        _atomic_write(f"{version}\n", os.path.join(self.directory, CURRENT))
+
+    def load(self, version=None, mmap_mode=None):
+        """
+        Model, vectorizer and manifest of version, the current one by default. The bundle
+        is checked against the SHA-256 of its manifest before it is unpickled. mmap_mode
+        only applies to bundles stored uncompressed.
+        """
+        manifest = self.manifest(version)
+        path = os.path.join(self._version_dir(manifest["version"]), BUNDLE)
+        if file_fingerprint(path) != manifest["sha256"]:
+            raise ValueError(f"Model version {manifest['version']} does not match its checksum")
+        bundle = joblib.load(path, mmap_mode=mmap_mode if not manifest["compress"] else None)
+        if bundle.get("format") != BUNDLE_FORMAT:
+            raise ValueError(f"Model version {manifest['version']} has unsupported bundle format {bundle.get('format')}")
+        model = _unpack_model(bundle["model"])
+        vectorizer = _unpack_vectorizer(bundle["vectorizer"], bundle["vocabulary"])
+        return model, vectorizer, manifest
+
+    def prune(self):
+        """Removes the oldest versions beyond keep, never the current one"""
+        if self.keep <= 0:
+            return []
+        current = self.current_version()
+        removable = [version for version in self.versions() if version != current]
+        removed = removable[:max(len(removable) - self.keep, 0)]
+        for version in removed:
+            shutil.rmtree(self._version_dir(version), ignore_errors=True)
+        return removed
+
+
+_registry = None
+_registry_lock = threading.Lock()
+
+
+def get_registry():
+    """
+    Returns the shared model registry in REGISTRY_DIR.
+    """
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = ModelRegistry()
+    return _registry
+
+
+def set_registry(registry):
+    """
+    Replaces the shared model registry, pass None to rebuild the default.
+    """
+    global _registry
+    _registry = registry
+
+
+def main():
+    parser = argparse.ArgumentParser(description="List the model versions or change the one served")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    subparsers.add_parser("list", help="Published versions, * marks the current one")
+    activate = subparsers.add_parser("activate", help="Serve another version, e.g. to roll back")
+    activate.add_argument("version", type=int)
+    args = parser.parse_args()
+
+    registry = get_registry()
+    if args.command == "activate":
+        registry.activate(args.version)
+    current = registry.current_version()
+    for version in registry.versions():
+        manifest = registry.manifest(version)
+        print(f"{'*' if version == current else ' '} {version:4d}  {manifest['created']}  {manifest['model']}  "
+              f"{manifest['size'] / 2 ** 20:.1f} MiB  {json.dumps(manifest['metadata'])}")
+
+
+if __name__ == "__main__":
+    main()
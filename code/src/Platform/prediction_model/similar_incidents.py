@@ -0,0 +1,215 @@
+import glob
+import os
+import threading
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+from sklearn.feature_extraction.text import HashingVectorizer
+
+# Get the base directory of the current script
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Historical incident files indexed on first use
+SIMILAR_INCIDENTS_FILES = os.getenv(
+    "SIMILAR_INCIDENTS_FILES", os.path.join(BASE_DIR, "..", "..", "..", "data", "incidents-generated-data*.csv")
+)
+# Width of the hashed term space
+SIMILAR_INCIDENTS_FEATURES = int(os.getenv("SIMILAR_INCIDENTS_FEATURES", str(2 ** 18)))
+
+# Fields returned for every match, by CSV column
+RESULT_COLUMNS = {
+    "incident_id": "Incident ID",
+    "name": "Incident Name",
+    "description": "Incident Description",
+    "debugging_steps": "Debugging Steps",
+    "resolution": "Resolution",
+}
+# Fields the similarity is computed on
+SEARCH_COLUMNS = ["Incident Name", "Incident Description"]
+
+
+def _text(value):
+    return "" if value is None or (isinstance(value, float) and np.isnan(value)) else str(value)
+
+
+class SimilarIncidentIndex:
+    """
+    Nearest neighbour search over historical incidents with TF-IDF cosine similarity.
+    Terms are hashed, so incidents can be added at any time without refitting a
+    vocabulary: the index keeps sublinear term frequencies in a sparse matrix and the
+    document frequency of every term, and after an update recomputes the idf weights
+    and the row norms in one pass over the matrix. A query is then a sparse product
+    over the columns of its terms followed by an argpartition for the top k.
+
+    An incident added again under the same Incident ID replaces the earlier version.
+    """
+
+    def __init__(self, n_features=SIMILAR_INCIDENTS_FEATURES):
+        self.vectorizer = HashingVectorizer(n_features=n_features, alternate_sign=False, norm=None,
+                                            stop_words="english")
+        self._lock = threading.Lock()
+        self._matrix = sp.csr_matrix((0, n_features))
+        self._document_frequency = np.zeros(n_features, dtype=np.int64)
+        self._alive = np.zeros(0, dtype=bool)
+        self._records = []
+        self._positions = {}
+        self._snapshot = None
+
+    def __len__(self):
+        with self._lock:
+            return int(self._alive.sum())
+
+    def _terms(self, texts):
+        terms = self.vectorizer.transform(texts).tocsr()
+        terms.sum_duplicates()
+        terms.data = 1.0 + np.log(terms.data)
+        return terms
+
+    def add(self, incidents):
+        """
+        Indexes a list of incident dicts keyed by the CSV column names, returns the
+        number of incidents added.
+        """
+        batch = {}
+        for number, incident in enumerate(incidents):
+            text = " ".join(_text(incident.get(column)) for column in SEARCH_COLUMNS).strip()
+            if not text:
+                continue
+            record = {key: _text(incident.get(column)) or None for key, column in RESULT_COLUMNS.items()}
+            # Within one batch the last version of an incident wins
+            batch[record["incident_id"] or ("", number)] = (record, text)
+        if not batch:
+            return 0
+
+        records = [record for record, _ in batch.values()]
+        terms = self._terms([text for _, text in batch.values()])
+        with self._lock:
+            start = len(self._records)
+            for offset, record in enumerate(records):
+                incident_id = record["incident_id"]
+                if incident_id:
+                    previous = self._positions.get(incident_id)
+                    if previous is not None and self._alive[previous]:
+                        self._alive[previous] = False
+                        row = self._matrix.indices[self._matrix.indptr[previous]:self._matrix.indptr[previous + 1]]
+                        self._document_frequency[row] -= 1
+                    self._positions[incident_id] = start + offset
+
+            self._matrix = sp.vstack([self._matrix, terms], format="csr")
+            self._document_frequency += np.bincount(terms.indices, minlength=len(self._document_frequency))
+            self._alive = np.concatenate([self._alive, np.ones(len(records), dtype=bool)])
+            self._records.extend(records)
+            self._snapshot = None
+        return len(records)
+
+    def add_csv(self, path):
+        """Indexes the incidents of a CSV file, rows without an incident text are skipped"""
+        # The first incidents files named the steps column in the singular
+        df = pd.read_csv(path).rename(columns={"Debugging Step": "Debugging Steps"})
+        df = df.reindex(columns=list(RESULT_COLUMNS.values()))
+        return self.add(df.to_dict("records"))
+
+    def _prepare(self):
+        """
+        Incident vectors weighted by idf and divided by their norms, computed once per
+        update and stored by column, so a query only reads the columns of its own terms.
+        """
+        with self._lock:
+            if self._snapshot is None:
+                documents = int(self._alive.sum())
+                idf = np.log((1 + documents) / (1 + self._document_frequency)) + 1
+                weighted = self._matrix @ sp.diags(idf)
+                norms = np.sqrt(np.asarray(weighted.multiply(weighted).sum(axis=1)).ravel())
+                scale = np.divide(1.0, norms, out=np.zeros_like(norms), where=norms > 0) * self._alive
+                normalized = (sp.diags(scale) @ weighted).tocsc()
+                self._snapshot = (normalized, idf, self._records)
+            return self._snapshot
+
+    def query(self, text, k=5):
+        """
+        Returns up to k incidents most similar to text, best first, each with its
+        cosine similarity as score. Incidents sharing no term with text are left out.
+        """
+        normalized, idf, records = self._prepare()
+        if not normalized.shape[0] or k <= 0:
+            return []
+
+        terms = self._terms([str(text)])
+        weights = terms.data * idf[terms.indices]
+        norm = np.sqrt(weights @ weights)
+        if norm == 0:
+            return []
+
+        scores = normalized[:, terms.indices] @ (weights / norm)
+        k = min(k, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return [dict(records[i], score=round(float(scores[i]), 4)) for i in top if scores[i] > 0]
+
+
+def load_index(pattern=SIMILAR_INCIDENTS_FILES):
+    """Builds an index over every incidents CSV file matching pattern, in name order"""
+    index = SimilarIncidentIndex()
+    for path in sorted(glob.glob(pattern)):
+        index.add_csv(path)
+    return index
+
+
+_index = None
+_index_lock = threading.Lock()
+# Incidents added before the shared index was built, indexed as soon as it is
+_pending = []
+_pending_lock = threading.Lock()
+
+
+def get_similar_incidents():
+    """
+    Returns the shared index, built from SIMILAR_INCIDENTS_FILES on first use.
+    """
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                index = load_index()
+                with _pending_lock:
+                    if _pending:
+                        index.add(_pending)
+                        _pending.clear()
+                    _index = index
+    return _index
+
+
+def set_similar_incidents(index):
+    """
+    Replaces the shared index, pass None to rebuild it from SIMILAR_INCIDENTS_FILES.
+    """
+    global _index
+    _index = index
+
+
+def add_similar_incidents(incidents):
+    """
+    Adds resolved incidents to the shared index without building it, so a request
+    never waits for the incident files to be indexed. Incidents added before the index
+    exists are indexed when it is built. Returns the number of incidents indexed now.
+    """
+    incidents = list(incidents)
+    with _pending_lock:
+        index = _index
+        if index is None:
+            _pending.extend(incidents)
+            return 0
+    return index.add(incidents)
+
+
+def warm_similar_incidents():
+    """Builds the shared index on a daemon thread, so the first search does not pay for it"""
+    def build():
+        try:
+            get_similar_incidents()
+        except Exception as e:
+            print(f"Building the similar incidents index from {SIMILAR_INCIDENTS_FILES} failed: {e}")
+
+    thread = threading.Thread(target=build, name="similar-incidents-index", daemon=True)
+    thread.start()
+    return thread
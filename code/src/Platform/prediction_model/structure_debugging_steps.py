@@ -1,15 +1,36 @@
-from dotenv import load_dotenv
 import os
-import google.generativeai as genai
+import threading
+from dotenv import load_dotenv
+
+# Returned instead of a flow when the Gemini call fails
+FORMAT_ERROR = "Error: Unable to format debugging steps."
 
-# Load environment variables from .env file
-load_dotenv()
+_configure_lock = threading.Lock()
+_api_key = None
 
-# Retrieve the API key from the environment variable
-API_KEY = os.getenv("GEMINI_API_KEY")
 
-if not API_KEY:
-    raise ValueError("API key not found. Please set the GEMINI_API_KEY environment variable.")    
+def _configure_gemini():
+    """
+    Loads the .env file and configures the Gemini client once, on the first formatting
+    call rather than at import, and returns the client module.
+    """
+    global _api_key
+    import google.generativeai as genai
+
+    if _api_key is None:
+        with _configure_lock:
+            if _api_key is None:
+                # Load environment variables from .env file
+                load_dotenv()
+
+                # Retrieve the API key from the environment variable
+                api_key = os.getenv("GEMINI_API_KEY")
+                if not api_key:
+                    raise ValueError("API key not found. Please set the GEMINI_API_KEY environment variable.")
+                genai.configure(api_key=api_key)
+                _api_key = api_key
+    return genai
+
 
 def format_debugging_steps_with_llm(steps):
     """
@@ -38,9 +59,9 @@ def format_debugging_steps_with_llm(steps):
 
     """
 
+    genai = _configure_gemini()
+
     try:
-        # Configure the Gemini API
-        genai.configure(api_key=API_KEY)
         model = genai.GenerativeModel('gemini-2.0-flash') #changed model name
         response = model.generate_content(prompt) #changed how the response is generated
         # Extract and return the formatted steps
@@ -49,7 +70,7 @@ def format_debugging_steps_with_llm(steps):
 
     except Exception as e:
         print(f"Error while formatting debugging steps with Gemini: {e}")
-        return "Error: Unable to format debugging steps."
+        return FORMAT_ERROR
 
 # Example usage
 if __name__ == "__main__":
@@ -0,0 +1,128 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+from Platform.Agents.Decision import response_cache
+from Platform.Agents.Decision.response_cache import ResponseCache, make_key, normalize_history
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestResponseCache(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.tmp_dir.name, "decisions.sqlite")
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_normalized_history_shares_key(self):
+        """
+        Histories differing only in case, whitespace or key order should share a key.
+        """
+        first = [{"agent": "error_count", "output": {"health": "red", "score": 50}}]
+        second = [{"output": {"score": 50, "health": "RED "}, "agent": "error_count"}]
+
+        self.assertEqual(
+            make_key("execute_operation", "gpt-4o-mini", "Operation : {operation}", operation="op", history=normalize_history(first)),
+            make_key("execute_operation", "gpt-4o-mini", "Operation : {operation}", operation="op", history=normalize_history(second))
+        )
+
+    def test_prompt_template_is_part_of_the_key(self):
+        """
+        The same inputs under a changed prompt template should not share a key.
+        """
+        self.assertNotEqual(
+            make_key("execute_operation", "gpt-4o-mini", "First : {operation}", operation="op"),
+            make_key("execute_operation", "gpt-4o-mini", "Second : {operation}", operation="op")
+        )
+
+    def test_age_of_readings_is_not_part_of_the_key(self):
+        """
+        A history of reused readings should share the key of the same readings measured fresh.
+        """
+        fresh = [{"agent": "queue_load", "output": {"health": "green", "score": 20}}]
+        reused = [{"agent": "queue_load", "output": {"health": "green", "score": 20, "age_seconds": 4.2}}]
+
+        self.assertEqual(normalize_history(fresh), normalize_history(reused))
+
+    def test_shared_cache_is_built_on_first_use(self):
+        """
+        The shared cache should only open its SQLite file when a decision node first asks for it.
+        """
+        self.addCleanup(response_cache.reset_decision_cache)
+        with patch.object(response_cache, "CACHE_PATH", self.db_path):
+            response_cache.reset_decision_cache()
+            self.assertFalse(os.path.exists(self.db_path))
+
+            cache = response_cache.get_decision_cache()
+            self.assertIs(response_cache.get_decision_cache(), cache)
+            self.assertTrue(os.path.exists(self.db_path))
+            cache.close()
+
+        response_cache.set_decision_cache(None)
+        self.assertIsNone(response_cache.get_decision_cache())
+
+    def test_lru_eviction_and_hit_rate(self):
+        """
+        The memory tier should evict the least recently used entry and count hits.
+        """
+        cache = ResponseCache(max_entries=2, clock=self.clock)
+        cache.set("a", "check the logs")
+        cache.set("b", "check the queue")
+        cache.get("a")
+        cache.set("c", "completed")
+
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("a"), "check the logs")
+        self.assertEqual(cache.stats()["evictions"], 1)
+        self.assertAlmostEqual(cache.stats()["hit_rate"], 2 / 3)
+
+    def test_ttl_expiry(self):
+        """
+        Entries older than the ttl should not be served.
+        """
+        cache = ResponseCache(ttl=10, clock=self.clock)
+        cache.set("a", "completed")
+
+        self.clock.now += 11
+
+        self.assertIsNone(cache.get("a"))
+
+    def test_sqlite_tier_survives_restart(self):
+        """
+        Entries written to the SQLite tier should be served by a new cache instance.
+        """
+        cache = ResponseCache(sqlite_path=self.db_path, clock=self.clock)
+        cache.set("a", "check the logs")
+        cache.close()
+
+        restarted = ResponseCache(sqlite_path=self.db_path, clock=self.clock)
+
+        self.assertEqual(restarted.get("a"), "check the logs")
+        self.assertEqual(restarted.stats()["disk_hits"], 1)
+        restarted.close()
+
+    def test_sqlite_tier_is_size_bounded(self):
+        """
+        The SQLite tier should keep at most max_disk_entries rows.
+        """
+        cache = ResponseCache(max_entries=1, sqlite_path=self.db_path, max_disk_entries=2, clock=self.clock)
+        for key in ("a", "b", "c"):
+            self.clock.now += 1
+            cache.set(key, key)
+
+        self.assertIsNone(cache.get("a"))
+        self.assertEqual(cache.get("b"), "b")
+        cache.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
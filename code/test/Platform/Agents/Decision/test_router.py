@@ -0,0 +1,83 @@
+import unittest
+from unittest.mock import patch, MagicMock
+from Platform.Agents.Decision.router import AgentRouter, RouterStats, tokenize
+from Platform.Agents.Decision.decisions import execute_agent
+
+
+class TestAgentRouter(unittest.TestCase):
+    def setUp(self):
+        self.router = AgentRouter()
+
+    def test_tokenize(self):
+        """
+        Agent names should split on underscores and stop words should be dropped.
+        """
+        self.assertEqual(tokenize("Check the queue_load"), ["queue", "load"])
+
+    def test_routes_obvious_actions(self):
+        """
+        Clear actions from the downtime runbook should be routed without the LLM.
+        """
+        cases = {
+            "check the queue load": "queue_load",
+            "check the queue response time": "queue_response_time",
+            "check the application log to see if there are any errors": "error_count",
+            "check for the most common error in the logs": "frequent_error",
+            "check if too many connections are made to the database": "database_connections",
+        }
+        for action, agent in cases.items():
+            with self.subTest(action=action):
+                self.assertEqual(self.router.route(action).agent, agent)
+
+    def test_ambiguous_actions_fall_back(self):
+        """
+        Actions that match several agents equally should be left to the LLM.
+        """
+        self.assertIsNone(self.router.route("check the queue health"))
+        self.assertIsNone(self.router.route("summarize the analysis"))
+
+    def test_stats(self):
+        """
+        The hit rate and saved latency should follow the recorded calls.
+        """
+        stats = RouterStats()
+        stats.record_llm_call(0.5)
+        stats.record_miss()
+        stats.record_hit()
+        stats.record_hit()
+        stats.record_hit()
+
+        snapshot = stats.snapshot()
+
+        self.assertEqual(snapshot["hit_rate"], 0.75)
+        self.assertAlmostEqual(snapshot["latency_saved_seconds"], 1.5)
+
+
+class TestExecuteAgentRouting(unittest.TestCase):
+    @patch("Platform.Agents.Decision.decisions.get_chain")
+    def test_fast_path_skips_llm(self, mock_get_chain):
+        """
+        execute_agent should not call the LLM when the router is confident.
+        """
+        result = execute_agent({"input": "check the queue load", "history": []})
+
+        mock_get_chain.assert_not_called()
+        self.assertEqual(result["action"], "queue_load")
+        self.assertEqual(result["fast_path_hits"], 1)
+
+    @patch("Platform.Agents.Decision.decisions.get_chain")
+    def test_ambiguous_uses_llm(self, mock_get_chain):
+        """
+        execute_agent should ask the LLM when the router is not confident.
+        """
+        mock_get_chain.return_value.invoke.return_value = MagicMock(content="queue_load")
+
+        result = execute_agent({"input": "check the queue health", "history": []})
+
+        mock_get_chain.return_value.invoke.assert_called_once()
+        self.assertEqual(result["action"], "queue_load")
+        self.assertEqual(result["fast_path_hits"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,177 @@
+import json
+import os
+import sys
+import tempfile
+import unittest
+# Local stand-ins for external services, shared with the benchmarks
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "..", "support")))
+from Platform.Agents.Measure.collectors import (
+    Collector,
+    CollectorRegistry,
+    HttpQueueCollector,
+    SqlAlchemyCollector,
+    load_collectors,
+    set_collectors
+)
+from Platform.Agents.Measure.credentials_check import credentials_check
+from Platform.Agents.Measure.database_measurements import database_connections, database_ping
+from Platform.Agents.Measure.queue_measurements import queue_load, queue_response_time
+from fake_queue_server import FakeQueueServer
+
+
+class TestCollectors(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.database_url = f"sqlite:///{os.path.join(self.tmp_dir.name, 'app.sqlite')}"
+        self.server = FakeQueueServer({"orders": {"messages": 42, "message_stats": {"ack_latency_ms": 120}}}).start()
+
+    def tearDown(self):
+        set_collectors(None)
+        self.server.stop()
+        self.tmp_dir.cleanup()
+
+    def test_database_collector_reuses_one_pooled_engine(self):
+        """
+        Repeated measurements of a database should go through one engine and its pool.
+        """
+        collector = SqlAlchemyCollector(pool_size=2)
+        try:
+            pings = [collector.collect("database_ping", self.database_url) for _ in range(5)]
+            connections = collector.collect("database_connections", self.database_url)
+
+            self.assertTrue(all(isinstance(ping, float) for ping in pings))
+            self.assertEqual(connections, 0)
+            self.assertIs(collector.engine(self.database_url), collector.engine(self.database_url))
+            self.assertEqual(len(collector._engines), 1)
+            self.assertEqual(collector.engine(self.database_url).pool.checkedin(), 1)
+        finally:
+            collector.close()
+
+    def test_unreachable_database_pings_as_none(self):
+        """
+        A database that cannot be reached should be reported as a failed ping.
+        """
+        collector = SqlAlchemyCollector()
+        try:
+            self.assertIsNone(collector.collect("database_ping", "sqlite:////nonexistent/dir/app.sqlite"))
+        finally:
+            collector.close()
+
+    def test_queue_collector_keeps_the_connection_alive(self):
+        """
+        Queue statistics should be read from the configured fields over one kept-alive connection.
+        """
+        collector = HttpQueueCollector(fields={"queue_response_time": "message_stats.ack_latency_ms"})
+        try:
+            url = self.server.queue_url("orders")
+            loads = [collector.collect("queue_load", url) for _ in range(5)]
+
+            self.assertEqual(loads, [42] * 5)
+            self.assertEqual(collector.collect("queue_response_time", url), 120)
+            self.assertEqual(self.server.requests, 6)
+            self.assertEqual(self.server.connections, 1)
+        finally:
+            collector.close()
+
+    def test_agents_read_from_the_configured_collectors(self):
+        """
+        Agents should measure through the collectors of the file and fall back to the simulator.
+        """
+        config_path = os.path.join(self.tmp_dir.name, "collectors.json")
+        with open(config_path, "w") as f:
+            json.dump({"collectors": [
+                {"type": "sqlalchemy", "targets": {"default": self.database_url}},
+                {"type": "http_queue", "targets": {"checkout": self.server.queue_url("orders")},
+                 "metrics": ["queue_load"]}
+            ]}, f)
+        registry = load_collectors(config_path)
+        set_collectors(registry)
+        state = {"app_name": "checkout"}
+
+        try:
+            self.assertEqual(database_ping(state)["history"][0]["output"], {"database ping": "Success"})
+            self.assertEqual(database_connections(state)["history"][0]["output"]["no_of_connections"], 0)
+            self.assertEqual(queue_load(state)["history"][0]["output"], {"health": "green", "score": 42})
+            self.assertFalse(registry.serves("queue_response_time"))
+            self.assertIn("score", queue_response_time(state)["history"][0]["output"])
+            with self.assertRaises(KeyError):
+                registry.collect("queue_load", "billing")
+        finally:
+            registry.close()
+
+    def test_failing_collectors_read_as_unavailable(self):
+        """
+        Collector errors and missing targets should be reported as red readings instead of failing the agent.
+        """
+        registry = CollectorRegistry()
+        registry.register(HttpQueueCollector(fields={"queue_response_time": "missing.field"}),
+                          {"checkout": self.server.queue_url("orders"), "billing": self.server.queue_url("unknown")})
+        registry.register(SqlAlchemyCollector(connections_query="SELECT * FROM missing_table"),
+                          {"default": self.database_url})
+        set_collectors(registry)
+
+        try:
+            self.assertEqual(queue_load({"app_name": "billing"})["history"][0]["output"], {"health": "red", "score": None})
+            self.assertEqual(queue_response_time({"app_name": "checkout"})["history"][0]["output"]["health"], "red")
+            self.assertEqual(queue_load({"app_name": "payments"})["history"][0]["output"]["health"], "red")
+            self.assertEqual(database_connections({})["history"][0]["output"],
+                             {"health": "red", "no_of_connections": None})
+            self.assertEqual(queue_load({"app_name": "checkout"})["history"][0]["output"]["score"], 42)
+        finally:
+            registry.close()
+
+    def test_failing_credentials_collector_reads_as_unavailable(self):
+        """
+        A credentials collector that fails or has no target should be reported as a red reading.
+        """
+        class FailingCredentials(Collector):
+            metrics = ("credentials_check",)
+
+            def collect(self, metric, target):
+                raise ConnectionError("vault unreachable")
+
+        registry = CollectorRegistry()
+        registry.register(FailingCredentials(), {"checkout": "https://vault.local"})
+        set_collectors(registry)
+
+        try:
+            self.assertEqual(credentials_check({"app_name": "checkout"})["history"][0]["output"],
+                             {"health": "red", "score": None})
+            self.assertEqual(credentials_check({"app_name": "payments"})["history"][0]["output"]["health"], "red")
+        finally:
+            registry.close()
+
+    def test_readings_are_graded_in_the_units_of_their_collector(self):
+        """
+        Collected readings should be graded by the thresholds of the collectors file, per app, or of their collector.
+        """
+        self.server.queues["backlog"] = {"messages": 900}
+        registry = CollectorRegistry()
+        registry.register(HttpQueueCollector(), {"checkout": self.server.queue_url("orders"),
+                                                 "default": self.server.queue_url("backlog")},
+                          thresholds={"queue_load": {"checkout": [10, 40]}})
+        registry.register(SqlAlchemyCollector(pool_size=2, max_overflow=1), {"default": self.database_url})
+        set_collectors(registry)
+
+        try:
+            self.assertEqual(queue_load({"app_name": "checkout"})["history"][0]["output"]["health"], "red")
+            self.assertEqual(queue_load({"app_name": "billing"})["history"][0]["output"], {"health": "green", "score": 900})
+            self.assertEqual(registry.thresholds("queue_response_time", "billing"), (100, 500))
+            self.assertEqual(registry.thresholds("database_connections"), (2, 3))
+            self.assertEqual(registry.thresholds("database_ping"), 50)
+        finally:
+            registry.close()
+
+    def test_collectors_must_implement_collect(self):
+        """
+        A collector plugin without a collect method should not be instantiable.
+        """
+        class Incomplete(Collector):
+            metrics = ("queue_load",)
+
+        with self.assertRaises(TypeError):
+            Incomplete()
+
+
+if __name__ == '__main__':
+    unittest.main()
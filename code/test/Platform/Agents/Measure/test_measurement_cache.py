@@ -0,0 +1,93 @@
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from Platform.Agents.Measure.log_measurements import frequent_error
+from Platform.Agents.Measure.measurement_cache import MeasurementCache, set_measurement_cache
+from Platform.Agents.Measure.queue_measurements import queue_load
+from Platform.Agents.Measure.simulation import FleetSimulator, set_simulator
+
+
+class TestMeasurementCache(unittest.TestCase):
+    def tearDown(self):
+        set_measurement_cache(MeasurementCache())
+        set_simulator(None)
+
+    def test_concurrent_requests_share_one_measurement(self):
+        """
+        Identical measurements requested at the same time should hit the backend once.
+        """
+        cache = MeasurementCache(ttl=60)
+        calls = []
+        release = threading.Event()
+
+        def slow_measure():
+            calls.append(1)
+            release.wait(5)
+            return 42
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            futures = [pool.submit(cache.get_or_measure, ("queue_load", "orders"), slow_measure) for _ in range(8)]
+            while cache.stats()["coalesced"] < 7:
+                time.sleep(0.01)
+            release.set()
+            results = [future.result() for future in futures]
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual([value for value, _ in results], [42] * 8)
+        self.assertEqual(sum(age is None for _, age in results), 1)
+        self.assertEqual(cache.stats(), {"hits": 0, "misses": 1, "coalesced": 7, "entries": 1})
+
+    def test_entries_expire_and_failures_are_not_cached(self):
+        """
+        A cached value should be reused with its age until the ttl passes, errors should be retried.
+        """
+        now = [100.0]
+        cache = MeasurementCache(ttl=10, clock=lambda: now[0])
+        values = iter([1, 2])
+
+        self.assertEqual(cache.get_or_measure("key", lambda: next(values)), (1, None))
+        now[0] += 4
+        self.assertEqual(cache.get_or_measure("key", lambda: next(values)), (1, 4.0))
+        now[0] += 6
+        self.assertEqual(cache.get_or_measure("key", lambda: next(values)), (2, None))
+
+        def failing():
+            raise ConnectionError("backend down")
+        with self.assertRaises(ConnectionError):
+            cache.get_or_measure("other", failing)
+        self.assertEqual(cache.get_or_measure("other", lambda: 3), (3, None))
+
+    def test_agents_report_the_age_of_reused_readings(self):
+        """
+        A reading reused from the cache should carry its age in the agent history entry.
+        """
+        now = [0.0]
+        set_measurement_cache(MeasurementCache(ttl=30, clock=lambda: now[0]))
+        set_simulator(FleetSimulator(n_apps=4, seed=5))
+        state = {"app_name": "app-2"}
+
+        first = queue_load(state)["history"][0]["output"]
+        now[0] += 12.34
+        second = queue_load(state)["history"][0]["output"]
+
+        self.assertNotIn("age_seconds", first)
+        self.assertEqual(second, dict(first, age_seconds=12.3))
+
+    def test_simulators_with_the_same_settings_share_readings(self):
+        """
+        Readings should be keyed by the simulator's settings, so a rebuilt simulator never reads another's entries.
+        """
+        set_measurement_cache(MeasurementCache(ttl=30, clock=lambda: 0.0))
+        state = {"app_name": "app-1"}
+        set_simulator(FleetSimulator(n_apps=4, seed=11))
+        first = frequent_error(state)["history"][0]["output"]
+
+        set_simulator(FleetSimulator(n_apps=4, seed=11))
+        self.assertEqual(frequent_error(state)["history"][0]["output"], dict(first, age_seconds=0.0))
+        set_simulator(FleetSimulator(n_apps=4, seed=12))
+        self.assertNotIn("age_seconds", frequent_error(state)["history"][0]["output"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+import unittest
+from Platform.Agents.Measure import simulation
+from Platform.Agents.Measure.simulation import FleetSimulator, set_simulator
+from Platform.Agents.Measure.database_measurements import database_ping
+from Platform.Agents.Measure.log_measurements import error_count, frequent_error
+from Platform.Agents.Measure.queue_measurements import queue_load
+
+
+class TestFleetSimulator(unittest.TestCase):
+    def tearDown(self):
+        set_simulator(None)
+
+    def test_same_seed_replays_the_same_readings(self):
+        """
+        Two simulators with the same seed should give every app the same sequence,
+        whatever order the apps are read in.
+        """
+        first = FleetSimulator(n_apps=100, seed=42)
+        second = FleetSimulator(n_apps=100, seed=42)
+
+        forward = [first.read("queue_load", f"app-{app}")[0] for app in range(100)]
+        backward = [second.read("queue_load", f"app-{app}")[0] for app in reversed(range(100))]
+
+        self.assertEqual(forward, list(reversed(backward)))
+        self.assertNotEqual(forward, [FleetSimulator(n_apps=100, seed=43).read("queue_load", f"app-{app}")[0]
+                                      for app in range(100)])
+
+    def test_readings_follow_the_configured_grid(self):
+        """
+        Uniform readings should stay on the randrange grid and other distributions be clipped to it.
+        """
+        simulator = FleetSimulator(n_apps=1000, seed=1, metrics={
+            "queue_response_time": {"distribution": "normal", "mean": 400, "std": 500, "low": 50, "high": 1000, "step": 10}
+        })
+
+        snapshot, incidents = simulator.tick(0)
+
+        self.assertEqual(len(snapshot["queue_load"]), 1000)
+        self.assertTrue(set(snapshot["queue_load"].tolist()) <= set(range(20, 99, 3)))
+        self.assertTrue(set(snapshot["queue_response_time"].tolist()) <= set(range(50, 1000, 10)))
+        self.assertTrue(all(incident is None for incident in incidents))
+
+    def test_incidents_drive_the_agents(self):
+        """
+        An injected incident should make the agents report the affected system as failing.
+        """
+        simulator = FleetSimulator(n_apps=10, seed=3)
+        simulator.inject("app-4", "database_outage", duration=1)
+        set_simulator(simulator)
+        state = {"app_name": "app-4"}
+
+        self.assertEqual(database_ping(state)["history"][0]["output"], {"database ping": "Failed"})
+        self.assertEqual(error_count(state)["history"][0]["output"]["health"], "red")
+        self.assertEqual(frequent_error(state)["history"][0]["output"]["error"], "Unable to connect to the database")
+        self.assertIn(queue_load(state)["history"][0]["output"]["health"], ("green", "yellow", "red"))
+
+    def test_random_incidents_are_injected_at_the_configured_rate(self):
+        """
+        The incident rate should mark about that share of the fleet readings.
+        """
+        simulator = FleetSimulator(n_apps=5000, seed=9, incident_rate=0.1)
+
+        _, incidents = simulator.tick(0)
+
+        share = sum(incident is not None for incident in incidents) / len(incidents)
+        self.assertAlmostEqual(share, 0.1, delta=0.02)
+        self.assertTrue({incident for incident in incidents if incident} <= set(simulation.INCIDENTS))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,47 @@
+import unittest
+from Platform.Agents.Tools.incident_search import similar_incidents
+from Platform.prediction_model.similar_incidents import SimilarIncidentIndex, set_similar_incidents
+
+
+class TestIncidentSearch(unittest.TestCase):
+    def setUp(self):
+        index = SimilarIncidentIndex()
+        index.add([
+            {"Incident ID": "INC1", "Incident Name": "Database Downtime",
+             "Incident Description": "Unable to connect to the database", "Debugging Steps": "Check the database"},
+            {"Incident ID": "INC2", "Incident Name": "Queue Backlog",
+             "Incident Description": "Timed out waiting for the message queue", "Debugging Steps": "Check the consumers"},
+        ])
+        set_similar_incidents(index)
+        self.addCleanup(set_similar_incidents, None)
+
+    def test_searches_for_the_measured_error(self):
+        """
+        The agent should search for the latest frequent error and report how the matches were debugged.
+        """
+        state = {
+            "input": "look up similar incidents",
+            "history": [
+                {"agent": "frequent_error", "output": {"error": "Unable to connect to the database", "count": 90}},
+                {"agent": "queue_load", "output": {"health": "green", "score": 20}}
+            ]
+        }
+
+        output = similar_incidents(state)["history"][0]
+
+        self.assertEqual(output["agent"], "similar_incidents")
+        self.assertEqual(output["output"]["query"], "Unable to connect to the database")
+        self.assertEqual(output["output"]["matches"][0]["incident_id"], "INC1")
+        self.assertEqual(output["output"]["matches"][0]["debugging_steps"], "Check the database")
+
+    def test_searches_for_the_action_without_a_measured_error(self):
+        """
+        Without a frequent error in the history the action text should be searched.
+        """
+        output = similar_incidents({"input": "find incidents about the message queue", "history": []})
+
+        self.assertEqual([match["incident_id"] for match in output["history"][0]["output"]["matches"]], ["INC2"])
+
+
+if __name__ == "__main__":
+    unittest.main()
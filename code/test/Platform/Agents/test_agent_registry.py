@@ -0,0 +1,72 @@
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+from Platform.Agents.agent_registry import AgentRegistry, get_agent_registry
+
+
+class TestAgentRegistry(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.file_path = os.path.join(self.tmp_dir.name, "agents.json")
+        self._write([{"name": "queue_load", "type": "measurement"}])
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def _write(self, agents, mtime=None):
+        with open(self.file_path, "w") as f:
+            json.dump({"agents": agents}, f)
+        if mtime is not None:
+            os.utime(self.file_path, (mtime, mtime))
+
+    def test_indexes_by_name_and_type(self):
+        """
+        Agents should be available by name and by type.
+        """
+        registry = AgentRegistry(self.file_path)
+
+        self.assertEqual(registry.get("queue_load")["type"], "measurement")
+        self.assertEqual([a["name"] for a in registry.by_type("measurement")], ["queue_load"])
+        self.assertIsNone(registry.get("unknown"))
+
+    def test_hot_loop_does_no_disk_io(self):
+        """
+        Once loaded, lookups within the check interval should not touch the file system.
+        """
+        registry = AgentRegistry(self.file_path, check_interval=60)
+        registry.catalog()
+
+        with patch("Platform.Agents.agent_registry.os.stat") as mock_stat:
+            for _ in range(10000):
+                registry.catalog()
+
+        mock_stat.assert_not_called()
+        self.assertEqual(registry.loads, 1)
+
+    def test_reloads_only_when_content_changes(self):
+        """
+        A touched file with the same content should not be re-parsed, a changed file should.
+        """
+        registry = AgentRegistry(self.file_path, check_interval=0)
+        registry.catalog()
+
+        self._write([{"name": "queue_load", "type": "measurement"}], mtime=1)
+        registry.catalog()
+        self.assertEqual(registry.loads, 1)
+
+        self._write([{"name": "queue_load", "type": "measurement"},
+                     {"name": "error_count", "type": "measurement"}], mtime=2)
+        self.assertEqual(registry.names(), ["queue_load", "error_count"])
+        self.assertEqual(registry.loads, 2)
+
+    def test_shared_registry_per_file(self):
+        """
+        The decision node and the REST API should get the same registry for a file.
+        """
+        self.assertIs(get_agent_registry(self.file_path), get_agent_registry(self.file_path))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,50 @@
+import unittest
+from unittest.mock import patch
+from Platform.Flows.core_graph import get_graph
+
+
+class TestCoreGraph(unittest.TestCase):
+    @patch("Platform.Agents.Decision.decisions.invoke_decision")
+    def test_independent_agents_run_in_one_step(self, mock_invoke_decision):
+        """
+        An action naming two independent checks should run both measure agents in the
+        same step and go back to a single execute_operation decision.
+        """
+        mock_invoke_decision.side_effect = [
+            ("check the queue load and the queue response time", False),
+            ("completed", False)
+        ]
+
+        result = get_graph().invoke({"operation": "Check the queue health", "history": []})
+
+        agents = [step["agent"] for step in result["history"]]
+        self.assertEqual(agents, [
+            "execute_operation",
+            "execute_agent",
+            "queue_load",
+            "queue_response_time",
+            "execute_operation"
+        ])
+        self.assertEqual(result["history"][1]["output"], "queue_load, queue_response_time")
+        self.assertEqual(mock_invoke_decision.call_count, 2)
+        self.assertEqual(result["fast_path_hits"], 1)
+
+    @patch("Platform.Agents.Decision.decisions.invoke_decision")
+    def test_unknown_agent_returns_to_decision(self, mock_invoke_decision):
+        """
+        A routing answer with no known agent should go back to execute_operation.
+        """
+        mock_invoke_decision.side_effect = [
+            ("check the queue health", False),
+            ("no_such_agent", False),
+            ("completed", False)
+        ]
+
+        result = get_graph().invoke({"operation": "Check the queue health", "history": []})
+
+        agents = [step["agent"] for step in result["history"]]
+        self.assertEqual(agents, ["execute_operation", "execute_agent", "execute_operation"])
+
+
+if __name__ == "__main__":
+    unittest.main()
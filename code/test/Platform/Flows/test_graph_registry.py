@@ -0,0 +1,43 @@
+import unittest
+from unittest.mock import MagicMock
+from Platform.Flows import graph_registry
+from Platform.Flows.core_graph import create_graph, get_graph
+
+
+class TestGraphRegistry(unittest.TestCase):
+    def setUp(self):
+        graph_registry.clear()
+
+    def tearDown(self):
+        graph_registry.clear()
+
+    def test_create_graph_compiles_once(self):
+        """
+        Building the same workflow definition twice should return the same compiled graph.
+        """
+        first = create_graph()
+        second = create_graph()
+
+        self.assertIs(first, second)
+
+    def test_get_graph_reuses_registered_graph(self):
+        """
+        get_graph should only call the builder the first time.
+        """
+        self.assertIs(get_graph(), get_graph())
+
+    def test_get_or_build_calls_builder_once(self):
+        """
+        The builder passed to get_or_build should not be called again once registered.
+        """
+        builder = MagicMock(return_value="compiled")
+
+        graph_registry.get_or_build("test_graph", builder)
+        result = graph_registry.get_or_build("test_graph", builder)
+
+        self.assertEqual(result, "compiled")
+        builder.assert_called_once()
+
+
+if __name__ == "__main__":
+    unittest.main()
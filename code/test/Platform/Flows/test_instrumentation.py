@@ -0,0 +1,78 @@
+import unittest
+from types import SimpleNamespace
+from unittest.mock import patch
+from Platform.Flows import graph_registry
+from Platform.Flows import instrumentation
+from Platform.Flows.core_graph import create_graph
+from Platform.Flows.instrumentation import MetricsRegistry, instrument, record_llm_usage, track_run
+
+
+class TestInstrumentation(unittest.TestCase):
+    def setUp(self):
+        self.registry = MetricsRegistry()
+        patcher = patch.object(instrumentation, "metrics", self.registry)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_records_node_time_tokens_and_iterations(self):
+        """
+        A tracked run should summarize calls, LLM usage and loop iterations per node.
+        """
+        def decide(state):
+            record_llm_usage("execute_operation", SimpleNamespace(
+                usage_metadata={"input_tokens": 120, "output_tokens": 7}
+            ))
+            return {}
+
+        wrapped = instrument("core", "execute_operation", decide, loop=True)
+        with track_run() as run:
+            wrapped({})
+            wrapped({})
+
+        summary = run.summary()
+        self.assertEqual(summary["iterations"], 2)
+        self.assertEqual(summary["llm_calls"], 2)
+        self.assertEqual(summary["prompt_tokens"], 240)
+        self.assertEqual(summary["nodes"]["execute_operation"]["completion_tokens"], 14)
+        self.assertEqual(wrapped.__qualname__, decide.__qualname__)
+        self.assertEqual(self.registry.value("graph_node_calls_total", {"graph": "core", "node": "execute_operation"}), 2)
+        self.assertEqual(self.registry.value("graph_runs_total", {"graph": "core"}), 1)
+
+    def test_render_prometheus_text(self):
+        """
+        Counters and histograms should be rendered in the Prometheus exposition format.
+        """
+        self.registry.inc("llm_calls_total", {"node": "execute_agent"}, help_text="LLM calls")
+        self.registry.observe("graph_node_duration_seconds", 0.02, {"node": "queue_load"}, buckets=(0.01, 0.1))
+
+        text = self.registry.render()
+
+        self.assertIn("# TYPE llm_calls_total counter", text)
+        self.assertIn('llm_calls_total{node="execute_agent"} 1', text)
+        self.assertIn('graph_node_duration_seconds_bucket{node="queue_load",le="0.01"} 0', text)
+        self.assertIn('graph_node_duration_seconds_bucket{node="queue_load",le="0.1"} 1', text)
+        self.assertIn('graph_node_duration_seconds_bucket{node="queue_load",le="+Inf"} 1', text)
+        self.assertIn('graph_node_duration_seconds_count{node="queue_load"} 1', text)
+
+    @patch("Platform.Agents.Decision.decisions.invoke_decision")
+    def test_parallel_branches_record_into_the_run(self, mock_invoke_decision):
+        """
+        Agents fanned out in one step should be counted in the summary of the run.
+        """
+        graph_registry.clear()
+        mock_invoke_decision.side_effect = [
+            ("check the queue load and the database ping", False),
+            ("completed", False)
+        ]
+
+        with track_run() as run:
+            create_graph().invoke({"operation": "Check the queue", "history": []})
+
+        nodes = run.summary()["nodes"]
+        self.assertEqual(run.iterations, 2)
+        self.assertEqual(nodes["queue_load"]["calls"], 1)
+        self.assertEqual(nodes["database_ping"]["calls"], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,50 @@
+import json
+import operator
+import unittest
+from unittest.mock import MagicMock
+from Platform.Utilities.agent_response_management import HistoryFold, history_entry, serialize_history
+
+
+class TestAgentResponseManagement(unittest.TestCase):
+    def test_history_entry(self):
+        """
+        history_entry should return a single element list ready for the operator.add reducer.
+        """
+        entry = history_entry("queue_load", {"health": "green", "score": 20})
+
+        self.assertEqual(entry, [{"agent": "queue_load", "output": {"health": "green", "score": 20}}])
+
+    def test_serialize_history(self):
+        """
+        serialize_history should produce the JSON document used at the API boundary.
+        """
+        history = operator.add(history_entry("execute_operation", "check the logs"),
+                               history_entry("error_count", {"health": "red", "score": 50}))
+
+        result = json.loads(serialize_history(history))
+
+        self.assertEqual([step["agent"] for step in result["history"]], ["execute_operation", "error_count"])
+        self.assertEqual(json.loads(serialize_history([])), {"history": []})
+
+    def test_growing_history_only_encodes_new_entries(self):
+        """
+        Serializing every step of a growing history should encode each entry once and match a full encoding.
+        """
+        encode = MagicMock(side_effect=json.dumps)
+        fold = HistoryFold(encode, ", ")
+        history = []
+        for step in range(20):
+            added = history_entry("queue_load", {"score": step})
+            if step % 5 == 0:
+                added += history_entry("error_count", {"score": -step})
+            history = operator.add(history, added)
+            self.assertEqual(fold(history), ", ".join(json.dumps(entry) for entry in history))
+            self.assertEqual(serialize_history(history), json.dumps({"history": history}))
+        self.assertEqual(encode.call_count, len(history))
+
+        # A history that shares entries but not the prefix is encoded from the start
+        self.assertEqual(fold(history[1:]), ", ".join(json.dumps(entry) for entry in history[1:]))
+
+
+if __name__ == "__main__":
+    unittest.main()
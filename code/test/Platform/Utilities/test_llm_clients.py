@@ -0,0 +1,58 @@
+import os
+import sys
+import unittest
+from unittest.mock import patch
+# Local stand-ins for external services, shared with the benchmarks
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "support")))
+from Platform.Utilities import llm_clients
+from fake_llm_server import FakeLLMServer
+
+
+class TestLlmClients(unittest.TestCase):
+    def setUp(self):
+        llm_clients.clear()
+        self.server = FakeLLMServer(responder=lambda messages: "check the application log").start()
+        self.env = patch.dict(os.environ, {"OPENAI_BASE_URL": self.server.base_url, "OPENAI_API_KEY": "fake-key"})
+        self.env.start()
+
+    def tearDown(self):
+        self.env.stop()
+        llm_clients.clear()
+        self.server.stop()
+
+    def test_get_chain_is_shared(self):
+        """
+        The same chain name should return the same pre-built chain and chat model.
+        """
+        first = llm_clients.get_chain("test_chain", "Operation : {operation}")
+        second = llm_clients.get_chain("test_chain", "Operation : {operation}")
+
+        self.assertIs(first, second)
+        self.assertIs(llm_clients.get_chat_model(), llm_clients.get_chat_model())
+
+    def test_get_chain_is_keyed_by_template(self):
+        """
+        A chain name reused with another prompt template should get a chain built from that template.
+        """
+        first = llm_clients.get_chain("test_chain", "First : {operation}")
+        second = llm_clients.get_chain("test_chain", "Second : {operation}")
+
+        self.assertIsNot(first, second)
+        self.assertEqual(second.first.template, "Second : {operation}")
+
+    def test_calls_reuse_connection(self):
+        """
+        Repeated calls through the shared client should reuse one keep-alive connection.
+        """
+        chain = llm_clients.get_chain("test_chain", "Operation : {operation}")
+
+        for _ in range(3):
+            response = chain.invoke({"operation": "downtime"})
+
+        self.assertEqual(response.content, "check the application log")
+        self.assertEqual(self.server.requests, 3)
+        self.assertEqual(self.server.connections, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,162 @@
+import os
+import sys
+import threading
+import unittest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../../src/Platform/orchestrator")))
+
+from investigation_runner import InvestigationRunner
+from exceptions import ConflictException, ServiceUnavailableException
+
+
+class TestInvestigationRunner(unittest.TestCase):
+    def setUp(self):
+        self.release = threading.Event()
+
+    def tearDown(self):
+        self.release.set()
+
+    def blocking_operation(self, operation_text, investigation_id):
+        self.release.wait(5)
+        return {"history": [{"agent": "execute_operation", "output": "completed"}]}
+
+    def wait_finished(self, runner, investigation_id):
+        for _ in range(500):
+            if runner.get(investigation_id).status in ("completed", "failed") and runner._slots._value:
+                return
+            threading.Event().wait(0.01)
+        self.fail(f"Investigation {investigation_id} did not finish")
+
+    def test_submit_returns_immediately_and_completes(self):
+        """
+        submit should return a queued investigation and the result should be available once done.
+        """
+        runner = InvestigationRunner(self.blocking_operation, max_workers=1, max_queue=1)
+
+        investigation = runner.submit("downtime", "operation text")
+
+        self.assertTrue(investigation.id.startswith("inv-"))
+        self.assertIn(investigation.status, ("queued", "running"))
+
+        self.release.set()
+        runner.shutdown()
+
+        finished = runner.get(investigation.id)
+        self.assertEqual(finished.status, "completed")
+        self.assertEqual(finished.result["history"][0]["output"], "completed")
+
+    def test_backpressure_when_queue_full(self):
+        """
+        Submissions beyond the workers plus queue capacity should be rejected with 503.
+        """
+        runner = InvestigationRunner(self.blocking_operation, max_workers=1, max_queue=1)
+        runner.submit("downtime", "operation text")
+        runner.submit("downtime", "operation text")
+
+        with self.assertRaises(ServiceUnavailableException) as context:
+            runner.submit("downtime", "operation text")
+
+        self.assertEqual(context.exception.status_code, 503)
+        self.release.set()
+        runner.shutdown()
+
+    def test_failed_investigation_is_recorded(self):
+        """
+        An exception in the investigation should mark it failed without losing the worker.
+        """
+        def failing_operation(operation_text, investigation_id):
+            raise RuntimeError("LLM unavailable")
+
+        runner = InvestigationRunner(failing_operation, max_workers=1, max_queue=0)
+        investigation = runner.submit("downtime", "operation text")
+        runner.shutdown()
+
+        self.assertEqual(runner.get(investigation.id).status, "failed")
+        self.assertEqual(runner.get(investigation.id).error, "LLM unavailable")
+        self.assertEqual([inv.id for inv in runner.list()], [investigation.id])
+
+    def test_resume_reuses_investigation_id(self):
+        """
+        Resuming should run the resume job under the same id, even without an in-memory record.
+        """
+        resumed = []
+        runner = InvestigationRunner(self.blocking_operation,
+                                     lambda investigation_id: resumed.append(investigation_id) or {"history": []},
+                                     max_workers=1, max_queue=0)
+
+        investigation = runner.resume("inv-0123456789ab", "downtime")
+        runner.shutdown()
+
+        self.assertEqual(resumed, ["inv-0123456789ab"])
+        self.assertEqual(runner.get("inv-0123456789ab").status, "completed")
+        self.assertEqual(investigation.name, "downtime")
+
+    def test_resume_with_full_queue_keeps_the_record(self):
+        """
+        A resume rejected with 503 should leave the investigation as it was, so it can be resumed later.
+        """
+        def operation(operation_text, investigation_id):
+            if operation_text == "failing":
+                raise RuntimeError("LLM unavailable")
+            return self.blocking_operation(operation_text, investigation_id)
+
+        runner = InvestigationRunner(operation, lambda investigation_id: {"history": []},
+                                     max_workers=1, max_queue=0)
+        investigation = runner.submit("downtime", "failing")
+        self.wait_finished(runner, investigation.id)
+        blocking = runner.submit("downtime", "operation text")
+
+        with self.assertRaises(ServiceUnavailableException):
+            runner.resume(investigation.id)
+        with self.assertRaises(ServiceUnavailableException):
+            runner.resume("inv-0123456789ab", "downtime")
+
+        self.assertEqual(runner.get(investigation.id).status, "failed")
+        self.assertEqual(runner.get(investigation.id).error, "LLM unavailable")
+        self.assertIsNotNone(runner.get(investigation.id).finished_at)
+        self.assertIsNone(runner.get("inv-0123456789ab"))
+
+        self.release.set()
+        self.wait_finished(runner, blocking.id)
+        runner.resume(investigation.id)
+        runner.shutdown()
+        self.assertEqual(runner.get(investigation.id).status, "completed")
+
+    def test_resume_in_progress_is_a_conflict(self):
+        """
+        Resuming an investigation that is still queued or running should be rejected without taking a slot.
+        """
+        runner = InvestigationRunner(self.blocking_operation, lambda investigation_id: {"history": []},
+                                     max_workers=1, max_queue=1)
+        investigation = runner.submit("downtime", "operation text")
+
+        with self.assertRaises(ConflictException):
+            runner.resume(investigation.id)
+
+        runner.submit("downtime", "operation text")
+        self.release.set()
+        runner.shutdown()
+
+    def test_stream_shares_the_capacity(self):
+        """
+        A stream should hold a slot until it is exhausted or closed and be rejected when the runner is full.
+        """
+        runner = InvestigationRunner(self.blocking_operation, max_workers=1, max_queue=0)
+
+        events = runner.stream(iter(["node", "completed"]))
+        with self.assertRaises(ServiceUnavailableException):
+            runner.submit("downtime", "operation text")
+        self.assertEqual(list(events), ["node", "completed"])
+
+        unread = runner.stream(iter(["node"]))
+        with self.assertRaises(ServiceUnavailableException):
+            runner.stream(iter(["node"]))
+        unread.close()
+
+        runner.submit("downtime", "operation text")
+        self.release.set()
+        runner.shutdown()
+
+
+if __name__ == "__main__":
+    unittest.main()
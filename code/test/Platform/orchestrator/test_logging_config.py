@@ -0,0 +1,74 @@
+import logging
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../../src/Platform/orchestrator")))
+
+from logging_config import LazyJson, SampleFilter, configure_logging, stop_logging
+
+
+class TestLoggingConfig(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.base_dir = Path(self.tmp_dir.name)
+
+    def tearDown(self):
+        stop_logging()
+        self.tmp_dir.cleanup()
+
+    def _read(self, filename):
+        with open(self.base_dir / "operations" / "logs" / filename) as f:
+            return f.read()
+
+    def test_routes_each_logger_to_its_file(self):
+        """
+        Records should be written by the background writer to the file of their logger.
+        """
+        configure_logging(self.base_dir)
+        configure_logging(self.base_dir)
+
+        logging.getLogger('operations_service').info("%s", LazyJson({"action": "list_operations"}))
+        logging.getLogger('operations_controller').info("request %s", "/api/agents")
+        stop_logging()
+
+        service_log = self._read('operations_service.log')
+        self.assertIn('{"action": "list_operations"}', service_log)
+        self.assertNotIn('/api/agents', service_log)
+        self.assertEqual(self._read('operations_controller.log').count('request /api/agents'), 1)
+
+    def test_message_is_formatted_off_the_calling_thread(self):
+        """
+        The queue handler should enqueue the record without formatting its message.
+        """
+        listener = configure_logging(self.base_dir)
+        entry = LazyJson({"status": "started"})
+
+        with patch.object(LazyJson, '__str__', return_value='{}') as to_json:
+            with patch.object(listener, 'handle') as handle:
+                logging.getLogger('operations_controller').info("%s", entry)
+                stop_logging()
+
+        to_json.assert_not_called()
+        record = handle.call_args[0][0]
+        self.assertIs(record.args[0], entry)
+
+    def test_sampling_only_drops_marked_records(self):
+        """
+        Only records marked as sampled should be subject to the sample rate.
+        """
+        sample_filter = SampleFilter(0.0)
+        sampled = logging.LogRecord('operations_app', logging.INFO, __file__, 1, "started", None, None)
+        sampled.sampled = True
+        failure = logging.LogRecord('operations_app', logging.INFO, __file__, 1, "failed", None, None)
+
+        self.assertFalse(sample_filter.filter(sampled))
+        self.assertTrue(sample_filter.filter(failure))
+        self.assertTrue(SampleFilter(1.0).filter(sampled))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,81 @@
+import os
+import sys
+import tempfile
+import unittest
+from unittest.mock import patch
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../../src/Platform/orchestrator")))
+
+from operations_catalog import OperationsCatalog
+
+
+class TestOperationsCatalog(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.docs_dir = self.tmp_dir.name
+        for name in ("downtime", "backup", "latency"):
+            self._write(name, f"{name} runbook")
+        with open(os.path.join(self.docs_dir, "notes.md"), "w") as f:
+            f.write("not a runbook")
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def _write(self, name, content):
+        with open(os.path.join(self.docs_dir, f"{name}.txt"), "w") as f:
+            f.write(content)
+
+    def test_lists_pages_of_metadata(self):
+        """
+        Listing should return names, sizes and hashes ordered by name, one page at a time.
+        """
+        catalog = OperationsCatalog(self.docs_dir, rescan_interval=0)
+
+        page, total = catalog.list(offset=1, limit=1)
+
+        self.assertEqual(total, 3)
+        self.assertEqual([entry.name for entry in page], ["downtime"])
+        self.assertEqual(page[0].size, len("downtime runbook"))
+        self.assertEqual(catalog.read("downtime"), "downtime runbook")
+        self.assertIsNone(catalog.read("notes"))
+
+    def test_unchanged_files_are_not_read_again(self):
+        """
+        A rescan should only read files whose mtime or size changed.
+        """
+        catalog = OperationsCatalog(self.docs_dir, rescan_interval=0)
+        etag = catalog.etag
+
+        with patch("builtins.open") as mock_open:
+            self.assertEqual(catalog.etag, etag)
+
+        mock_open.assert_not_called()
+
+    def test_etag_changes_with_content(self):
+        """
+        Adding or changing a runbook should change the catalog ETag.
+        """
+        catalog = OperationsCatalog(self.docs_dir, rescan_interval=0)
+        etag = catalog.etag
+
+        self._write("downtime", "updated downtime runbook")
+
+        self.assertNotEqual(catalog.etag, etag)
+        self.assertEqual(catalog.get("downtime").size, len("updated downtime runbook"))
+
+    def test_rescan_interval(self):
+        """
+        Within the rescan interval the directory should not be scanned again until invalidated.
+        """
+        catalog = OperationsCatalog(self.docs_dir, rescan_interval=60)
+        catalog.list()
+
+        self._write("new", "new runbook")
+        self.assertIsNone(catalog.get("new"))
+
+        catalog.invalidate()
+        self.assertIsNotNone(catalog.get("new"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,53 @@
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../../src/Platform/orchestrator")))
+
+from api_models import OperationRequest
+from exceptions import NotFoundException
+import operations_service
+from operations_service import OperationsService
+
+
+class TestOperationsService(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        patches = [
+            patch.dict(os.environ, {"SIMILAR_INCIDENTS_WARM": "false", "INCREMENTAL_WATCH_INTERVAL": "0"}),
+            patch.object(operations_service, "get_agent_registry"),
+            patch.object(OperationsService, "_setup_service_logger")
+        ]
+        for patcher in patches:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.runner = MagicMock()
+        self.service = OperationsService(Path(self.tmp_dir.name), runner=self.runner)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_operation_is_found_under_its_created_name(self):
+        """
+        A runbook created under a name that is not a safe file name should be read and
+        started under the same name.
+        """
+        self.service.create_operation(OperationRequest(name="my op", operation_text="check the queue"))
+
+        self.assertEqual(self.service.get_operation("my op").content, "check the queue")
+        self.service.start_operation(OperationRequest(name="my op"))
+        self.runner.submit.assert_called_once_with("my op", "check the queue")
+
+    def test_missing_operation_is_not_found(self):
+        """
+        Reading a runbook that was never created should raise NotFoundException.
+        """
+        with self.assertRaises(NotFoundException):
+            self.service.get_operation("missing op")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,74 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import MagicMock
+from Platform.prediction_model.flow_cache import FlowCache
+
+
+class TestFlowCache(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "flow_cache.json")
+
+    def test_flows_persist_until_the_model_changes(self):
+        """
+        Flows should be reused by a new process for the same model and dropped for a retrained one.
+        """
+        formatter = MagicMock(side_effect=lambda label: f"Flow of {label}")
+        cache = FlowCache(self.path)
+        self.assertEqual(cache.get_or_format("model-1", "Check the database", formatter), "Flow of Check the database")
+        self.assertEqual(cache.get_or_format("model-1", "Check the database", formatter), "Flow of Check the database")
+        self.assertEqual(formatter.call_count, 1)
+
+        restarted = FlowCache(self.path)
+        self.assertEqual(restarted.get_or_format("model-1", "Check the database", formatter), "Flow of Check the database")
+        self.assertEqual(formatter.call_count, 1)
+
+        restarted.get_or_format("model-2", "Check the database", formatter)
+        self.assertEqual(formatter.call_count, 2)
+        self.assertEqual(restarted.stats(), {"hits": 1, "misses": 1, "fallbacks": 0, "entries": 1})
+
+    def test_fallback_flows_are_not_persisted(self):
+        """
+        Without an API key the fallback should be used, and the LLM tried again after a restart.
+        """
+        def missing_key(label):
+            raise ValueError("API key not found")
+
+        cache = FlowCache(self.path)
+        self.assertEqual(cache.get_or_format("model-1", "Restart", missing_key, str.upper), "RESTART")
+        self.assertEqual(cache.stats()["fallbacks"], 1)
+
+        formatter = MagicMock(return_value="Flow of Restart")
+        self.assertEqual(FlowCache(self.path).get_or_format("model-1", "Restart", formatter), "Flow of Restart")
+        formatter.assert_called_once_with("Restart")
+
+    def test_fallback_flows_expire(self):
+        """
+        A fallback flow should only be served for its TTL, the LLM is tried again by the same process after it.
+        """
+        now = [0.0]
+        formatter = MagicMock(side_effect=[None, "Flow of Restart"])
+        cache = FlowCache(self.path, fallback_ttl=60, clock=lambda: now[0])
+        self.assertEqual(cache.get_or_format("model-1", "Restart", formatter, str.upper), "RESTART")
+        now[0] += 30
+        self.assertEqual(cache.get_or_format("model-1", "Restart", formatter, str.upper), "RESTART")
+        now[0] += 30
+        self.assertEqual(cache.get_or_format("model-1", "Restart", formatter, str.upper), "Flow of Restart")
+        self.assertEqual(formatter.call_count, 2)
+
+    def test_unwritable_cache_file_does_not_fail_formatting(self):
+        """
+        A cache file that cannot be written should be reported without failing the prediction.
+        """
+        cache = FlowCache(os.path.join(self.path, "missing", "flow_cache.json"))
+        with open(self.path, "w") as f:
+            f.write("not a directory")
+
+        self.assertEqual(cache.get_or_format("model-1", "Restart", str.lower), "restart")
+        self.assertEqual(cache.get_or_format("model-1", "Restart", str.lower), "restart")
+
+
+if __name__ == "__main__":
+    unittest.main()
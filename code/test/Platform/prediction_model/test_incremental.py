@@ -0,0 +1,166 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+# The wordnet corpus is not bundled, clean text without lemmatization unless asked to use it
+os.environ.setdefault("PREDICTION_LEMMATIZE", "false")
+import pandas as pd
+from sklearn.linear_model import LogisticRegression
+from Platform.prediction_model.incremental import IncrementalTrainer, make_vectorizer
+from Platform.prediction_model.predictor import Predictor
+from Platform.prediction_model.registry import ModelRegistry
+
+DATABASE = {"Incident Description": "database connection refused", "Debugging Steps": "Check the database"}
+DISK = {"Incident Description": "backup disk full", "Debugging Steps": "Free disk space"}
+CERTIFICATE = {"Incident Description": "tls certificate expired", "Debugging Steps": "Renew the certificate"}
+MEMORY = {"Incident Description": "worker out of memory", "Debugging Steps": "Raise the memory limit"}
+QUEUE = {"Incident Description": "orders queue backlog", "Debugging Steps": "Scale the consumers"}
+
+
+class TestIncrementalTrainer(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+        self.registry = ModelRegistry(os.path.join(self.directory, "registry"))
+        self.incoming_dir = os.path.join(self.directory, "incoming")
+        self.predictor = Predictor(registry=self.registry)
+        # No training sources unless a test writes its history there
+        self.sources = os.path.join(self.directory, "history", "*.csv")
+
+    def trainer(self):
+        return IncrementalTrainer(self.registry, self.incoming_dir, n_features=2 ** 12, predictor=self.predictor,
+                                  sources=self.sources, store_dir=os.path.join(self.directory, "store"))
+
+    def publish_served_model(self, incidents):
+        """Publishes a model trained on incidents as the version served, as a full retrain would"""
+        vectorizer = make_vectorizer(2 ** 12)
+        texts = [incident["Incident Description"] for incident in incidents]
+        model = LogisticRegression().fit(vectorizer.transform(texts), [incident["Debugging Steps"] for incident in incidents])
+        return self.registry.publish(model, vectorizer)
+
+    def write_history(self, incidents):
+        os.makedirs(os.path.dirname(self.sources))
+        rows = [dict(incident, **{"Incident ID": f"INC-{number}"}) for number, incident in enumerate(incidents)]
+        pd.DataFrame(rows).to_csv(os.path.join(os.path.dirname(self.sources), "incidents.csv"), index=False)
+
+    def test_new_labels_are_learned_and_published_versions_swapped_in(self):
+        """
+        Later batches should add unseen labels, and each published version should replace the served model.
+        """
+        trainer = self.trainer()
+        for _ in range(10):
+            trainer.add_incidents([DATABASE, DISK])
+        self.assertEqual(trainer.publish(), 1)
+        self.assertEqual(list(self.predictor.predict(["database connection refused"])), ["Check the database"])
+        first_fingerprint = self.predictor.fingerprint
+
+        for _ in range(10):
+            trainer.add_incidents([DATABASE, DISK, CERTIFICATE])
+        self.assertEqual(trainer.publish(), 2)
+        self.assertEqual(list(self.predictor.predict(["tls certificate expired", "backup disk full"])),
+                         ["Renew the certificate", "Free disk space"])
+        self.assertNotEqual(self.predictor.fingerprint, first_fingerprint)
+
+        self.assertEqual(self.registry.manifest()["metadata"], {"source": "incremental", "trained_incidents": 50})
+        resumed = self.trainer()
+        self.assertEqual((resumed.version, resumed.trained_incidents), (2, 50))
+        self.assertEqual(list(Predictor(registry=self.registry).predict(["tls certificate expired"])),
+                         ["Renew the certificate"])
+
+        # Training goes on from the published version
+        for _ in range(5):
+            resumed.add_incidents([DATABASE, CERTIFICATE])
+        self.assertEqual(resumed.publish(), 3)
+        self.assertEqual(self.predictor.version, 3)
+
+    def test_publish_keeps_the_historical_labels_predictable(self):
+        """
+        A trainer without a version of its own should learn the training store first, so its
+        first publish still predicts the debugging steps of the history.
+        """
+        history = [DATABASE, DISK, CERTIFICATE] * 10
+        self.write_history(history)
+        self.publish_served_model(history)
+        trainer = self.trainer()
+
+        trainer.add_incidents([MEMORY, QUEUE])
+
+        self.assertEqual(trainer.trained_incidents, 32)
+        self.assertEqual(trainer.publish(), 2)
+        self.assertEqual(self.registry.current_version(), 2)
+        self.assertEqual(self.registry.manifest()["classes"], 5)
+        self.assertEqual(list(self.predictor.predict(["database connection refused", "backup disk full",
+                                                      "tls certificate expired"])),
+                         ["Check the database", "Free disk space", "Renew the certificate"])
+
+    def test_model_knowing_fewer_labels_is_not_served(self):
+        """
+        Without a training store a version knowing fewer labels than the served one should be
+        published for the trainer to resume from, but not activated.
+        """
+        self.publish_served_model([DATABASE, DISK, CERTIFICATE] * 10)
+        trainer = self.trainer()
+
+        trainer.add_incidents([DATABASE, DISK])
+
+        self.assertEqual(trainer.publish(), 2)
+        self.assertEqual(self.registry.current_version(), 1)
+        self.assertEqual(list(self.predictor.predict(["tls certificate expired"])), ["Renew the certificate"])
+        self.assertEqual(self.predictor.version, 1)
+        self.assertEqual(self.trainer().version, 2)
+
+    def test_incoming_files_are_trained_once(self):
+        """
+        CSV files dropped in the incoming directory should be trained on, moved away and published.
+        """
+        os.makedirs(self.incoming_dir)
+        pd.DataFrame([DATABASE, DISK] * 5).to_csv(os.path.join(self.incoming_dir, "batch-1.csv"), index=False)
+        trainer = self.trainer()
+
+        self.assertEqual(trainer.poll(), 10)
+        self.assertEqual(trainer.poll(), 0)
+        self.assertEqual(trainer.version, 1)
+        self.assertEqual(os.listdir(os.path.join(self.incoming_dir, "processed")), ["batch-1.csv"])
+        self.assertEqual(self.registry.current_version(), 1)
+
+    def test_first_label_is_held_until_a_second_one_arrives(self):
+        """
+        Incidents of a single label should be accepted and trained on once incidents of another label arrive.
+        """
+        trainer = self.trainer()
+        self.assertEqual(trainer.add_incidents([DATABASE]), 1)
+        self.assertEqual(trainer.add_incidents([DATABASE]), 1)
+        self.assertIsNone(trainer.model)
+        self.assertEqual((trainer.pending_incidents, trainer.trained_incidents), (2, 0))
+
+        for _ in range(10):
+            trainer.add_incidents([DISK])
+        self.assertEqual((trainer.pending_incidents, trainer.trained_incidents), (0, 12))
+        self.assertEqual(trainer.publish(), 1)
+        self.assertEqual(list(self.predictor.predict(["database connection refused"])), ["Check the database"])
+
+    def test_failing_files_are_moved_aside(self):
+        """
+        A file that fails part way should be moved to failed/ and not trained on again at the next poll.
+        """
+        os.makedirs(self.incoming_dir)
+        for name in ("batch-1.csv", "batch-2.csv"):
+            pd.DataFrame([DATABASE, DISK] * 2).to_csv(os.path.join(self.incoming_dir, name), index=False)
+        trainer = self.trainer()
+        trainer.chunksize = 2
+        # The second chunk of the second file fails after its first chunk was trained on
+        add_frame = trainer.add_frame
+        chunks = iter([add_frame, add_frame, add_frame, MagicMock(side_effect=ValueError("Bad chunk"))])
+
+        with patch.object(trainer, "add_frame", side_effect=lambda df: next(chunks)(df)):
+            self.assertEqual(trainer.poll(), 4)
+        self.assertEqual((trainer.trained_incidents, trainer.version), (6, 1))
+        self.assertEqual(trainer.poll(), 0)
+        self.assertEqual((trainer.trained_incidents, trainer.version), (6, 1))
+        self.assertEqual(os.listdir(os.path.join(self.incoming_dir, "processed")), ["batch-1.csv"])
+        self.assertEqual(os.listdir(os.path.join(self.incoming_dir, "failed")), ["batch-2.csv"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,92 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+# The wordnet corpus is not bundled, clean text without lemmatization unless asked to use it
+os.environ.setdefault("PREDICTION_LEMMATIZE", "false")
+from Platform.prediction_model import ingestion
+from Platform.prediction_model.ingestion import INCIDENT_COLUMNS, expand_sources, ingest, read_manifest, read_store
+from Platform.prediction_model.preprocess import LABEL_COLUMN, load_prepared_incidents
+
+# First file format: singular steps column, steps continued on rows without an incident ID
+OLD_CSV = (
+    "\ufeffIncident ID,Incident Name,Incident Description,Priority,Debugging Step,Resolution\n"
+    "INC1,Database Downtime,Database is unreachable.,1 - Critical,1. Check DB logs.,Restarted DB.\n"
+    ",,,,2. Verify connectivity.,\n"
+    ",,,,3. Restart DB.,\n"
+    "INC2,Email Delay,Mail is slow.,3 - Medium,1. Check SMTP queue.,Flushed queue.\n"
+    "INC3,Login Failure,Users cannot log in.,2 - High,Check SSO.,Fixed SSO.\n"
+)
+# Later file format with the first step column, replaces INC2
+NEW_CSV = (
+    "Incident ID,Incident Name,Incident Description,Priority,Debugging Steps,First Debugging Step,Resolution\n"
+    "INC2,Email Delay,Mail is slow.,3 - Medium,1. Check relay. 2. Flush queue.,Check relay.,Flushed queue.\n"
+    "INC4,Disk Full,Disk is full.,2 - High,1. Free space.,Free space.,Cleaned logs.\n"
+)
+
+
+class TestIngestion(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.old = self._write("incidents-a.csv", OLD_CSV)
+        self.new = self._write("incidents-b.csv", NEW_CSV)
+        self.store = os.path.join(self.directory.name, "store")
+
+    def _write(self, name, text):
+        path = os.path.join(self.directory.name, name)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text)
+        return path
+
+    def test_sources_expand_globs_in_order(self):
+        """
+        Globs should expand in name order after the paths before them, each file listed once.
+        """
+        pattern = os.path.join(self.directory.name, "incidents-*.csv")
+        self.assertEqual(expand_sources(os.pathsep.join([self.new, pattern])), [self.new, self.old])
+        with self.assertRaises(FileNotFoundError):
+            expand_sources([os.path.join(self.directory.name, "missing.csv")])
+
+    def test_ingest_normalizes_and_deduplicates_across_chunks(self):
+        """
+        Continuation rows should merge into their incident across chunk boundaries and the last file win.
+        """
+        for chunksize in (1, 2, 1000):
+            ingest([self.old, self.new], self.store, chunksize=chunksize, force=True)
+            df = read_store(self.store).set_index("Incident ID")
+
+            self.assertEqual(list(df.columns), INCIDENT_COLUMNS[1:])
+            self.assertEqual(sorted(df.index), ["INC1", "INC2", "INC3", "INC4"])
+            self.assertEqual(df.loc["INC1", "Debugging Steps"], "1. Check DB logs. 2. Verify connectivity. 3. Restart DB.")
+            self.assertEqual(df.loc["INC1", "First Debugging Step"], "Check DB logs.")
+            self.assertEqual(df.loc["INC3", "First Debugging Step"], "Check SSO.")
+            self.assertEqual(df.loc["INC2", "Debugging Steps"], "1. Check relay. 2. Flush queue.")
+            self.assertEqual(read_manifest(self.store)["rows"], 4)
+
+    def test_unchanged_sources_reuse_the_store(self):
+        """
+        A second ingestion of the same files should not read them again, an edited file should.
+        """
+        ingest([self.old, self.new], self.store)
+        with patch.object(ingestion, "read_incidents") as read:
+            ingest([self.old, self.new], self.store)
+        read.assert_not_called()
+
+        self._write("incidents-b.csv", NEW_CSV + "INC5,Cache Miss,Cache is cold.,4 - Low,1. Warm cache.,,\n")
+        ingest([self.old, self.new], self.store)
+        self.assertEqual(len(read_store(self.store)), 5)
+
+    def test_store_is_a_preprocessing_source(self):
+        """
+        The training store should be cleaned like a CSV file, one label per ingested incident.
+        """
+        ingest([self.old, self.new], self.store)
+        with tempfile.TemporaryDirectory() as cache_dir:
+            prepared = load_prepared_incidents(self.store, cache_dir)
+        self.assertEqual(len(prepared), 4)
+        self.assertIn("1. Check relay. 2. Flush queue.", prepared[LABEL_COLUMN].tolist())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,15 +1,35 @@
 import unittest
 from unittest.mock import patch, MagicMock
-from Platform.prediction_model.main import predict_debugging_step
+from Platform.prediction_model.flow_cache import FlowCache, set_flow_cache
+from Platform.prediction_model.main import predict_debugging_step, predict_debugging_steps_batch
+from Platform.prediction_model.predictor import Predictor
+from Platform.prediction_model.structure_debugging_steps import FORMAT_ERROR
+
+
+def mock_predictor(mock_model, mock_vectorizer):
+    predictor = Predictor(model_path="missing-model.pkl", vectorizer_path="missing-vectorizer.pkl")
+    predictor._model = mock_model
+    predictor._vectorizer = mock_vectorizer
+    return predictor
 
 
 class TestPredictDebuggingStep(unittest.TestCase):
-    @patch("Platform.prediction_model.main.vectorizer")
-    @patch("Platform.prediction_model.main.model")
-    def test_predict_debugging_step(self, mock_model, mock_vectorizer):
+    def setUp(self):
+        self.mock_model = MagicMock()
+        self.mock_vectorizer = MagicMock()
+        patcher = patch("Platform.prediction_model.main.get_predictor",
+                        return_value=mock_predictor(self.mock_model, self.mock_vectorizer))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        set_flow_cache(FlowCache(path=None))
+        self.addCleanup(set_flow_cache, None)
+
+    def test_predict_debugging_step(self):
         """
         Test the predict_debugging_step function with mocked model and vectorizer.
         """
+        mock_model, mock_vectorizer = self.mock_model, self.mock_vectorizer
+
         # Mock the vectorizer's transform method
         mock_vectorizer.transform.return_value = "mock_tfidf_vector"
 
@@ -30,6 +50,46 @@ class TestPredictDebuggingStep(unittest.TestCase):
             mock_format_llm.assert_called_once_with("mock_debugging_step")
             self.assertEqual(result, "Formatted Debugging Step")
 
+    def test_predict_debugging_steps_batch(self):
+        """
+        Test that a batch is vectorized and predicted in one call and each distinct step set formatted once.
+        """
+        mock_model, mock_vectorizer = self.mock_model, self.mock_vectorizer
+        mock_vectorizer.transform.return_value = "mock_tfidf_matrix"
+        mock_model.predict.return_value = ["restart the service", "check the backup", "restart the service"]
+
+        with patch("Platform.prediction_model.main.format_debugging_steps_with_llm") as mock_format_llm:
+            mock_format_llm.side_effect = lambda steps: f"Formatted {steps}"
+
+            incidents = ["Service down", "Backup failed", "Service down again"]
+            result = predict_debugging_steps_batch(incidents)
+
+            mock_vectorizer.transform.assert_called_once_with(incidents)
+            mock_model.predict.assert_called_once_with("mock_tfidf_matrix")
+            self.assertEqual(mock_format_llm.call_count, 2)
+            self.assertEqual(result, [
+                "Formatted restart the service",
+                "Formatted check the backup",
+                "Formatted restart the service"
+            ])
+            self.assertEqual(predict_debugging_steps_batch([]), [])
+
+    def test_predictions_reuse_the_formatted_flow_and_fall_back_without_llm(self):
+        """
+        A label should be formatted once and the rule-based formatter used when the LLM call fails.
+        """
+        self.mock_model.predict.return_value = ["Check the logs. Restart the service"]
+
+        with patch("Platform.prediction_model.main.format_debugging_steps_with_llm") as mock_format_llm:
+            mock_format_llm.return_value = FORMAT_ERROR
+            first = predict_debugging_step("Service down")
+            second = predict_debugging_step("Service down again")
+
+        mock_format_llm.assert_called_once_with("Check the logs. Restart the service")
+        self.assertEqual(first, "Check the logs, if issue persists, proceed to the next step.\n"
+                                "If issue is identified, Restart the service.")
+        self.assertEqual(second, first)
+
 
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
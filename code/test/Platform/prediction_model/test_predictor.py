@@ -0,0 +1,51 @@
+import os
+import tempfile
+import unittest
+import joblib
+import numpy as np
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.linear_model import LogisticRegression
+from Platform.prediction_model.predictor import Predictor
+
+
+class TestPredictor(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        descriptions = ["database connection refused", "disk full on backup", "database timeout", "backup job failed"]
+        steps = ["Check the database", "Free disk space", "Check the database", "Free disk space"]
+        vectorizer = TfidfVectorizer()
+        model = LogisticRegression().fit(vectorizer.fit_transform(descriptions), steps)
+        self.model_path = os.path.join(self.directory.name, "model.pkl")
+        self.vectorizer_path = os.path.join(self.directory.name, "vectorizer.pkl")
+        joblib.dump(model, self.model_path)
+        joblib.dump(vectorizer, self.vectorizer_path)
+
+    def test_artifacts_are_loaded_on_first_prediction(self):
+        """
+        Creating a predictor should not touch the artifacts, the first prediction loads them once.
+        """
+        predictor = Predictor(self.model_path, self.vectorizer_path)
+        self.assertFalse(predictor.loaded)
+
+        self.assertEqual(list(predictor.predict(["database refused the connection", "backup disk full"])),
+                         ["Check the database", "Free disk space"])
+        self.assertTrue(predictor.loaded)
+        model = predictor.model
+        predictor.predict(["database timeout"])
+        self.assertIs(predictor.model, model)
+
+    def test_memory_mapped_artifacts_predict_the_same(self):
+        """
+        Artifacts loaded with mmap_mode should give the same predictions as loaded in memory.
+        """
+        incidents = ["database connection refused", "backup disk full", "database timeout"]
+        in_memory = Predictor(self.model_path, self.vectorizer_path).predict(incidents)
+        mapped = Predictor(self.model_path, self.vectorizer_path, mmap_mode="r")
+
+        self.assertTrue(np.array_equal(mapped.predict(incidents), in_memory))
+        self.assertIsInstance(mapped.model.coef_, np.memmap)
+
+
+if __name__ == "__main__":
+    unittest.main()
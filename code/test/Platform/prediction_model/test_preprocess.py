@@ -0,0 +1,69 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+# The wordnet corpus is not bundled, clean text without lemmatization unless asked to use it
+os.environ.setdefault("PREDICTION_LEMMATIZE", "false")
+import numpy as np
+import pandas as pd
+from Platform.prediction_model import preprocess
+from Platform.prediction_model.preprocess import LABEL_COLUMN, TEXT_COLUMNS, clean_column, clean_text, load_prepared_incidents
+
+DATA_FILE = os.path.join(os.path.dirname(__file__), "..", "..", "..", "data", "incidents-generated-data-v3.csv")
+
+
+class TestPreprocess(unittest.TestCase):
+    def test_missing_wordnet_fails_unless_lemmatization_is_off(self):
+        """
+        Without the wordnet corpus the lemmatizer should raise instead of silently keeping words as they are.
+        """
+        self.addCleanup(preprocess.get_lemmatizer.cache_clear)
+        with patch.object(preprocess, "LEMMATIZE", True), patch.object(preprocess, "NLTK_DOWNLOAD", False), \
+                patch.object(preprocess.nltk.data, "find", side_effect=LookupError):
+            preprocess.get_lemmatizer.cache_clear()
+            with self.assertRaises(LookupError):
+                preprocess.get_lemmatizer()
+        with patch.object(preprocess, "LEMMATIZE", False):
+            preprocess.get_lemmatizer.cache_clear()
+            self.assertEqual(preprocess.get_lemmatizer().lemmatize("databases"), "databases")
+
+    def test_clean_column_matches_clean_text(self):
+        """
+        Cleaning a column at once should give the same text as cleaning every row with clean_text.
+        """
+        values = pd.Series(["The DB is DOWN!!", "Restart the API-gateway, then check logs", np.nan,
+                            "The DB is DOWN!!", 42, "  spaced   out  "], index=[5, 3, 8, 1, 0, 9])
+        for remove_stopwords in (False, True):
+            expected = values.apply(lambda x: clean_text(x, remove_stopwords=remove_stopwords))
+            pd.testing.assert_series_equal(clean_column(values, remove_stopwords=remove_stopwords), expected)
+
+    def test_prepared_incidents_match_row_wise_cleaning_and_are_cached(self):
+        """
+        The vectorized pipeline should build the row-wise combined_text, and clean a CSV only once per content.
+        """
+        df = pd.read_csv(DATA_FILE)
+        expected = df[TEXT_COLUMNS].fillna({'Incident Name': 'Unknown Incident', 'Incident Description': 'No Description',
+                                            'Resolution': 'No Resolution', 'First Debugging Step': 'Unknown Step'})
+        expected = expected.fillna('').astype(str)
+        for column in TEXT_COLUMNS[:4]:
+            expected[column] = expected[column].apply(lambda x: clean_text(x, remove_stopwords=False))
+        expected = expected.apply(lambda x: ' '.join(x), axis=1)
+
+        with tempfile.TemporaryDirectory() as cache_dir:
+            csv = os.path.join(cache_dir, "incidents.csv")
+            df.to_csv(csv, index=False)
+            prepared = load_prepared_incidents(csv, cache_dir)
+            self.assertEqual(prepared['combined_text'].tolist(), expected.tolist())
+            self.assertEqual(prepared[LABEL_COLUMN].tolist(), df[LABEL_COLUMN].tolist())
+
+            with patch.object(preprocess, "prepare_incidents") as prepare:
+                cached = load_prepared_incidents(csv, cache_dir)
+            prepare.assert_not_called()
+            pd.testing.assert_frame_equal(cached, prepared)
+
+            df.iloc[:5].to_csv(csv, index=False)
+            self.assertEqual(len(load_prepared_incidents(csv, cache_dir)), 5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,120 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+import joblib
+import numpy as np
+import scipy.sparse as sp
+from sklearn.feature_extraction.text import HashingVectorizer, TfidfVectorizer
+from sklearn.linear_model import LogisticRegression, SGDClassifier
+from Platform.prediction_model import predictor as predictor_module
+from Platform.prediction_model.predictor import Predictor
+from Platform.prediction_model.registry import BUNDLE, ModelRegistry
+
+DESCRIPTIONS = ["database connection refused", "disk full on backup", "database timeout", "backup job failed",
+                "certificate expired on gateway", "tls handshake failed"]
+STEPS = ["Check the database", "Free disk space", "Check the database", "Free disk space",
+         "Renew the certificate", "Renew the certificate"]
+INCIDENTS = ["database refused the connection", "backup disk full", "gateway certificate expired"]
+
+
+def train(vectorizer, model):
+    return model.fit(vectorizer.fit_transform(DESCRIPTIONS), STEPS), vectorizer
+
+
+class TestModelRegistry(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.registry = ModelRegistry(self.directory.name)
+
+    def test_bundle_round_trip_predicts_the_same(self):
+        """
+        A float32, compressed bundle should load the vocabulary as trained and predict like the original model.
+        """
+        model, vectorizer = train(TfidfVectorizer(), LogisticRegression())
+        version = self.registry.publish(model, vectorizer, metadata={"accuracy": 1.0})
+
+        loaded_model, loaded_vectorizer, manifest = self.registry.load()
+        self.assertEqual((version, manifest["version"], manifest["metadata"]), (1, 1, {"accuracy": 1.0}))
+        self.assertEqual(loaded_vectorizer.vocabulary_, vectorizer.vocabulary_)
+        self.assertEqual(loaded_model.coef_.dtype, np.float32)
+        self.assertEqual(model.coef_.dtype, np.float64)
+        self.assertEqual(list(loaded_model.predict(loaded_vectorizer.transform(INCIDENTS))),
+                         list(model.predict(vectorizer.transform(INCIDENTS))))
+
+    def test_mostly_zero_coefficients_are_stored_sparse(self):
+        """
+        A hashed model should be stored with sparse coefficients and served with dense ones.
+        """
+        model, vectorizer = train(HashingVectorizer(n_features=2 ** 14, alternate_sign=False),
+                                  SGDClassifier(loss="log_loss", random_state=42))
+        self.registry.publish(model, vectorizer)
+
+        bundle = joblib.load(os.path.join(self.registry._version_dir(1), BUNDLE))
+        self.assertTrue(sp.issparse(bundle["model"].coef_))
+        loaded_model, loaded_vectorizer, _ = self.registry.load()
+        self.assertIsInstance(loaded_model.coef_, np.ndarray)
+        self.assertEqual(list(loaded_model.predict(loaded_vectorizer.transform(INCIDENTS))),
+                         list(model.predict(vectorizer.transform(INCIDENTS))))
+
+    def test_corrupt_bundle_is_rejected(self):
+        """
+        A bundle that no longer matches the checksum of its manifest should not be unpickled.
+        """
+        self.registry.publish(*train(TfidfVectorizer(), LogisticRegression()))
+        with open(os.path.join(self.registry._version_dir(1), BUNDLE), "r+b") as f:
+            f.seek(-8, os.SEEK_END)
+            f.write(b"corrupt!")
+        with self.assertRaises(ValueError):
+            self.registry.load()
+
+    def test_predictor_swaps_to_the_activated_version(self):
+        """
+        A running predictor should pick up a newly activated version, and a rollback, without being rebuilt.
+        """
+        first = self.registry.publish(*train(TfidfVectorizer(), LogisticRegression()))
+        predictor = Predictor(registry=self.registry, refresh_interval=1e-9)
+        self.assertEqual(predictor.predict(INCIDENTS)[0], "Check the database")
+        self.assertEqual(predictor.version, first)
+
+        model, vectorizer = train(TfidfVectorizer(), LogisticRegression())
+        model.classes_ = np.array(["Restart the service"] * len(model.classes_), dtype=object)
+        second = self.registry.publish(model, vectorizer)
+        self.assertEqual(predictor.predict(INCIDENTS)[0], "Restart the service")
+        self.assertEqual(predictor.version, second)
+
+        self.registry.activate(first)
+        self.assertEqual(predictor.predict(INCIDENTS)[0], "Check the database")
+
+    def test_empty_registry_imports_the_legacy_artifacts(self):
+        """
+        A predictor on an empty registry should publish the saved model and vectorizer as version 1.
+        """
+        model, vectorizer = train(TfidfVectorizer(), LogisticRegression())
+        model_path = os.path.join(self.directory.name, "model.pkl")
+        vectorizer_path = os.path.join(self.directory.name, "vectorizer.pkl")
+        joblib.dump(model, model_path)
+        joblib.dump(vectorizer, vectorizer_path)
+
+        with patch.object(predictor_module, "LEGACY_MODEL_PATH", model_path), \
+                patch.object(predictor_module, "LEGACY_VECTORIZER_PATH", vectorizer_path):
+            predictor = Predictor(registry=ModelRegistry(os.path.join(self.directory.name, "registry")))
+            self.assertEqual(list(predictor.predict(INCIDENTS)), list(model.predict(vectorizer.transform(INCIDENTS))))
+        self.assertEqual(predictor.version, 1)
+
+    def test_old_versions_are_pruned(self):
+        """
+        Publishing should keep the newest versions and the current one.
+        """
+        registry = ModelRegistry(self.directory.name, keep=2)
+        model, vectorizer = train(TfidfVectorizer(), LogisticRegression())
+        registry.publish(model, vectorizer)
+        for _ in range(4):
+            registry.publish(model, vectorizer, activate=False)
+        self.assertEqual(registry.versions(), [1, 4, 5])
+        self.assertEqual(registry.current_version(), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,68 @@
+import unittest
+from unittest.mock import patch
+from Platform.prediction_model import similar_incidents
+from Platform.prediction_model.similar_incidents import SimilarIncidentIndex, add_similar_incidents, set_similar_incidents
+
+INCIDENTS = [
+    {"Incident ID": "INC1", "Incident Name": "Database Downtime", "Incident Description": "Database connection refused",
+     "Debugging Steps": "Check the database", "Resolution": "Restarted the database"},
+    {"Incident ID": "INC2", "Incident Name": "Cloud Backup Failure", "Incident Description": "Nightly backup job failed",
+     "Debugging Steps": "Check the backup service", "Resolution": "Renewed credentials"},
+    {"Incident ID": "INC3", "Incident Name": "Queue Backlog", "Incident Description": "Messages piling up in the order queue",
+     "Debugging Steps": "Check the consumers", "Resolution": "Scaled the consumers"},
+]
+
+
+class TestSimilarIncidentIndex(unittest.TestCase):
+    def test_query_returns_the_closest_incidents_first(self):
+        """
+        Matches should be ordered by cosine similarity, limited to k and to incidents sharing a term.
+        """
+        index = SimilarIncidentIndex()
+        self.assertEqual(index.add(INCIDENTS), 3)
+
+        matches = index.query("database connection timeout", k=2)
+        self.assertEqual([match["incident_id"] for match in matches], ["INC1"])
+        self.assertEqual(matches[0]["debugging_steps"], "Check the database")
+        self.assertGreater(matches[0]["score"], 0.3)
+        self.assertEqual(index.query("unrelated words only", k=2), [])
+        self.assertEqual(len(index.query("failed backup of the database", k=2)), 2)
+        self.assertEqual(index.query("failed backup of the database", k=2)[0]["incident_id"], "INC2")
+
+    def test_incidents_are_added_and_replaced_incrementally(self):
+        """
+        Added incidents should be found by the next query and a repeated Incident ID should replace the old one.
+        """
+        index = SimilarIncidentIndex()
+        index.add(INCIDENTS)
+        index.query("database")
+
+        index.add([{"Incident ID": "INC4", "Incident Name": "Kafka Partition Offline",
+                    "Incident Description": "Kafka partitions offline after broker restart"}])
+        self.assertEqual(index.query("kafka broker")[0]["incident_id"], "INC4")
+
+        index.add([dict(INCIDENTS[0], **{"Incident Name": "Cache Eviction Storm",
+                                          "Incident Description": "Redis evicting keys"})])
+        self.assertEqual(len(index), 4)
+        self.assertEqual(index.query("database connection refused"), [])
+        self.assertEqual(index.query("redis keys")[0]["name"], "Cache Eviction Storm")
+
+    def test_incidents_added_before_the_index_is_built_are_kept(self):
+        """
+        Adding incidents should not build the shared index, they should be searchable once it is built.
+        """
+        self.addCleanup(set_similar_incidents, None)
+        set_similar_incidents(None)
+        with patch.object(similar_incidents, "load_index", side_effect=SimilarIncidentIndex) as load_index:
+            self.assertEqual(add_similar_incidents(INCIDENTS[:1]), 0)
+            load_index.assert_not_called()
+
+            thread = similar_incidents.warm_similar_incidents()
+            thread.join(5)
+            self.assertEqual(similar_incidents.get_similar_incidents().query("database")[0]["incident_id"], "INC1")
+            self.assertEqual(add_similar_incidents(INCIDENTS[1:]), 2)
+            load_index.assert_called_once()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,8 @@
 import unittest
 from unittest.mock import patch, MagicMock
-from Platform.main import get_operation, process_operation, create_main_graph, UserInput
+from Platform.main import get_operation, process_operation, create_main_graph, stream_operation, UserInput
+from Platform.Flows.instrumentation import instrument, metrics
+import time
 
 
 class TestMain(unittest.TestCase):
@@ -25,15 +27,15 @@ class TestMain(unittest.TestCase):
         self.assertFalse(result["continue_conversation"])
         mock_open.assert_called_once_with("mocked_path/downtime.txt", "r")
 
-    @patch("Platform.main.create_graph")
-    def test_process_operation(self, mock_create_graph):
+    @patch("Platform.main.get_graph")
+    def test_process_operation(self, mock_get_graph):
         """
         Test the process_operation function to ensure it invokes the graph correctly.
         """
         # Mock the graph and its invoke method
         mock_graph = MagicMock()
-        mock_graph.invoke.return_value = {"history": "Mock execution history"}
-        mock_create_graph.return_value = mock_graph
+        mock_graph.invoke.return_value = {"history": [{"agent": "execute_operation", "output": "completed"}]}
+        mock_get_graph.return_value = mock_graph
 
         # Create a mock state
         state = {"input": "Mock operation input", "continue_execution": True}
@@ -43,10 +45,50 @@ class TestMain(unittest.TestCase):
 
         # Assertions
         mock_graph.invoke.assert_called_once_with(
-            {"operation": "Mock operation input", "history": '{"history":[]}'}
+            {"operation": "Mock operation input", "history": []}
         )
         self.assertEqual(result, state)
 
+    @patch("Platform.main.get_graph")
+    def test_stream_operation(self, mock_get_graph):
+        """
+        Test the stream_operation function yields one event per node update timed by the
+        node itself, and tracks the streamed run like run_operation.
+        """
+        execute_operation = instrument("core", "execute_operation", lambda state: {"action": "execute_agent"}, loop=True)
+        queue_load = instrument("core", "queue_load", lambda state: {"history": []})
+        queue_response_time = instrument("core", "queue_response_time", lambda state: {"history": []})
+
+        def stream(state, stream_mode):
+            yield {"execute_operation": execute_operation(state)}
+            time.sleep(0.05)
+            yield {"queue_load": queue_load(state), "queue_response_time": queue_response_time(state)}
+
+        mock_get_graph.return_value.stream.side_effect = stream
+        runs = metrics.value("graph_runs_total", {"graph": "core"}) or 0
+
+        generator = stream_operation("Mock operation input")
+        events = []
+        while True:
+            try:
+                events.append(next(generator))
+            except StopIteration as finished:
+                summary = finished.value
+                break
+
+        mock_get_graph.return_value.stream.assert_called_once_with(
+            {"operation": "Mock operation input", "history": []}, stream_mode="updates"
+        )
+        self.assertEqual([event["node"] for event in events],
+                         ["execute_operation", "queue_load", "queue_response_time"])
+        self.assertEqual(events[0]["output"], {"action": "execute_agent"})
+        # The pause between the chunks is not part of any node's own duration
+        self.assertTrue(all(event["node_seconds"] < 0.05 for event in events))
+        self.assertGreaterEqual(events[1]["elapsed_seconds"], 0.05)
+        self.assertEqual(summary["iterations"], 1)
+        self.assertEqual(set(summary["nodes"]), {"execute_operation", "queue_load", "queue_response_time"})
+        self.assertEqual(metrics.value("graph_runs_total", {"graph": "core"}), runs + 1)
+
     def test_create_main_graph(self):
         """
         Test the create_main_graph function to ensure it creates the workflow correctly.
@@ -57,15 +99,15 @@ class TestMain(unittest.TestCase):
         self.assertIsNotNone(workflow)
         self.assertTrue(callable(workflow.invoke))
 
-    @patch("Platform.main.create_main_graph")
-    def test_main_workflow_execution(self, mock_create_main_graph):
+    @patch("Platform.main.get_main_graph")
+    def test_main_workflow_execution(self, mock_get_main_graph):
         """
         Test the main workflow execution to ensure the graph is invoked correctly.
         """
         # Mock the graph and its invoke method
         mock_graph = MagicMock()
         mock_graph.invoke.return_value = {"history": "Mock final result"}
-        mock_create_main_graph.return_value = mock_graph
+        mock_get_main_graph.return_value = mock_graph
 
         # Call the main function
         from Platform.main import main
@@ -0,0 +1,110 @@
+import json
+import socket
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+def default_responder(messages):
+    """
+    Completes every operation on the first decision.
+    """
+    return "completed"
+
+
+class _ChatCompletionsHandler(BaseHTTPRequestHandler):
+    # HTTP/1.1 so clients can keep the connection alive between requests
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        self.request.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        # Called once per TCP connection, stands in for the TCP + TLS handshake to the provider
+        self.server.connections += 1
+        if self.server.handshake_delay:
+            time.sleep(self.server.handshake_delay)
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        body = json.loads(self.rfile.read(length) or b"{}")
+
+        if not self.path.rstrip("/").endswith("/chat/completions"):
+            self._send(404, {"error": {"message": f"Unknown path {self.path}"}})
+            return
+
+        if self.server.latency:
+            time.sleep(self.server.latency)
+
+        messages = body.get("messages", [])
+        content = self.server.responder(messages)
+        self.server.requests += 1
+
+        prompt_tokens = sum(len(str(m.get("content", "")).split()) for m in messages)
+        completion_tokens = len(content.split())
+        self._send(200, {
+            "id": f"chatcmpl-{uuid.uuid4().hex}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model", "fake-llm"),
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": "stop"
+            }],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens
+            }
+        })
+
+    def _send(self, status, payload):
+        data = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class FakeLLMServer(ThreadingHTTPServer):
+    """
+    Local stand-in for the OpenAI chat completions API, used to measure client and
+    graph overhead offline. Point the platform at it with OPENAI_BASE_URL=server.base_url.
+    """
+    daemon_threads = True
+
+    def __init__(self, responder=default_responder, latency=0.0, handshake_delay=0.0, host="127.0.0.1", port=0):
+        super().__init__((host, port), _ChatCompletionsHandler)
+        self.responder = responder
+        self.latency = latency
+        self.handshake_delay = handshake_delay
+        self.connections = 0
+        self.requests = 0
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def start(self):
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
@@ -0,0 +1,85 @@
+import json
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import unquote
+
+
+class _QueueStatsHandler(BaseHTTPRequestHandler):
+    # HTTP/1.1 so collectors can keep the connection alive between requests
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        self.request.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.server.connections += 1
+
+    def do_GET(self):
+        parts = [unquote(part) for part in self.path.strip("/").split("/")]
+        if len(parts) != 4 or parts[:2] != ["api", "queues"]:
+            self._send(404, {"error": "not_found", "reason": f"Unknown path {self.path}"})
+            return
+
+        vhost, name = parts[2], parts[3]
+        stats = self.server.queues.get(name)
+        if stats is None:
+            self._send(404, {"error": "not_found", "reason": f"Unknown queue {name}"})
+            return
+
+        if self.server.latency:
+            time.sleep(self.server.latency)
+        self.server.requests += 1
+        self._send(200, {"name": name, "vhost": vhost, **stats})
+
+    def _send(self, status, payload):
+        data = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class FakeQueueServer(ThreadingHTTPServer):
+    """
+    Local stand-in for a RabbitMQ style management API serving GET /api/queues/<vhost>/<name>,
+    used to test the queue collector offline. queues maps queue names to the statistics returned.
+    """
+    daemon_threads = True
+
+    def __init__(self, queues=None, latency=0.0, host="127.0.0.1", port=0):
+        super().__init__((host, port), _QueueStatsHandler)
+        self.queues = queues if queues is not None else {"orders": {"messages": 42, "consumers": 2}}
+        self.latency = latency
+        self.connections = 0
+        self.requests = 0
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def queue_url(self, name, vhost="/"):
+        return f"{self.base_url}/api/queues/{vhost.replace('/', '%2F')}/{name}"
+
+    def start(self):
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()